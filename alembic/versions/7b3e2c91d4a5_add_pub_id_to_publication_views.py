@@ -0,0 +1,36 @@
+"""Add pub_id to publication_base_info and publication_actual_specialty views
+
+Revision ID: 7b3e2c91d4a5
+Revises: cfc7e1d62896
+Create Date: 2026-10-18 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.db_views import PUBLICATION_VIEWS, create_view_sql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e2c91d4a5'
+down_revision: Union[str, None] = 'cfc7e1d62896'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Пересоздаёт VIEW по полным определениям из app/core/db_views.py: первым столбцом идёт id
+    публикации, материализованные таблицы связываются с publication по id, а не по названию.
+    Те же определения применяет init_db при запуске, если в VIEW нет pub_id.
+    """
+    for view in PUBLICATION_VIEWS:
+        op.execute(create_view_sql(view))
+
+
+def downgrade() -> None:
+    # Те же определения без первого столбца pub_id
+    for view in PUBLICATION_VIEWS:
+        definition = PUBLICATION_VIEWS[view].replace("    p.id AS pub_id,\n", "", 1)
+        op.execute(f"CREATE OR REPLACE VIEW `{view}` AS {definition}")
@@ -0,0 +1,79 @@
+"""
+Служебные команды. Запуск из корня проекта:
+    python -m app.cli rebuild-view-tables
+    python -m app.cli import-publications dump.ndjson [--format csv] [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+from app.core.database import db1_session
+from app.core.db_init import init_db
+from app.services.publication_import_service import IMPORT_BATCH_SIZE, IMPORT_FORMATS, import_publications
+from app.services.publication_view_tables import publication_view_tables
+from app.services.table_versions import table_versions
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_view_tables() -> None:
+    await init_db()
+    async with db1_session() as session:
+        await publication_view_tables.rebuild(session)
+        # Таблицы *_mat могли разойтись с VIEW: ETag всех публикаций устаревают
+        await table_versions.bump(session, "publication")
+
+
+async def import_publications_file(path: str, import_format: str = None, batch_size: int = IMPORT_BATCH_SIZE) -> None:
+    import_format = import_format or Path(path).suffix.lstrip(".").lower()
+    if import_format not in IMPORT_FORMATS:
+        raise SystemExit(f"Не удалось определить формат {path}, укажите --format {'/'.join(IMPORT_FORMATS)}")
+
+    await init_db()
+    async with db1_session() as session:
+        with open(path, encoding="utf-8-sig", newline="") as stream:
+            result = await import_publications(session, stream, import_format, batch_size)
+        # В этом процессе слушатели catalog_sync_service не зарегистрированы: таблицы VIEW
+        # перестраиваются один раз в конце, а по версии "publication" работающий сервер
+        # перестроит свои индексы в памяти (см. catalog_change_watcher)
+        await publication_view_tables.rebuild(session)
+        await table_versions.bump(session, "publication")
+    print(result.model_dump_json(indent=2))
+
+
+COMMANDS = {
+    "rebuild-view-tables": (
+        rebuild_view_tables,
+        "Полностью перестроить publication_base_info_mat и publication_actual_specialty_mat из VIEW",
+        (),
+    ),
+    "import-publications": (
+        import_publications_file,
+        "Импортировать публикации из NDJSON/CSV в формате /publications/export (upsert по el_id)",
+        (
+            (("path",), {"help": "Файл .ndjson или .csv"}),
+            (("--format",), {"dest": "import_format", "choices": IMPORT_FORMATS, "help": "По умолчанию по расширению файла"}),
+            (("--batch-size",), {"type": int, "default": IMPORT_BATCH_SIZE, "help": "Строк в одной транзакции"}),
+        ),
+    ),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Служебные команды journal finder")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text, arguments) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text)
+        for flags, options in arguments:
+            subparser.add_argument(*flags, **options)
+    args = vars(parser.parse_args())
+
+    command = args.pop("command")
+    handler, _, _ = COMMANDS[command]
+    asyncio.run(handler(**args))
+    logger.info(f"Command {command} finished")
+
+
+if __name__ == "__main__":
+    main()
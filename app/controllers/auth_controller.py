@@ -8,12 +8,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.core.database import get_db1_session
 from app.core.logger import logger
-from app.core.security import require_role, generate_reset_password_token, get_password_hash, \
+from app.core.security import require_role, generate_reset_password_token, password_hasher, \
     get_reset_password_token_expiry
 from app.models import User
 from app.schemas.auth import RegisterRequest, LoginRequest, TokenResponse, ChangeUserRoleRequest, RefreshTokenRequest
 from app.services.auth_service import AuthService
 from app.services.email_service import EmailService
+from app.services.email_outbox_worker import email_outbox_worker
 
 router = APIRouter()
 
@@ -168,18 +169,19 @@ async def request_password_reset(
     reset_token = generate_reset_password_token()
     user.reset_password_token = reset_token
     user.reset_password_token_expires = get_reset_password_token_expiry()
-    await db.commit()
 
-    # Отправка письма с инструкциями
+    # Письмо с инструкциями ставится в очередь в одной транзакции с токеном
     base_url = f"https://330657.simplecloud.ru/auth?mode=reset-password"
     query_params = {"token": reset_token}
 
     reset_link = base_url + "&" + urlencode(query_params)
-    await EmailService().send_email(
+    await EmailService(db).send_email(
         recipient_email=email,
         subject="Сброс пароля",
         body=f"Нажмите на ссылку для сброса пароля: {reset_link}"
     )
+    await db.commit()
+    email_outbox_worker.wake()
 
     return {"message": "Инструкции по смене пароля отправлены на почту"}
 
@@ -208,7 +210,7 @@ async def reset_password(
         raise HTTPException(status_code=400, detail="Неправильный или истекший токен смены пароля")
 
     # Обновление пароля
-    user.password = get_password_hash(new_password)
+    user.password = await password_hasher.hash(new_password)
     user.reset_password_token = None
     user.reset_password_token_expires = None
     await db.commit()
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Path, HTTPException
+from fastapi import APIRouter, Depends, Path, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
@@ -6,6 +6,8 @@ from app.core.database import get_db1_session
 from app.core.security import require_role
 from app.schemas.city import CityCreate, CityUpdate, CityOut
 from app.services import city_service
+from app.services.table_versions import table_versions
+from app.services.utils.etag_utils import conditional_response
 
 router = APIRouter()
 
@@ -17,7 +19,10 @@ router = APIRouter()
     description="Этот эндпоинт возвращает список всех городов из базы данных. "
                 "Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def list_cities(db: AsyncSession = Depends(get_db1_session)):
+async def list_cities(request: Request, response: Response, db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "city"), exists=True)
+    if not_modified is not None:
+        return not_modified
     try:
         cities = await city_service.get_all_cities(db)
         if not cities:
@@ -35,7 +40,10 @@ async def list_cities(db: AsyncSession = Depends(get_db1_session)):
                 "Если город не найден, возвращается ошибка 404. "
                 "Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def get_city(city_id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+async def get_city(request: Request, response: Response, city_id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "city", key=city_id))
+    if not_modified is not None:
+        return not_modified
     try:
         city = await city_service.get_city_by_id(db, city_id)
         return city
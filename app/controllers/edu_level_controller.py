@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Path, HTTPException
+from fastapi import APIRouter, Depends, Path, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
@@ -10,6 +10,8 @@ from app.schemas.edu_level import (
     EduLevelUpdate
 )
 from app.services import edu_level_service
+from app.services.table_versions import table_versions
+from app.services.utils.etag_utils import conditional_response
 
 router = APIRouter()
 
@@ -22,7 +24,10 @@ router = APIRouter()
     description="Этот эндпоинт возвращает список всех уровней образования из базы данных. "
                 "Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def list_edu_levels(db: AsyncSession = Depends(get_db1_session)):
+async def list_edu_levels(request: Request, response: Response, db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "edu_level"), exists=True)
+    if not_modified is not None:
+        return not_modified
     try:
         edu_levels = await edu_level_service.get_all_edu_levels(db)
         if not edu_levels:
@@ -44,7 +49,10 @@ async def list_edu_levels(db: AsyncSession = Depends(get_db1_session)):
                 "Если уровень образования не найден, возвращается ошибка 404. "
                 "Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def get_edu_level(edu_level_id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+async def get_edu_level(request: Request, response: Response, edu_level_id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "edu_level", key=edu_level_id))
+    if not_modified is not None:
+        return not_modified
     try:
         return await edu_level_service.get_edu_level_by_id(db, edu_level_id)
     except HTTPException as e:
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Path, HTTPException
+from fastapi import APIRouter, Depends, Path, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
@@ -6,6 +6,8 @@ from app.core.database import get_db1_session
 from app.core.security import require_role, logger
 from app.schemas.grnti import GrntiCreate, GrntiUpdate, GrntiOut
 from app.services import grnti_service
+from app.services.table_versions import table_versions
+from app.services.utils.etag_utils import conditional_response
 
 router = APIRouter()
 
@@ -17,7 +19,10 @@ router = APIRouter()
     description="Этот эндпоинт возвращает список всех записей ГРНТИ из базы данных. "
                 "Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def list_grnti(db: AsyncSession = Depends(get_db1_session)):
+async def list_grnti(request: Request, response: Response, db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "grnti"), exists=True)
+    if not_modified is not None:
+        return not_modified
     try:
         grnti_list = await grnti_service.get_all_grnti(db)
         if not grnti_list:
@@ -38,7 +43,10 @@ async def list_grnti(db: AsyncSession = Depends(get_db1_session)):
                 "Если запись не найдена, возвращается ошибка 404. "
                 "Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def get_grnti(grnti_id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+async def get_grnti(request: Request, response: Response, grnti_id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "grnti", key=grnti_id))
+    if not_modified is not None:
+        return not_modified
     try:
         return await grnti_service.get_grnti_by_id(db, grnti_id)
     except HTTPException as e:
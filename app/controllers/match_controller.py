@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.controllers.publication_controller import plain_fieldset
+from app.core.database import get_db1_session
+from app.core.security import require_role
+from app.schemas.match import MatchRequest, MatchResponse
+from app.services import match_service
+from app.services.publication_fieldset import PublicationFieldset
+
+router = APIRouter()
+
+
+@router.post(
+    "/",
+    response_model=MatchResponse,
+    dependencies=[Depends(require_role("user"))],
+    description="Подбор журналов под статью. Жёсткие ограничения отсекают журналы: **wos_quartile**, **scopus_quartile** (квартиль не ниже указанного), **vak_category** (категория ВАК не ниже указанной), **open_access** (все выпуски в открытом доступе), **max_price** (журналы без указанной цены не проходят). "
+                "Оставшиеся журналы ранжируются взвешенной суммой критериев (**weights**): совпадение со **specialty_codes** и **grnti_codes** (код из той же группы засчитывается наполовину), уровень индексации и дешевизна публикации. "
+                "Если переданы коды, журналы без тематических совпадений не возвращаются. В каждом элементе есть score и оценки по критериям (criteria), **total** — число журналов, прошедших ограничения."
+)
+async def match_publications(
+        data: MatchRequest,
+        db: AsyncSession = Depends(get_db1_session),
+        fieldset: PublicationFieldset = Depends(plain_fieldset),
+):
+    return ORJSONResponse(await match_service.match_publications(db, data, fieldset))
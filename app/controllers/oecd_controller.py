@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
@@ -12,6 +12,8 @@ from app.services.oecd_service import (
     update_oecd,
     delete_oecd
 )
+from app.services.table_versions import table_versions
+from app.services.utils.etag_utils import conditional_response
 
 router = APIRouter()
 
@@ -23,7 +25,10 @@ router = APIRouter()
     description="Этот эндпоинт возвращает список всех элементов OECD из базы данных. "
                 "Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def list_oecd(db: AsyncSession = Depends(get_db1_session)):
+async def list_oecd(request: Request, response: Response, db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "oecd"), exists=True)
+    if not_modified is not None:
+        return not_modified
     return await get_all_oecd(db)
 
 @router.get(
@@ -35,7 +40,10 @@ async def list_oecd(db: AsyncSession = Depends(get_db1_session)):
                 "Если элемент не найден, возвращается ошибка 404. "
                 "Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def get_oecd(oecd_id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+async def get_oecd(request: Request, response: Response, oecd_id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "oecd", key=oecd_id))
+    if not_modified is not None:
+        return not_modified
     oecd = await get_oecd_by_id(db, oecd_id)
     if not oecd:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OECD не найден")
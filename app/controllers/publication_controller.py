@@ -1,46 +1,71 @@
+import io
 import json
+import tempfile
 from datetime import date
 from math import ceil
 from typing import Optional, List
 
-from fastapi import APIRouter, Depends, Path, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Path, HTTPException, status, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db1_session
 from app.core.security import require_role, logger
 from app.schemas.publication import PublicationOut, PublicationCreate, PublicationUpdate, PaginatedResponse, \
     PublicationFilter, PublicationResponse, PublicationFilterWithSpec, PaginatedResponseWith, SerialTypeEnum11, \
-    SerialElemEnum, PurposeEnum, DistributionEnum, AccessEnum, MainFinanceEnum, MultidiscEnum, LanguageEnum
+    SerialElemEnum, PurposeEnum, DistributionEnum, AccessEnum, MainFinanceEnum, MultidiscEnum, LanguageEnum, \
+    LanguagesModeEnum, PublicationFacetsResponse, PublicationBatchRequest, PublicationBatchResponse, \
+    PublicationSearchResponse, PublicationSuggestResponse, PublicationSimilarResponse
 from app.schemas.publication_actual_specialty import PublicationActualSpecialtyOut, PublicationActualSpecialtyFilter, \
     PublicationActualSpecialtyResponse
 from app.schemas.publication_base_info import PublicationBaseInfoOut, PaginatedBaseInfoResponse, \
     PublicationBaseInfoFilter
-from app.services import publication_service
+from app.schemas.publication_import import PublicationImportResult
+from app.services import publication_service, publication_import_service
+from app.services.publication_fieldset import PublicationFieldset, PUBLICATION_INCLUDES, parse_fieldset
+from app.services.table_versions import table_versions
+from app.services.utils.etag_utils import etag_headers, etag_matches
 
 router = APIRouter()
 
+FIELDS_DESCRIPTION = (
+    "Поля публикации через запятую, например name,el_id,language; поля связей один-к-одному — "
+    "через точку: pub_information.issn_print (связь при этом загружается автоматически). id возвращается всегда."
+)
+INCLUDE_DESCRIPTION = "Связи через запятую: " + ", ".join(PUBLICATION_INCLUDES) + "."
+
+
+def plain_fieldset(
+        fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+        include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION + " По умолчанию связи не загружаются."),
+) -> PublicationFieldset:
+    return parse_fieldset(fields, include)
+
+
+def full_fieldset(
+        fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+        include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION + " По умолчанию загружаются все."),
+) -> PublicationFieldset:
+    return parse_fieldset(fields, include, default_include=PUBLICATION_INCLUDES)
+
+
 @router.get(
     "/",
     response_model=PaginatedResponse,
     dependencies=[Depends(require_role("user"))],
-    description="Получает список всех публикаций с поддержкой пагинации и фильтрации. - **page**: Номер страницы (начинается с 1). - **per_page**: Количество элементов на странице (максимум 100). - **filters**: Фильтры для поиска публикаций (например, язык, автор, дата). ВАЖНО: из-за бага Swagger параметр languages нужно передавать через query (?languages=русский&languages=английский), а не через body, даже если Swagger предлагает body."
+    description="Получает список всех публикаций с поддержкой пагинации и фильтрации. - **page**: Номер страницы (начинается с 1). - **per_page**: Количество элементов на странице (максимум 100). - **languages_mode**: all (по умолчанию) — у публикации есть все выбранные языки, any — хотя бы один. - **filters**: Фильтры для поиска публикаций (например, язык, автор, дата). ВАЖНО: из-за бага Swagger параметр languages нужно передавать через query (?languages=русский&languages=английский), а не через body, даже если Swagger предлагает body."
 )
 async def list_publications_paginated(
     db: AsyncSession = Depends(get_db1_session),
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
-    filters: PublicationFilter = Depends()
+    filters: PublicationFilter = Depends(),
+    fieldset: PublicationFieldset = Depends(plain_fieldset),
 ):
     try:
         filter_dict = filters.model_dump(exclude_none=True)
-        publications, total = await publication_service.get_paginated_publications(db, page, per_page, filter_dict)
-        total_pages = ceil(total / per_page)
-        return PaginatedResponse(
-            items=publications,
-            total=total,
-            page=page,
-            per_page=per_page,
-            total_pages=total_pages
-        )
+        result = await publication_service.get_paginated_publications(db, page, per_page, filter_dict, fieldset)
+        # Словарь уже в форме PaginatedResponse: отдаём сразу байтами, без повторной валидации response_model
+        return ORJSONResponse(result)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -48,17 +73,9 @@ async def list_publications_paginated(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 
-@router.get(
-    "/with_index_and_information",
-    response_model=PaginatedResponseWith,
-    dependencies=[Depends(require_role("user"))],
-    description="Получает список всех публикаций с поддержкой пагинации и фильтрации. - **page**: Номер страницы (начинается с 1). - **per_page**: Количество элементов на странице (максимум 100). - **filters**: Фильтры для поиска публикаций (например, язык, автор, дата). ВАЖНО: из-за бага Swagger параметр languages нужно передавать через query (?languages=русский&languages=английский), а не через body, даже если Swagger предлагает body."
-)
-async def list_publications_paginated(
-        db: AsyncSession = Depends(get_db1_session),
-        page: int = Query(1, ge=1),
-        per_page: int = Query(10, ge=1, le=100),
+def with_index_filters(
         speciality_id: Optional[List[int]] = Query(None),  # Явно обрабатываем speciality_id
+        speciality_actual_only: bool = Query(False, description="Учитывать только действующие связи со специальностями: actual и сегодняшняя дата в пределах start_date/end_date"),
         el_id: Optional[int] = Query(None),
         vak_id: Optional[int] = Query(None),
         name: Optional[str] = Query(None),
@@ -70,54 +87,178 @@ async def list_publications_paginated(
         main_finance: Optional[MainFinanceEnum] = Query(None),
         multidisc: Optional[MultidiscEnum] = Query(None),
         languages: Optional[List[LanguageEnum]] = Query(None),  # Изменено на List вместо Set
+        languages_mode: LanguagesModeEnum = Query(LanguagesModeEnum.any),
         el_updated_at_from: Optional[date] = Query(None),
         el_updated_at_to: Optional[date] = Query(None),
+) -> dict:
+    # Формируем словарь фильтров вручную
+    filter_dict = {
+        "el_id": el_id,
+        "vak_id": vak_id,
+        "name": name,
+        "serial_type": serial_type,
+        "serial_elem": serial_elem,
+        "purpose": purpose,
+        "distribution": distribution,
+        "access": access,
+        "main_finance": main_finance,
+        "multidisc": multidisc,
+        "languages": languages,
+        "languages_mode": languages_mode,
+        "el_updated_at_from": el_updated_at_from,
+        "el_updated_at_to": el_updated_at_to,
+        "speciality_id": speciality_id,
+        "speciality_actual_only": speciality_actual_only,
+    }
+    # Удаляем ключи с None значениями
+    return {k: v for k, v in filter_dict.items() if v is not None}
+
+
+@router.get(
+    "/with_index_and_information",
+    response_model=PaginatedResponseWith,
+    dependencies=[Depends(require_role("user"))],
+    description="Получает список всех публикаций с поддержкой пагинации и фильтрации. - **page**: Номер страницы (начинается с 1). - **per_page**: Количество элементов на странице (максимум 100). - **cursor**: Курсор из поля next_cursor предыдущего ответа; если передан, page игнорируется и выдача продолжается после последней полученной публикации (порядок по id). - **languages_mode**: any (по умолчанию) — у публикации есть хотя бы один из выбранных языков, all — все. - **filters**: Фильтры для поиска публикаций (например, язык, автор, дата). ВАЖНО: из-за бага Swagger параметр languages нужно передавать через query (?languages=русский&languages=английский), а не через body, даже если Swagger предлагает body."
+)
+async def list_publications_paginated(
+        db: AsyncSession = Depends(get_db1_session),
+        page: int = Query(1, ge=1),
+        per_page: int = Query(10, ge=1, le=100),
+        cursor: Optional[str] = Query(None),
+        filter_dict: dict = Depends(with_index_filters),
+        fieldset: PublicationFieldset = Depends(full_fieldset),
 ):
     try:
-        # Формируем словарь фильтров вручную
-        filter_dict = {
-            "el_id": el_id,
-            "vak_id": vak_id,
-            "name": name,
-            "serial_type": serial_type,
-            "serial_elem": serial_elem,
-            "purpose": purpose,
-            "distribution": distribution,
-            "access": access,
-            "main_finance": main_finance,
-            "multidisc": multidisc,
-            "languages": languages,
-            "el_updated_at_from": el_updated_at_from,
-            "el_updated_at_to": el_updated_at_to,
-            "speciality_id": speciality_id,
-        }
-        # Удаляем ключи с None значениями
-        filter_dict = {k: v for k, v in filter_dict.items() if v is not None}
-
         logger.info(f"Received query parameters: {filter_dict}")
 
-        publications, total = await publication_service.get_paginated_publications_with_index_and_information(
-            db, page, per_page, filter_dict
-        )
-        total_pages = ceil(total / per_page)
-        return PaginatedResponseWith(
-            items=publications,
-            total=total,
-            page=page,
-            per_page=per_page,
-            total_pages=total_pages
+        result = await publication_service.get_paginated_publications_with_index_and_information(
+            db, page, per_page, filter_dict, cursor=cursor, fieldset=fieldset
         )
+        return ORJSONResponse(result)
     except HTTPException as e:
         raise e
     except Exception as e:
         logger.error(f"Unexpected error in list_publications_paginated: {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
+@router.get(
+    "/facets",
+    response_model=PublicationFacetsResponse,
+    dependencies=[Depends(require_role("user"))],
+    description="Возвращает количество публикаций для каждого значения фасетов (тип доступа, распространение, язык, категория ВАК и другие enum-поля) среди публикаций, подходящих под фильтры. Принимает те же фильтры, что и /with_index_and_information, и считает все фасеты одним запросом."
+)
+async def get_publication_facets(
+        db: AsyncSession = Depends(get_db1_session),
+        filter_dict: dict = Depends(with_index_filters),
+):
+    try:
+        result = await publication_service.get_publication_facets(db, filter_dict)
+        return PublicationFacetsResponse(**result)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"Unexpected error in get_publication_facets: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+@router.get(
+    "/export",
+    dependencies=[Depends(require_role("user"))],
+    description="Потоковая выгрузка всех публикаций, подходящих под фильтры, вместе с index, pub_information и классификаторами (ОЕСД, ГРНТИ, разделы). - **format**: ndjson (по объекту на строку, как элементы /with_index_and_information) или csv (вложенные поля в колонках index.* и pub_information.*, списки — JSON в ячейке). Принимает те же фильтры, что и /with_index_and_information; порядок по id."
+)
+async def export_publications(
+        export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+        filter_dict: dict = Depends(with_index_filters),
+        fieldset: PublicationFieldset = Depends(full_fieldset),
+):
+    logger.info(f"Exporting publications as {export_format} with filters: {filter_dict}")
+    media_type = "text/csv; charset=utf-8" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        publication_service.stream_publications_export(filter_dict, export_format, fieldset),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="publications.{export_format}"'},
+    )
+
+@router.post(
+    "/import",
+    response_model=PublicationImportResult,
+    dependencies=[Depends(require_role("admin"))],
+    description="Массовый импорт публикаций из тела запроса в формате выгрузки /export: - **format**: ndjson или csv. Строки сопоставляются по el_id: новые добавляются, изменённые обновляются вместе с index, pub_information, contact и классификаторами, совпадающие пропускаются. Загрузка идёт пачками по 1000 строк, каждая в своей транзакции. Для дампов на десятки тысяч журналов удобнее команда `python -m app.cli import-publications`. Доступно только администраторам."
+)
+async def import_publications(
+        request: Request,
+        import_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+        db: AsyncSession = Depends(get_db1_session),
+):
+    # Тело сначала сбрасывается во временный файл (в памяти до 16 МБ), разбор идёт построчно
+    with tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        with io.TextIOWrapper(spool, encoding="utf-8-sig", newline="") as stream:
+            result = await publication_import_service.import_publications(db, stream, import_format)
+    return result
+
+@router.get(
+    "/search",
+    response_model=PublicationSearchResponse,
+    dependencies=[Depends(require_role("user"))],
+    description="Полнотекстовый поиск публикаций по названию журнала и названиям действующих ГРНТИ, ОЕСД и разделов. Результаты упорядочены по релевантности (BM25, совпадение в названии весит больше), в каждом элементе есть score. Слова приводятся к основе, поэтому «экономика» находит и «экономики». - **q**: строка запроса. - **page**, **per_page**: пагинация по убыванию релевантности."
+)
+async def search_publications(
+        q: str = Query(..., min_length=2),
+        page: int = Query(1, ge=1),
+        per_page: int = Query(10, ge=1, le=100),
+        db: AsyncSession = Depends(get_db1_session),
+        fieldset: PublicationFieldset = Depends(plain_fieldset),
+):
+    result = await publication_service.search_publications(db, q, page, per_page, fieldset)
+    return ORJSONResponse(result)
+
+@router.get(
+    "/suggest",
+    response_model=PublicationSuggestResponse,
+    dependencies=[Depends(require_role("user"))],
+    description="Подсказки для строки поиска без обращения к базе: журналы по началу названия или любого слова в нём и по ISSN (с дефисом или без), специальности по коду (например, 5.2.3). - **q**: введённый префикс. - **limit**: сколько подсказок вернуть. Сначала совпадения с началом названия, ISSN и кодом, затем с началом слова; при равенстве — более короткие."
+)
+async def suggest_publications(
+        q: str = Query(..., min_length=1),
+        limit: int = Query(10, ge=1, le=50),
+):
+    return ORJSONResponse(publication_service.suggest_publications(q, limit))
+
+@router.get(
+    "/batch",
+    response_model=PublicationBatchResponse,
+    dependencies=[Depends(require_role("user"))],
+    description="Возвращает публикации с index, pub_information и классификаторами по списку id (?ids=1&ids=2, не больше 200) за один запрос к БД. Элементы идут в порядке переданных id, ненайденные id перечислены в missing."
+)
+async def get_publications_batch(
+        ids: List[int] = Query(...),
+        db: AsyncSession = Depends(get_db1_session),
+        fieldset: PublicationFieldset = Depends(full_fieldset),
+):
+    result = await publication_service.get_publications_batch(db, ids, fieldset)
+    return ORJSONResponse(result)
+
+@router.post(
+    "/batch",
+    response_model=PublicationBatchResponse,
+    dependencies=[Depends(require_role("user"))],
+    description="То же, что GET /batch, но список id передаётся в теле запроса: {\"ids\": [1, 2, 3]}. Удобно для длинных списков."
+)
+async def post_publications_batch(
+        data: PublicationBatchRequest,
+        db: AsyncSession = Depends(get_db1_session),
+        fieldset: PublicationFieldset = Depends(full_fieldset),
+):
+    result = await publication_service.get_publications_batch(db, data.ids, fieldset)
+    return ORJSONResponse(result)
+
 @router.get(
     "/getallwithbaseinfo",
     response_model=PaginatedBaseInfoResponse,
     dependencies=[Depends(require_role("user"))],
-    description=" Получает список базовой информации о публикациях с поддержкой пагинации и фильтрации. - **page**: Номер страницы (начинается с 1). - **per_page**: Количество элементов на странице (максимум 100). - **filters**: Фильтры для поиска базовой информации (например, язык, автор, дата).ВАЖНО: из-за бага Swagger параметр languages нужно передавать через query (?languages=русский&languages=английский), а не через body, даже если Swagger предлагает body."
+    description=" Получает список базовой информации о публикациях с поддержкой пагинации и фильтрации. - **page**: Номер страницы (начинается с 1). - **per_page**: Количество элементов на странице (максимум 100). - **languages_mode**: all (по умолчанию) — есть все выбранные языки, any — хотя бы один. - **filters**: Фильтры для поиска базовой информации (например, язык, автор, дата).ВАЖНО: из-за бага Swagger параметр languages нужно передавать через query (?languages=русский&languages=английский), а не через body, даже если Swagger предлагает body."
 )
 async def list_publication_base_info(
     db: AsyncSession = Depends(get_db1_session),
@@ -158,19 +299,47 @@ async def list_publication_actual_specialty(
     "/{pub_id}",
     response_model=PublicationResponse,
     dependencies=[Depends(require_role("user"))],
-    description="Получает информацию о публикации по её ID. Если публикация не найдена, возвращается ошибка 404."
+    description="Получает информацию о публикации по её ID. Если публикация не найдена, возвращается ошибка 404. "
+                "Ответ содержит ETag; при совпадении If-None-Match возвращается 304 без загрузки публикации."
 )
-async def get_publication(pub_id: int, db: AsyncSession = Depends(get_db1_session)):
+async def get_publication(
+        request: Request,
+        pub_id: int,
+        db: AsyncSession = Depends(get_db1_session),
+        fieldset: PublicationFieldset = Depends(plain_fieldset),
+):
+    # ETag различает и версию публикации, и запрошенный набор полей
+    etag = await table_versions.publication_etag(db, pub_id, key=fieldset)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
     try:
-        pub = await publication_service.get_publication_by_id(db, pub_id)
+        pub = await publication_service.get_publication_by_id(db, pub_id, fieldset)
         if not pub:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Публикация не найдена")
-        return pub
+        # «*» означает любую версию существующей публикации — это известно только теперь
+        if etag_matches(request, etag, exists=True):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+        return ORJSONResponse(pub, headers=etag_headers(etag))
     except HTTPException as e:
         raise e
     except Exception as e:
         logger.error(f"Unexpected error in get_publication: {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+@router.get(
+    "/{pub_id}/similar",
+    response_model=PublicationSimilarResponse,
+    dependencies=[Depends(require_role("user"))],
+    description="Журналы, похожие на публикацию: близость считается по косинусу между наборами действующих ОЕСД, ГРНТИ, специальностей и основных разделов. Матрица классификаторов хранится в памяти и пересобирается в фоне после изменений. В каждом элементе есть score от 0 до 1. - **limit**: сколько соседей вернуть. Если публикация не найдена, возвращается ошибка 404."
+)
+async def get_similar_publications(
+        pub_id: int,
+        limit: int = Query(10, ge=1, le=100),
+        db: AsyncSession = Depends(get_db1_session),
+        fieldset: PublicationFieldset = Depends(plain_fieldset),
+):
+    return ORJSONResponse(await publication_service.get_similar_publications(db, pub_id, limit, fieldset))
+
 @router.post(
     "/",
     response_model=PublicationResponse,
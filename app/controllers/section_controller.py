@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db1_session
 from app.core.security import require_role
 from app.schemas.section import SectionCreate, SectionUpdate, SectionOut
 from app.services import section_service
+from app.services.table_versions import table_versions
+from app.services.utils.etag_utils import conditional_response
 
 router = APIRouter()
 
@@ -13,7 +15,10 @@ router = APIRouter()
     dependencies=[Depends(require_role("user"))],
     description="Получает список всех разделов. Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def list_sections(db: AsyncSession = Depends(get_db1_session)):
+async def list_sections(request: Request, response: Response, db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "section"), exists=True)
+    if not_modified is not None:
+        return not_modified
     return await section_service.get_all_sections(db)
 
 @router.get(
@@ -23,7 +28,10 @@ async def list_sections(db: AsyncSession = Depends(get_db1_session)):
     description="Получает раздел по его ID. Если раздел не найден, возвращается ошибка 404. "
                 "Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def get_section(section_id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+async def get_section(request: Request, response: Response, section_id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "section", key=section_id))
+    if not_modified is not None:
+        return not_modified
     return await section_service.get_section_by_id(db, section_id)
 
 @router.post(
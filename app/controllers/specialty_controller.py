@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db1_session
 from app.core.security import require_role
 from app.schemas.specialty import SpecialtyCreate, SpecialtyUpdate, SpecialtyOut, SpecialtyResponse
 from app.services import specialty_service
+from app.services.table_versions import table_versions
+from app.services.utils.etag_utils import conditional_response
 
 router = APIRouter()
 
@@ -13,7 +15,10 @@ router = APIRouter()
     dependencies=[Depends(require_role("user"))],
     description="Получает список всех специальностей. Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def list_specialties(db: AsyncSession = Depends(get_db1_session)):
+async def list_specialties(request: Request, response: Response, db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "specialty", "ugsn", "edu_level"), exists=True)
+    if not_modified is not None:
+        return not_modified
     return await specialty_service.get_all_specialties(db)
 
 @router.get(
@@ -23,7 +28,10 @@ async def list_specialties(db: AsyncSession = Depends(get_db1_session)):
     description="Получает специальность по её ID. Если специальность не найдена, возвращается ошибка 404. "
                 "Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def get_specialty(specialty_id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+async def get_specialty(request: Request, response: Response, specialty_id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "specialty", "ugsn", "edu_level", key=specialty_id))
+    if not_modified is not None:
+        return not_modified
     return await specialty_service.get_specialty_by_id(db, specialty_id)
 
 @router.post(
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db1_session
 from app.core.security import require_role
 from app.schemas.ugsn import UGSNCreate, UGSNUpdate, UGSNOut
 from app.services import ugsn_service
+from app.services.table_versions import table_versions
+from app.services.utils.etag_utils import conditional_response
 
 router = APIRouter()
 
@@ -13,7 +15,10 @@ router = APIRouter()
     dependencies=[Depends(require_role("user"))],
     description="Получает список всех элементов UGSN. Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def list_ugsn(db: AsyncSession = Depends(get_db1_session)):
+async def list_ugsn(request: Request, response: Response, db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "ugsn"), exists=True)
+    if not_modified is not None:
+        return not_modified
     return await ugsn_service.get_all_ugsn(db)
 
 @router.get(
@@ -23,7 +28,10 @@ async def list_ugsn(db: AsyncSession = Depends(get_db1_session)):
     description="Получает элемент UGSN по его ID. Если элемент не найден, возвращается ошибка 404. "
                 "Доступ разрешен только пользователям с ролью 'user' и выше."
 )
-async def get_ugsn(id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+async def get_ugsn(request: Request, response: Response, id: int = Path(...), db: AsyncSession = Depends(get_db1_session)):
+    not_modified = conditional_response(request, response, await table_versions.etag(db, "ugsn", key=id))
+    if not_modified is not None:
+        return not_modified
     return await ugsn_service.get_ugsn_by_id(db, id)
 
 @router.post(
@@ -8,6 +8,16 @@ class Settings(BaseSettings):
     ENCRYPTION_KEY: str
     EMAIL_SENDER: str
     EMAIL_PASSWORD: str
+    # SMTP-сервер для очереди писем (см. email_outbox_worker); для проверки — локальный сервер без SSL
+    SMTP_HOST: str = "smtp.yandex.ru"
+    SMTP_PORT: int = 465
+    SMTP_SSL: bool = True
+    SMTP_TIMEOUT_SECONDS: int = 30
+    # Писем за одну пачку, пауза опроса очереди, число попыток и первая пауза перед повтором (дальше удваивается)
+    EMAIL_OUTBOX_BATCH_SIZE: int = 20
+    EMAIL_OUTBOX_POLL_SECONDS: int = 10
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    EMAIL_OUTBOX_RETRY_SECONDS: int = 30
     CONFIRMATION_TOKEN_EXPIRE_MINUTES: int
     RESET_PASSWORD_TOKEN_EXPIRE_MINUTES: int
 
@@ -22,6 +32,27 @@ class Settings(BaseSettings):
     DB1_USER: str
     DB1_PASSWORD: str
 
+    # Битовые карты фильтров публикаций в памяти (см. publication_filter_index)
+    PUBLICATION_FILTER_INDEX_ENABLED: bool = False
+    # Время жизни кэша общего количества публикаций по фильтрам
+    PUBLICATION_COUNT_CACHE_TTL_SECONDS: int = 300
+    # Загрузка страницы /publications/with_index_and_information:
+    # json — один запрос с JSON_ARRAYAGG по коллекциям, selectin — отдельный запрос на каждую коллекцию
+    PUBLICATION_PAGE_LOADER: str = "json"
+    # Как часто сервер проверяет, не изменил ли каталог другой процесс (CLI import-publications и т.п.),
+    # чтобы перестроить индексы в памяти (см. catalog_change_watcher)
+    CATALOG_CHANGE_POLL_SECONDS: int = 10
+    # Время жизни кэша пользователя и его ролей для проверки токена (см. security.principal_cache)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    # Через сколько секунд замыкание иерархии ролей перечитывается (изменения из других процессов)
+    ROLE_CLOSURE_TTL_SECONDS: int = 60
+    # Через сколько секунд индекс белого списка IP перечитывается (изменения из других процессов)
+    IP_WHITELIST_TTL_SECONDS: int = 60
+    # Потоки для bcrypt (0 — по числу ядер) и сколько операций с паролем может выполняться и ждать
+    # одновременно; сверх этого вход и регистрация сразу получают 429 (см. security.password_hasher)
+    PASSWORD_HASH_WORKERS: int = 0
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
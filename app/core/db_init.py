@@ -1,9 +1,26 @@
 import logging
 from alembic import command
 from alembic.config import Config
-from app.core.database import db1_engine
+from app.core.config import settings
+from app.core.database import db1_engine, db1_session
+from app.core.db_views import PUBLICATION_VIEWS, ensure_publication_views
+from app.core.security import password_hasher
 from app.core.base import Base
 from app import models
+from app.services import catalog_sync_service
+from app.services.catalog_change_watcher import catalog_change_watcher
+from app.services.email_outbox_worker import email_outbox_worker
+from app.services.language_filter import language_set_mask
+from app.services.publication_filter_index import publication_filter_index
+from app.services.publication_name_index import publication_name_index
+from app.services.publication_search_index import publication_search_index
+from app.services.publication_suggest_index import publication_suggest_index
+from app.services.publication_similarity_index import publication_similarity_index
+from app.services.publication_match_index import publication_match_index
+from app.services.publication_specialty_index import publication_specialty_index
+from app.services.publication_count_cache import publication_count_cache
+from app.services.publication_view_tables import publication_view_tables
+from app.services.table_versions import table_versions
 from contextlib import asynccontextmanager
 
 logger = logging.getLogger(__name__)
@@ -12,10 +29,31 @@ async def init_db():
     # Инициализация первой базы данных
     async with db1_engine.begin() as conn:
         logger.info("Creating tables in DB1...")
-        await conn.run_sync(Base.metadata.create_all, checkfirst=True)
+        # VIEW публикаций создаёт ensure_publication_views, а не create_all (иначе на пустой базе появятся таблицы)
+        tables = [table for table in Base.metadata.sorted_tables if table.name not in PUBLICATION_VIEWS]
+        await conn.run_sync(Base.metadata.create_all, tables=tables, checkfirst=True)
         logger.info("Tables created in DB1")
+        await ensure_publication_views(conn)
+        logger.info("Publication views checked in DB1")
 
 
+async def init_catalog_indexes():
+    catalog_sync_service.register_listener(language_set_mask)
+    catalog_sync_service.register_listener(publication_name_index)
+    catalog_sync_service.register_listener(publication_search_index)
+    catalog_sync_service.register_listener(publication_suggest_index)
+    catalog_sync_service.register_listener(publication_similarity_index)
+    catalog_sync_service.register_listener(publication_match_index)
+    catalog_sync_service.register_listener(publication_specialty_index)
+    catalog_sync_service.register_listener(publication_count_cache)
+    catalog_sync_service.register_listener(publication_view_tables)
+    catalog_sync_service.register_listener(table_versions)
+    if settings.PUBLICATION_FILTER_INDEX_ENABLED:
+        catalog_sync_service.register_listener(publication_filter_index)
+
+    async with db1_session() as session:
+        await catalog_change_watcher.rebuild(session)
+
 
 @asynccontextmanager
 async def lifespan(app):
@@ -26,5 +64,16 @@ async def lifespan(app):
     await init_db()
     logger.info("Database initialized.")
 
+    logger.info("Building catalog indexes...")
+    await init_catalog_indexes()
+    logger.info("Catalog indexes built.")
+
+    catalog_change_watcher.start()
+    email_outbox_worker.start()
+    logger.info("Email outbox worker started.")
+
     yield
+    await catalog_change_watcher.stop()
+    await email_outbox_worker.stop()
+    password_hasher.shutdown()
     logger.info("Application shutdown.")
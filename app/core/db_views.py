@@ -0,0 +1,84 @@
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+logger = logging.getLogger(__name__)
+
+# Общие части VIEW: название и ISSN публикации
+_NAME = "LEFT(p.name, 255) AS `Наименование`"
+_ISSN = "CONCAT(COALESCE(pi.issn_print, ''), '/', COALESCE(pi.issn_elect, '')) AS `ISSN (печ/эл)`"
+
+# Определения VIEW, на которых стоят PublicationBaseInfo и PublicationActualSpecialty.
+# pub_id связывает строки VIEW с публикацией (см. publication_view_tables); коррелированные
+# подзапросы вместо GROUP BY оставляют VIEW сливаемым, и условие на pub_id доходит до таблиц.
+PUBLICATION_VIEWS = {
+    "publication_base_info": f"""
+SELECT
+    p.id AS pub_id,
+    {_NAME},
+    {_ISSN},
+    (SELECT GROUP_CONCAT(o.name ORDER BY o.code SEPARATOR '; ')
+       FROM actual_oecd ao JOIN oecd o ON o.id = ao.oecd_id
+      WHERE ao.pub_id = p.id AND ao.actual) AS `Направления`,
+    LEFT(c.site, 255) AS `Сайт`,
+    pi.issues_year AS `Периодичность`,
+    p.language AS `Языки`,
+    c.email AS `Почта`,
+    c.phone AS `Телефон`,
+    r.period_pub AS `Срок рецензирования`,
+    (SELECT GROUP_CONCAT(s.name ORDER BY s.name SEPARATOR '; ')
+       FROM main_sections ms JOIN section s ON s.id = ms.section_id
+      WHERE ms.pub_id = p.id AND ms.actual) AS `Разделы`,
+    i.vak_cat AS `Категория ВАК`
+FROM publication p
+LEFT JOIN pub_information pi ON pi.pub_id = p.id
+LEFT JOIN contact c ON c.pub_id = p.id
+LEFT JOIN review r ON r.pub_id = p.id
+LEFT JOIN `index` i ON i.pub_id = p.id
+""",
+    "publication_actual_specialty": f"""
+SELECT
+    p.id AS pub_id,
+    {_NAME},
+    {_ISSN},
+    CONCAT(s.code, ' ', s.name) AS `Наименование специальности`,
+    a.source AS `Источник`,
+    a.actual AS `Признак актуальности`,
+    DATE_FORMAT(a.start_date, '%d.%m.%Y') AS `Дата включения в перечень`,
+    DATE_FORMAT(a.end_date, '%d.%m.%Y') AS `Дата исключения из перечня`
+FROM actual_specialty a
+JOIN publication p ON p.id = a.pub_id
+JOIN specialty s ON s.id = a.specialty_id
+LEFT JOIN pub_information pi ON pi.pub_id = p.id
+""",
+}
+
+
+def create_view_sql(name: str) -> str:
+    return f"CREATE OR REPLACE VIEW `{name}` AS {PUBLICATION_VIEWS[name]}"
+
+
+async def _views_with_pub_id(conn: AsyncConnection) -> set:
+    result = await conn.execute(
+        text(
+            "SELECT TABLE_NAME FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND COLUMN_NAME = 'pub_id' AND TABLE_NAME IN :names"
+        ).bindparams(names=tuple(PUBLICATION_VIEWS)),
+    )
+    return set(result.scalars().all())
+
+
+async def ensure_publication_views(conn: AsyncConnection) -> None:
+    """
+    Создаёт VIEW публикаций, если их нет или в них ещё нет pub_id (версия до 7b3e2c91d4a5).
+    Если после этого столбца всё равно нет, запуск прерывается: сервисы и перестройка
+    таблиц *_mat без него не работают.
+    """
+    missing = set(PUBLICATION_VIEWS) - await _views_with_pub_id(conn)
+    for name in sorted(missing):
+        logger.warning(f"View {name} has no pub_id column, recreating it")
+        await conn.execute(text(create_view_sql(name)))
+    missing = set(PUBLICATION_VIEWS) - await _views_with_pub_id(conn)
+    if missing:
+        raise RuntimeError(f"Views {', '.join(sorted(missing))} have no pub_id column, see app/core/db_views.py")
@@ -1,6 +1,9 @@
+import asyncio
 import logging
+import os
 import secrets
-from typing import Annotated
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Callable, Dict, NamedTuple, Optional
 from urllib.parse import urljoin, urlencode
 
 from fastapi.security import OAuth2PasswordBearer
@@ -10,10 +13,11 @@ from datetime import datetime, timedelta
 from fastapi import HTTPException, Depends, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
 from app.core.database import get_db1_session
+from app.services.role_closure import role_closure
+from app.services.utils.ttl_cache import TTLCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/swagger-login")
 
@@ -26,12 +30,69 @@ pwd_context = CryptContext(
 )
 
 
+class Principal(NamedTuple):
+    """
+    Пользователь из токена в том виде, который нужен проверкам доступа.
+    Права роли (она сама и её предки) берутся из role_closure по role_id.
+    """
+    id: int
+    username: str
+    is_active: bool
+    role_id: int
+
+
+class PrincipalCache:
+    """
+    Principal по subject токена на PRINCIPAL_CACHE_TTL_SECONDS, чтобы проверка доступа не ходила в БД
+    на каждый запрос. Сервисы пользователей сбрасывают его явно; в других процессах
+    изменение становится видно не позже чем через TTL.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self._cache = TTLCache(ttl_seconds)
+        self._usernames: Dict[int, str] = {}
+        # Растёт при каждом сбросе, чтобы не сохранить principal, прочитанный до изменения
+        self.generation = 0
+
+    def get(self, username: str) -> Optional[Principal]:
+        hit, principal = self._cache.get(username)
+        return principal if hit else None
+
+    def set(self, principal: Principal, generation: int) -> None:
+        if generation != self.generation:
+            return
+        self._cache.set(principal.username, principal)
+        self._usernames[principal.id] = principal.username
+
+    def invalidate_user(self, user_id: int) -> None:
+        self.generation += 1
+        username = self._usernames.pop(user_id, None)
+        if username is not None:
+            self._cache.pop(username)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._cache.clear()
+        self._usernames = {}
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+async def _load_principal(db: AsyncSession, username: str) -> Optional[Principal]:
+    from app.models.user import User
+    user = (await db.execute(
+        select(User.id, User.username, User.is_active, User.role_id).where(User.username == username)
+    )).one_or_none()
+    if user is None:
+        return None
+    return Principal(user.id, user.username, bool(user.is_active), user.role_id)
+
+
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Annotated[AsyncSession, Depends(get_db1_session)]
-):
-    from app.models.user import User
-    from app.models.role import Role
+) -> Principal:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         username: str = payload.get("sub")
@@ -39,31 +100,28 @@ async def get_current_user(
         if not username:
             raise HTTPException(status_code=401, detail="Invalid token payload")
 
-        result = await db.execute(
-            select(User)
-            .options(
-                selectinload(User.role).selectinload(Role.parent)
-            )
-            .where(User.username == username)
-        )
-        user = result.scalar_one_or_none()
-
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-
-        return user
+        principal = principal_cache.get(username)
+        if principal is None:
+            generation = principal_cache.generation
+            principal = await _load_principal(db, username)
+            if not principal:
+                raise HTTPException(status_code=401, detail="User not found")
+            principal_cache.set(principal, generation)
+
+        if role_closure.expired():
+            await role_closure.rebuild(db)
+        return principal
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
 
 # Зависимость-проверка на наличие роли
 def require_role(required_role: str):
-    from app.models.user import User
     async def role_checker(
-            current_user: Annotated[User, Depends(get_current_user)]
+            current_user: Annotated[Principal, Depends(get_current_user)]
     ):
-        # Проверка по иерархии
-        if not await has_role(current_user.role, required_role):
+        # Проверка по иерархии: роль пользователя или любой из её родителей
+        if not role_closure.has_role(current_user.role_id, required_role):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions",
@@ -71,12 +129,8 @@ def require_role(required_role: str):
     return role_checker
 
 async def has_role(user_role, required_role_name: str):
-    current = user_role
-    while current:
-        if current.name == required_role_name:
-            return True
-        current = current.parent  # parent должен быть загружен (selectinload)
-    return False
+    # Родители берутся из замыкания иерархии, а не из ORM-связи parent
+    return role_closure.has_role(user_role.id if user_role is not None else None, required_role_name)
 
 def get_password_hash(password: str) -> str:
     hashed = pwd_context.hash(password)
@@ -90,6 +144,48 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return is_valid
 
 
+class PasswordHasher:
+    """
+    bcrypt в отдельном пуле потоков: 12 раундов — сотни миллисекунд, и в обработчике они останавливали бы
+    цикл событий вместе со всеми остальными запросами. bcrypt отпускает GIL, поэтому потоки считают
+    параллельно по числу ядер. Выполняющихся и ждущих операций не больше max_pending: при всплеске входов
+    лишние сразу получают 429, а не стоят в очереди, которая растёт быстрее, чем разбирается.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+
+    async def _run(self, func: Callable, *args):
+        # Счётчик меняется только в цикле событий, блокировка не нужна
+        if self.pending >= self.max_pending:
+            logger.warning(f"Password hashing queue is full: {self.pending} pending")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Слишком много одновременных запросов, повторите попытку позже",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
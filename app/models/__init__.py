@@ -10,6 +10,7 @@ from .actual_specialty import ActualSpecialty
 from .city import City
 from .contact import Contact
 from .edu_level import EduLevel
+from .email_outbox import EmailOutbox
 from .index import Index
 from .journal import Journal
 from .main_section import MainSection
@@ -17,15 +18,18 @@ from .section import Section
 from .pub_information import PubInformation
 from .publication import Publication
 from .publication_actual_specialty import PublicationActualSpecialty
+from .publication_actual_specialty_table import PublicationActualSpecialtyTable
 from .publication_base_info import PublicationBaseInfo
+from .publication_base_info_table import PublicationBaseInfoTable
 from .review import Review
 from .role import Role
 from .section import Section
+from .table_version import TableVersion
 from .ugsn import UGSN
 __all__ = [
     "User", "Role", "IPWhitelist", "OECD", "ActualOECD",
     "Grnti", "ActualGRNTI", "Specialty", "ActualSpecialty",
-    "City", "Contact", "EduLevel", "Index", "Journal", "MainSection",
+    "City", "Contact", "EduLevel", "EmailOutbox", "Index", "Journal", "MainSection",
     "Section", "PubInformation", "Publication", "PublicationActualSpecialty",
-    "PublicationBaseInfo", "Review", "UGSN"
+    "PublicationActualSpecialtyTable", "PublicationBaseInfo", "PublicationBaseInfoTable", "Review", "UGSN"
 ]
\ No newline at end of file
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+
+from app.core.base import Base
+
+# Статусы письма в очереди
+OUTBOX_PENDING = "pending"
+OUTBOX_SENT = "sent"
+OUTBOX_FAILED = "failed"
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    html_body = Column(Text, nullable=True)
+    status = Column(String(16), nullable=False, default=OUTBOX_PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Раньше этого времени не отправлять
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Выборка очередной пачки: status = pending и next_attempt_at <= now
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
@@ -12,6 +12,7 @@ class SourceEnum(enum.Enum):
 class PublicationActualSpecialty(Base):
     __tablename__ = "publication_actual_specialty"  # имя VIEW в БД
 
+    pub_id = Column("pub_id", Integer, nullable=False)  # id публикации (определение VIEW — app/core/db_views.py)
     name = Column("Наименование", String(255), primary_key=True)  # pk нет, выбираем name
     issn = Column("ISSN (печ/эл)", VARCHAR(19), nullable=False)
     specialty_name = Column("Наименование специальности", VARCHAR(170), nullable=True)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, ForeignKey, Enum as SqlEnum, SmallInteger, VARCHAR, String, Index
+
+from app.core.base import Base
+from app.models.publication_actual_specialty import SourceEnum
+
+
+class PublicationActualSpecialtyTable(Base):
+    """
+    Материализованная копия VIEW publication_actual_specialty, поддерживается publication_view_tables.
+    Имена атрибутов совпадают с PublicationActualSpecialty; в отличие от VIEW, у строк есть собственный id.
+    """
+    __tablename__ = "publication_actual_specialty_mat"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    pub_id = Column(Integer, ForeignKey("publication.id", onupdate="CASCADE", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(255), nullable=False, index=True)
+    issn = Column(VARCHAR(19), nullable=False, index=True)
+    specialty_name = Column(VARCHAR(170), nullable=True, index=True)
+    source = Column(SqlEnum(SourceEnum, native_enum=False, create_type=False, values_callable=lambda obj: [e.value for e in obj]), nullable=False)
+    actual_flag = Column(SmallInteger, nullable=False)
+    inclusion_date = Column(String(10), nullable=True)
+    exclusion_date = Column(String(10), nullable=True)
+
+    __table_args__ = (
+        Index("ix_publication_actual_specialty_mat_source_actual", "source", "actual_flag"),
+    )
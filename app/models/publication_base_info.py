@@ -7,6 +7,7 @@ from app.models.publication import LanguageEnum
 class PublicationBaseInfo(Base):
     __tablename__ = "publication_base_info"  # имя в базе (VIEW)
 
+    pub_id = Column("pub_id", Integer, nullable=False)  # id публикации (определение VIEW — app/core/db_views.py)
     name = Column("Наименование", VARCHAR(255), primary_key=True)  # ключа в VIEW нет, возьмём name как pk
     issn = Column("ISSN (печ/эл)", VARCHAR(19), nullable=False)
     directions = Column("Направления", Text, nullable=True)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, Text, Enum, ForeignKey
+from sqlalchemy.dialects.mysql import SET, VARCHAR
+from app.core.base import Base
+from app.models.publication import LanguageEnum
+
+
+class PublicationBaseInfoTable(Base):
+    """
+    Материализованная копия VIEW publication_base_info, поддерживается publication_view_tables.
+    Имена атрибутов совпадают с PublicationBaseInfo.
+    """
+    __tablename__ = "publication_base_info_mat"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    pub_id = Column(Integer, ForeignKey("publication.id", onupdate="CASCADE", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(VARCHAR(255), nullable=False, index=True)
+    issn = Column(VARCHAR(19), nullable=False, index=True)
+    directions = Column(Text, nullable=True)
+    site = Column(VARCHAR(255), nullable=True)
+    periodicity = Column(Integer, nullable=True, index=True)
+    languages = Column(SET(*[language.value for language in LanguageEnum]), nullable=False)
+    email = Column(VARCHAR(45), nullable=True)
+    phone = Column(VARCHAR(20), nullable=True)
+    review_period = Column(VARCHAR(15), nullable=True)
+    sections = Column(Text, nullable=True)
+    vak_category = Column(Enum("нет", "1", "2", "3"), nullable=True, index=True)
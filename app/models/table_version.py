@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, BigInteger
+
+from app.core.base import Base
+
+
+class TableVersion(Base):
+    __tablename__ = "table_version"
+
+    # Имя таблицы (section, oecd, ...), "publication" или "publication:<id>" для отдельной публикации
+    name = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, conint, confloat, condecimal, conlist
+
+from app.schemas.publication import PublicationResponse
+
+
+class MatchWeights(BaseModel):
+    specialty: confloat(ge=0) = 0.4
+    grnti: confloat(ge=0) = 0.3
+    quality: confloat(ge=0) = 0.2
+    price: confloat(ge=0) = 0.1
+
+class MatchRequest(BaseModel):
+    """
+    Описание статьи: тематические коды оцениваются, ограничения отсекают журналы.
+    Квартиль и категория означают «не ниже указанного»: wos_quartile=2 пропускает Q1 и Q2.
+    """
+    specialty_codes: conlist(str, max_length=50) = []
+    grnti_codes: conlist(str, max_length=50) = []
+    wos_quartile: Optional[conint(ge=1, le=4)] = None
+    scopus_quartile: Optional[conint(ge=1, le=4)] = None
+    vak_category: Optional[conint(ge=1, le=3)] = None
+    open_access: bool = False
+    max_price: Optional[condecimal(ge=0, max_digits=10, decimal_places=2)] = None
+    weights: MatchWeights = MatchWeights()
+    limit: conint(ge=1, le=100) = 20
+
+class MatchCriteria(BaseModel):
+    specialty: Optional[float] = None
+    grnti: Optional[float] = None
+    quality: Optional[float] = None
+    price: Optional[float] = None
+
+class MatchItem(PublicationResponse):
+    score: float
+    criteria: MatchCriteria
+
+class MatchResponse(BaseModel):
+    items: List[MatchItem]
+    total: int
@@ -2,7 +2,7 @@ from enum import Enum
 
 from fastapi import Query
 from pydantic import BaseModel
-from typing import Optional, Set, List
+from typing import Optional, Set, List, Dict
 from datetime import date
 
 from app.schemas.actual_grnti import ActualGRNTIBase, ActualGRNTIResponse
@@ -66,6 +66,10 @@ class LanguageEnum(str, Enum):
     macedonian = "македонский"
     polish = "польский"
 
+class LanguagesModeEnum(str, Enum):
+    any = "any"  # есть хотя бы один из выбранных языков
+    all = "all"  # есть все выбранные языки
+
 class PublicationBase(BaseModel):
     el_id: int
     vak_id: Optional[int] = None
@@ -159,12 +163,41 @@ class PublicationResponseWith(BaseModel):
     class Config:
         from_attributes = True
 
+class PublicationBatchRequest(BaseModel):
+    ids: List[int]
+
+class PublicationBatchResponse(BaseModel):
+    items: List[PublicationResponseWith]
+    missing: List[int] = []
+
+class PublicationSearchItem(PublicationResponse):
+    score: float
+
+class PublicationSearchResponse(BaseModel):
+    items: List[PublicationSearchItem]
+    total: int
+    page: int
+    per_page: int
+    total_pages: int
+
+class PublicationSimilarResponse(BaseModel):
+    items: List[PublicationSearchItem]
+
+class PublicationSuggestion(BaseModel):
+    type: str
+    id: int
+    label: str
+
+class PublicationSuggestResponse(BaseModel):
+    items: List[PublicationSuggestion]
+
 class PaginatedResponse(BaseModel):
     items: List[PublicationResponse]
     total: int
     page: int
     per_page: int
     total_pages: int
+    total_cached: bool = False
 
 class PaginatedResponseWith(BaseModel):
     items: List[PublicationResponseWith]
@@ -172,6 +205,12 @@ class PaginatedResponseWith(BaseModel):
     page: int
     per_page: int
     total_pages: int
+    total_cached: bool = False
+    next_cursor: Optional[str] = None
+
+class PublicationFacetsResponse(BaseModel):
+    total: int
+    facets: Dict[str, Dict[str, int]]
 
 class PublicationFilter(BaseModel):
     el_id: Optional[int] = None
@@ -185,6 +224,7 @@ class PublicationFilter(BaseModel):
     main_finance: Optional[MainFinanceEnum] = None
     multidisc: Optional[MultidiscEnum] = None
     languages: Optional[Set[LanguageEnum]] = None
+    languages_mode: LanguagesModeEnum = LanguagesModeEnum.all
     el_updated_at_from: Optional[date] = None
     el_updated_at_to: Optional[date] = None
 
@@ -2,7 +2,7 @@ from pydantic import BaseModel, field_validator
 from typing import Optional, Set, List
 from enum import Enum
 
-from app.schemas.publication import LanguageEnum
+from app.schemas.publication import LanguageEnum, LanguagesModeEnum
 
 
 class VakCategoryEnum(str, Enum):
@@ -42,6 +42,7 @@ class PublicationBaseInfoFilter(BaseModel):
     site: Optional[str] = None
     periodicity: Optional[int] = None
     languages: Optional[Set[LanguageEnum]] = None
+    languages_mode: LanguagesModeEnum = LanguagesModeEnum.all
     email: Optional[str] = None
     phone: Optional[str] = None
     review_period: Optional[str] = None
@@ -0,0 +1,54 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.schemas.actual_grnti import ActualGRNTIBase
+from app.schemas.actual_oecd import ActualOECDBase
+from app.schemas.contact import ContactBase
+from app.schemas.index import IndexBase
+from app.schemas.main_section import MainSectionBase
+from app.schemas.pub_information import PubInformationBase
+from app.schemas.publication import PublicationBase
+
+
+# Во вложенных строках pub_id не нужен: публикация определяется по el_id строки
+class ImportIndex(IndexBase):
+    pub_id: Optional[int] = None
+
+class ImportPubInformation(PubInformationBase):
+    pass
+
+class ImportContact(ContactBase):
+    pub_id: Optional[int] = None
+
+class ImportActualOECD(ActualOECDBase):
+    pub_id: Optional[int] = None
+
+class ImportActualGRNTI(ActualGRNTIBase):
+    pub_id: Optional[int] = None
+
+class ImportMainSection(MainSectionBase):
+    pub_id: Optional[int] = None
+
+class PublicationImportRow(PublicationBase):
+    """
+    Строка импорта в формате выгрузки /publications/export. id из файла игнорируется.
+    Отсутствующая (null) связь не меняется; пустой список классификаторов удаляет все записи.
+    """
+    index: Optional[ImportIndex] = None
+    pub_information: Optional[ImportPubInformation] = None
+    contact: Optional[ImportContact] = None
+    actual_oecd_items: Optional[List[ImportActualOECD]] = None
+    actual_grnti_items: Optional[List[ImportActualGRNTI]] = None
+    main_sections: Optional[List[ImportMainSection]] = None
+
+class PublicationImportError(BaseModel):
+    line: int
+    detail: str
+
+class PublicationImportResult(BaseModel):
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    errors: List[PublicationImportError] = []
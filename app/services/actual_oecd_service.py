@@ -4,6 +4,7 @@ from sqlalchemy.orm import joinedload
 
 from app.models.actual_oecd import ActualOECD
 from app.schemas.actual_oecd import ActualOECDCreate, ActualOECDUpdate
+from app.services import catalog_sync_service
 
 async def get_all_actual_oecd(db: AsyncSession):
     result = await db.execute(
@@ -24,16 +25,19 @@ async def create_actual_oecd(db: AsyncSession, data: ActualOECDCreate):
     db.add(record)
     await db.commit()
     await db.refresh(record)
+    await catalog_sync_service.publications_changed(db, [record.pub_id])
     return record
 
 async def update_actual_oecd(db: AsyncSession, actual_oecd_id: int, data: ActualOECDUpdate):
     record = await get_actual_oecd_by_id(db, actual_oecd_id)
     if not record:
         return None
+    old_pub_id = record.pub_id
     for field, value in data.dict(exclude_unset=True).items():
         setattr(record, field, value)
     await db.commit()
     await db.refresh(record)
+    await catalog_sync_service.publications_changed(db, [old_pub_id, record.pub_id])
     return record
 
 async def delete_actual_oecd(db: AsyncSession, actual_oecd_id: int):
@@ -42,4 +46,5 @@ async def delete_actual_oecd(db: AsyncSession, actual_oecd_id: int):
         return False
     await db.delete(record)
     await db.commit()
+    await catalog_sync_service.publications_changed(db, [record.pub_id])
     return True
@@ -14,6 +14,7 @@ from app.schemas.actual_specialty import ActualSpecialtyCreate, ActualSpecialtyU
 from app.schemas.publication import PublicationBase, PaginatedResponse
 from app.schemas.section import SectionOut
 from app.schemas.specialty import SpecialtyBase, SpecialtyResponse
+from app.services import catalog_sync_service
 
 
 async def get_paginated_actual_specialty(
@@ -99,18 +100,21 @@ async def create_actual_specialty(db: AsyncSession, data: ActualSpecialtyCreate)
     db.add(record)
     await db.commit()
     await db.refresh(record)
+    await catalog_sync_service.publications_changed(db, [record.pub_id])
     return record
 
 async def update_actual_specialty(db: AsyncSession, id: int, data: ActualSpecialtyUpdate):
     record = await get_actual_specialty_by_id(db, id)
     if not record:
         return None
+    old_pub_id = record.pub_id
 
     for field, value in data.dict(exclude_unset=True).items():  # Игнорируем поля со значением None
         setattr(record, field, value)
 
     await db.commit()
     await db.refresh(record)
+    await catalog_sync_service.publications_changed(db, [old_pub_id, record.pub_id])
     return record
 
 async def delete_actual_specialty(db: AsyncSession, id: int):
@@ -119,4 +123,5 @@ async def delete_actual_specialty(db: AsyncSession, id: int):
         return False
     await db.delete(record)
     await db.commit()
+    await catalog_sync_service.publications_changed(db, [record.pub_id])
     return True
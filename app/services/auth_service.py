@@ -6,20 +6,21 @@ from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 from app.schemas.auth import RegisterRequest, LoginRequest, TokenResponse
-from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token, \
-    decode_token, generate_confirmation_token
+from app.core.security import password_hasher, create_access_token, create_refresh_token, \
+    decode_token, generate_confirmation_token, principal_cache
 from app.core.logger import logger
 from app.models.role import Role
 from jose import JWTError, ExpiredSignatureError
 
 from app.services.utils.email_templates import EmailTemplates
-from app.services.utils.ip_utils import is_ip_whitelisted
+from app.services.utils.ip_utils import is_ip_whitelisted, match_ip_whitelist
 from app.services.email_service import EmailService
+from app.services.email_outbox_worker import email_outbox_worker
 
 class AuthService:
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.email_service = EmailService()
+        self.email_service = EmailService(db)
     async def register_user(self, data: RegisterRequest, request: Request) -> dict:
 
         result = await self.db.execute(select(User).where(User.username == data.username))
@@ -49,21 +50,15 @@ class AuthService:
         # Получение HTML-шаблона письма
         html_body = EmailTemplates.confirmation_email_template(confirmation_link)
 
-        try:
-            # Попытка отправить письмо с подтверждением
-            await self.email_service.send_email(
-                recipient_email=data.username,
-                subject="Подтверждение аккаунта",
-                body=f"Пожалуйста подтвердите свой аккаунт перейдя по ссылке: {confirmation_link}",
-                html_body=html_body
-            )
-        except Exception as e:
-            # Если отправка письма не удалась, выбрасываем исключение
-            logger.error(f"Ошибка отправки сообщения на почту: {e}")
-            raise HTTPException(status_code=500, detail="Ошибка отправки сообщения на почту")
-
+        # Письмо ставится в очередь в одной транзакции с пользователем и уходит после commit
+        await self.email_service.send_email(
+            recipient_email=data.username,
+            subject="Подтверждение аккаунта",
+            body=f"Пожалуйста подтвердите свой аккаунт перейдя по ссылке: {confirmation_link}",
+            html_body=html_body
+        )
 
-        hashed_password = get_password_hash(data.password)
+        hashed_password = await password_hasher.hash(data.password)
         new_user = User(
             username=data.username,
             password=hashed_password,
@@ -75,6 +70,7 @@ class AuthService:
 
         self.db.add(new_user)
         await self.db.commit()
+        email_outbox_worker.wake()
         await self.db.refresh(new_user)
         return {"message": "Пользователь успешно зарегистрирован. Пожалуйста подтвердите аккаунт при помощи ссылки на почте."}
 
@@ -86,7 +82,7 @@ class AuthService:
             raise HTTPException(status_code=400, detail="Неправильный логин или пароль")
 
         logger.debug(f"Verifying password. Plain: {data.password}, Hashed: {user.password}")
-        if not verify_password(data.password, user.password):
+        if not await password_hasher.verify(data.password, user.password):
             logger.error(f"Password verification failed for user: {data.username}")
             raise HTTPException(status_code=400, detail="Неправильный логин или пароль")
 
@@ -98,7 +94,8 @@ class AuthService:
         logger.info(f"Login attempt from IP: {client_ip} for user: {data.username}")
 
         # Проверяем, входит ли IP в вайтлист
-        is_allowed = await is_ip_whitelisted(self.db, client_ip)
+        whitelist_match = await match_ip_whitelist(self.db, client_ip)
+        is_allowed = whitelist_match is not None
 
         # Получаем текущую роль
         role_query = await self.db.execute(select(Role).where(Role.id == user.role_id))
@@ -111,7 +108,11 @@ class AuthService:
             if new_role:
                 user.role_id = new_role.id
                 await self.db.commit()
-                logger.info(f"User '{user.username}' role upgraded from 'guest' to 'user' based on IP {client_ip}")
+                principal_cache.invalidate_user(user.id)
+                logger.info(
+                    f"User '{user.username}' role upgraded from 'guest' to 'user' based on IP {client_ip} "
+                    f"({whitelist_match.ip_network}, {whitelist_match.organization_name})"
+                )
 
         access_token = create_access_token(data={"sub": user.username})
         refresh_token = create_refresh_token(data={"sub": user.username})
@@ -173,6 +174,7 @@ class AuthService:
         # Обновляем роль пользователя
         user.role_id = new_role_id
         await self.db.commit()
+        principal_cache.invalidate_user(user_id)
 
         logger.info(f"Role for user {user_id} changed to {new_role_id}")
         return {"message": "Role updated successfully", "user_id": str(user_id), "new_role_id": str(new_role_id)}
@@ -195,21 +197,18 @@ class AuthService:
         # Получение HTML-шаблона письма
         html_body = EmailTemplates.confirmation_email_template(confirmation_link)
 
-        try:
-            # Отправка письма с подтверждением
-            await self.email_service.send_email(
-                recipient_email=email,
-                subject="Подтверждение аккаунта",
-                body=f"Пожалуйста подтвердите свой аккаунт перейдя по ссылке: {confirmation_link}",
-                html_body = html_body
-            )
-        except Exception as e:
-            logger.error(f"Ошибка отправки сообщения на почту: {e}")
-            raise HTTPException(status_code=500, detail="Ошибка отправки сообщения на почту")
+        # Письмо ставится в очередь в одной транзакции с новым токеном
+        await self.email_service.send_email(
+            recipient_email=email,
+            subject="Подтверждение аккаунта",
+            body=f"Пожалуйста подтвердите свой аккаунт перейдя по ссылке: {confirmation_link}",
+            html_body = html_body
+        )
 
         # Обновление токена подтверждения в базе данных
         user.confirmation_token = confirmation_token
         await self.db.commit()
+        email_outbox_worker.wake()
         await self.db.refresh(user)
 
         return {
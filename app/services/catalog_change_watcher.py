@@ -0,0 +1,65 @@
+import asyncio
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import db1_session
+from app.core.logger import logger
+from app.services import catalog_sync_service
+from app.services.table_versions import table_versions
+
+
+class CatalogChangeWatcher:
+    """
+    Следит за изменениями каталога, сделанными другими процессами. CLI import-publications и
+    rebuild-view-tables пишут в БД напрямую и поднимают версию "publication" в table_version;
+    сервер раз в poll_seconds сравнивает её с версией, по которой строил индексы,
+    и при расхождении перестраивает все слушатели catalog_sync_service.
+    Собственные изменения сервера идут через publications_changed и версию "publication" не трогают.
+    """
+
+    def __init__(self, session_factory: Callable = db1_session, poll_seconds: float = settings.CATALOG_CHANGE_POLL_SECONDS):
+        self._session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self._version: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        # Версия читается до перестройки: изменение во время неё вызовет ещё одну
+        version = await table_versions.version(db, "publication")
+        await catalog_sync_service.rebuild_all(db)
+        self._version = version
+
+    async def check(self) -> bool:
+        async with self._session_factory() as db:
+            version = await table_versions.version(db, "publication")
+            if version == self._version:
+                return False
+            logger.info(f"Catalog changed by another process (version {self._version} -> {version}), rebuilding indexes")
+            await self.rebuild(db)
+        return True
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Catalog change check failed: {str(e)}")
+
+
+catalog_change_watcher = CatalogChangeWatcher()
@@ -0,0 +1,42 @@
+from typing import Iterable, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import logger
+
+# Индексы и кэши каталога, которые живут в памяти процесса.
+# Каждый слушатель реализует:
+#   ready: bool
+#   async rebuild(db) - полная перестройка из БД
+#   async refresh(db, pub_ids) - обновление данных по изменённым публикациям
+_listeners: List = []
+
+
+def register_listener(listener) -> None:
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+async def rebuild_all(db: AsyncSession) -> None:
+    for listener in _listeners:
+        try:
+            await listener.rebuild(db)
+        except Exception as e:
+            listener.ready = False
+            logger.error(f"Failed to rebuild {type(listener).__name__}: {str(e)}")
+
+
+async def publications_changed(db: AsyncSession, pub_ids: Iterable[int]) -> None:
+    """
+    Вызывается сервисами после commit изменений публикации или связанных с ней таблиц.
+    """
+    pub_ids = {pub_id for pub_id in pub_ids if pub_id is not None}
+    if not pub_ids:
+        return
+    for listener in _listeners:
+        try:
+            await listener.refresh(db, pub_ids)
+        except Exception as e:
+            # Устаревший индекс хуже его отсутствия: запросы уйдут в БД до следующей перестройки
+            listener.ready = False
+            logger.error(f"Failed to refresh {type(listener).__name__} for {sorted(pub_ids)}: {str(e)}")
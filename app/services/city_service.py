@@ -3,6 +3,7 @@ from sqlalchemy import select
 from app.models.city import City
 from app.schemas.city import CityCreate, CityUpdate
 from fastapi import HTTPException
+from app.services.table_versions import table_versions
 
 async def get_all_cities(db: AsyncSession):
     result = await db.execute(select(City))
@@ -19,6 +20,7 @@ async def create_city(db: AsyncSession, data: CityCreate):
     city = City(**data.dict())
     db.add(city)
     await db.commit()
+    await table_versions.bump(db, "city")
     await db.refresh(city)
     return city
 
@@ -27,6 +29,7 @@ async def update_city(db: AsyncSession, city_id: int, data: CityUpdate):
     for field, value in data.dict(exclude_unset=True).items():
         setattr(city, field, value)
     await db.commit()
+    await table_versions.bump(db, "city")
     await db.refresh(city)
     return city
 
@@ -39,4 +42,5 @@ async def delete_city(db: AsyncSession, city_id: int):
     # Удаляем запись
     await db.delete(city)
     await db.commit()
+    await table_versions.bump(db, "city")
     return True
\ No newline at end of file
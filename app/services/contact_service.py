@@ -5,6 +5,7 @@ from sqlalchemy.orm import joinedload
 
 from app.models.contact import Contact
 from app.schemas.contact import ContactCreate, ContactUpdate
+from app.services import catalog_sync_service
 
 async def get_all_contacts(db: AsyncSession):
     result = await db.execute(
@@ -28,6 +29,7 @@ async def create_contact(db: AsyncSession, contact_in: ContactCreate):
     db.add(contact)
     await db.commit()
     await db.refresh(contact)
+    await catalog_sync_service.publications_changed(db, [contact.pub_id])
     return contact
 
 async def update_contact(db: AsyncSession, pub_id: int, contact_in: ContactUpdate):
@@ -37,9 +39,11 @@ async def update_contact(db: AsyncSession, pub_id: int, contact_in: ContactUpdat
     db.add(contact)
     await db.commit()
     await db.refresh(contact)
+    await catalog_sync_service.publications_changed(db, [pub_id, contact.pub_id])
     return contact
 
 async def delete_contact(db: AsyncSession, pub_id: int):
     contact = await get_contact_by_pub_id(db, pub_id)
     await db.delete(contact)
     await db.commit()
+    await catalog_sync_service.publications_changed(db, [pub_id])
@@ -6,6 +6,7 @@ from starlette import status
 
 from app.models.edu_level import EduLevel
 from app.schemas.edu_level import EduLevelCreate, EduLevelUpdate
+from app.services.table_versions import table_versions
 
 
 async def get_all_edu_levels(db: AsyncSession):
@@ -32,6 +33,7 @@ async def create_edu_level(db: AsyncSession, data: EduLevelCreate):
         edu_level = EduLevel(**data.dict())
         db.add(edu_level)
         await db.commit()
+        await table_versions.bump(db, "edu_level")
         await db.refresh(edu_level)
         return edu_level
     except SQLAlchemyError as e:
@@ -44,6 +46,7 @@ async def update_edu_level(db: AsyncSession, edu_level_id: int, data: EduLevelUp
         for field, value in data.dict(exclude_unset=True).items():
             setattr(edu_level, field, value)
         await db.commit()
+        await table_versions.bump(db, "edu_level")
         await db.refresh(edu_level)
         return edu_level
     except SQLAlchemyError as e:
@@ -57,6 +60,7 @@ async def delete_edu_level(db: AsyncSession, edu_level_id: int):
             return False
         await db.delete(edu_level)
         await db.commit()
+        await table_versions.bump(db, "edu_level")
         return True
     except SQLAlchemyError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Ошибка при удалении уровня образования")
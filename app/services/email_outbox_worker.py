@@ -0,0 +1,149 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.database import db1_session
+from app.core.logger import logger
+from app.models.email_outbox import EmailOutbox, OUTBOX_PENDING, OUTBOX_SENT, OUTBOX_FAILED
+from app.services.email_service import SMTPSender, build_message, is_permanent_error
+
+# Потолок паузы между попытками, как бы долго ни был недоступен сервер
+MAX_RETRY_DELAY_SECONDS = 3600
+
+
+class EmailOutboxWorker:
+    """
+    Фоновая доставка писем из email_outbox. Запускается из lifespan; обработчики запросов
+    только добавляют письмо в таблицу и будят воркер через wake().
+
+    Пачка — до batch_size писем подряд через одно SMTP-соединение в отдельном потоке. Каждое письмо
+    перед отправкой захватывается короткой транзакцией (SELECT ... FOR UPDATE SKIP LOCKED):
+    попытка засчитывается, а next_attempt_at сдвигается на время аренды одного письма, поэтому воркеры
+    других процессов его не возьмут, а после падения процесса оно вернётся в очередь через lease().
+    Результат каждого письма фиксируется своим commit — уже отправленное письмо не уйдёт повторно.
+    Неудачные повторяются с экспоненциальной паузой; после max_attempts или при ошибке,
+    которую повтор не исправит, письмо помечается failed.
+    session_factory и sender подменяются, чтобы проверить воркер на локальном SMTP-сервере.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = db1_session,
+        sender: Optional[SMTPSender] = None,
+        batch_size: int = settings.EMAIL_OUTBOX_BATCH_SIZE,
+        poll_seconds: float = settings.EMAIL_OUTBOX_POLL_SECONDS,
+        max_attempts: int = settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        retry_seconds: float = settings.EMAIL_OUTBOX_RETRY_SECONDS,
+    ):
+        self._session_factory = session_factory
+        self._sender = sender or SMTPSender()
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.retry_seconds = retry_seconds
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self._sender.close)
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.retry_seconds * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS))
+
+    def lease(self) -> timedelta:
+        # С запасом на подключение и отправку одного письма
+        return timedelta(seconds=self._sender.timeout * 2)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.process_batch()
+            except Exception as e:
+                logger.error(f"Email outbox batch failed: {str(e)}")
+                processed = 0
+            # Полная пачка — в очереди, вероятно, есть ещё письма
+            if processed == self.batch_size:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                # Очередь пуста: соединение закрывается, чтобы его не оборвал сервер по простою
+                await asyncio.to_thread(self._sender.close)
+
+    async def _claim(self, db) -> Optional[EmailOutbox]:
+        now = datetime.utcnow()
+        entry = (await db.execute(
+            select(EmailOutbox)
+            .where(EmailOutbox.status == OUTBOX_PENDING, EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )).scalars().first()
+        if entry is not None:
+            entry.attempts += 1
+            entry.next_attempt_at = now + self.lease()
+        await db.commit()
+        return entry
+
+    async def _deliver(self, entry: EmailOutbox) -> Optional[Exception]:
+        try:
+            message = build_message(self._sender.username, entry.recipient, entry.subject, entry.body, entry.html_body)
+            await asyncio.to_thread(self._sender.send, entry.recipient, message)
+            return None
+        except Exception as e:
+            return e
+
+    def _record(self, entry: EmailOutbox, error: Optional[Exception]) -> None:
+        now = datetime.utcnow()
+        if error is None:
+            entry.status = OUTBOX_SENT
+            entry.sent_at = now
+            entry.last_error = None
+            return
+        entry.last_error = f"{type(error).__name__}: {error}"
+        if entry.attempts >= self.max_attempts or is_permanent_error(error):
+            entry.status = OUTBOX_FAILED
+            logger.error(f"Email {entry.id} to {entry.recipient} failed after {entry.attempts} attempts: {error}")
+        else:
+            entry.next_attempt_at = now + self.retry_delay(entry.attempts)
+            logger.warning(f"Email {entry.id} to {entry.recipient} will be retried: {error}")
+
+    async def process_batch(self) -> int:
+        """
+        Отправляет одну пачку писем, которым подошло время; возвращает её размер.
+        """
+        processed = sent = 0
+        async with self._session_factory() as db:
+            while processed < self.batch_size:
+                entry = await self._claim(db)
+                if entry is None:
+                    break
+                error = await self._deliver(entry)
+                self._record(entry, error)
+                await db.commit()
+                processed += 1
+                sent += error is None
+        if processed:
+            logger.info(f"Email outbox: {sent} of {processed} sent")
+        return processed
+
+
+email_outbox_worker = EmailOutboxWorker()
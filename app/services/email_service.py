@@ -1,40 +1,115 @@
 import smtplib
+from email import policy
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.core.config import settings
+from app.core.logger import logger
+from app.models.email_outbox import EmailOutbox
 
-class EmailService:
-    def __init__(self):
-        self.smtp_server = "smtp.yandex.ru"
-        self.smtp_port = 465  # SSL порт для почты
-        self.sender_email = settings.EMAIL_SENDER
-        self.sender_password = settings.EMAIL_PASSWORD
 
-    async def send_email(self, recipient_email: str, subject: str, body: str, html_body: str = None):
+def build_message(sender_email: str, recipient_email: str, subject: str, body: str, html_body: str = None) -> MIMEMultipart:
+    # Политика SMTP, а не compat32: send_message может переложить письмо в SMTPUTF8 для адресов не в ASCII
+    message = MIMEMultipart("alternative", policy=policy.SMTP)
+    message["Subject"] = subject
+    message["From"] = sender_email
+    message["To"] = recipient_email
+
+    # Добавление текстового содержимого
+    message.attach(MIMEText(body, "plain"))
+
+    # HTML-версия письма (если передана)
+    if html_body:
+        message.attach(MIMEText(html_body, "html"))
+    return message
+
+
+class SMTPSender:
+    """
+    Одно авторизованное SMTP-соединение на много писем. Методы синхронные и вызываются
+    из потока воркера очереди. Если сервер закрыл соединение между письмами, оно
+    открывается заново и письмо отправляется ещё раз.
+    """
+
+    def __init__(self, host: str = None, port: int = None, use_ssl: bool = None,
+                 username: str = None, password: str = None, timeout: float = None):
+        self.host = host or settings.SMTP_HOST
+        self.port = port or settings.SMTP_PORT
+        self.use_ssl = settings.SMTP_SSL if use_ssl is None else use_ssl
+        self.username = settings.EMAIL_SENDER if username is None else username
+        self.password = settings.EMAIL_PASSWORD if password is None else password
+        self.timeout = timeout or settings.SMTP_TIMEOUT_SECONDS
+        self._server: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        server = smtp_class(self.host, self.port, timeout=self.timeout)
+        server.ehlo()
+        # Локальный тестовый сервер обычно не объявляет AUTH
+        if self.password and server.has_extn("auth"):
+            server.login(self.username, self.password)
+        logger.info(f"SMTP connection opened: {self.host}:{self.port}")
+        return server
+
+    def _send(self, recipient_email: str, message: MIMEMultipart) -> None:
+        # Адрес не в ASCII уходит с SMTPUTF8; если сервер его не поддерживает — SMTPNotSupportedError
+        self._server.send_message(message, self.username, [recipient_email])
+
+    def send(self, recipient_email: str, message: MIMEMultipart) -> None:
+        """
+        Отправляет одно письмо. После ошибки, которая не относится к самому письму,
+        соединение закрывается: его состояние неизвестно, следующее письмо откроет новое.
+        """
+        if self._server is None:
+            self._server = self._connect()
+        try:
+            try:
+                self._send(recipient_email, message)
+            except smtplib.SMTPServerDisconnected:
+                self._server = self._connect()
+                self._send(recipient_email, message)
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPNotSupportedError):
+            # После них сервер готов к следующему письму (smtplib сам делает RSET)
+            raise
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self._server is None:
+            return
         try:
-            # Создание сообщения
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = self.sender_email
-            message["To"] = recipient_email
-
-            # Добавление текстового содержимого
-            text_part = MIMEText(body, "plain")
-            message.attach(text_part)
-
-            # HTML-версия письма (если передана)
-            if html_body:
-                html_part = MIMEText(html_body, "html")
-                message.attach(html_part)
-
-            # Отправка письма через SMTP
-            with smtplib.SMTP_SSL(self.smtp_server, self.smtp_port) as server:
-                server.login(self.sender_email, self.sender_password)
-                server.sendmail(self.sender_email, recipient_email, message.as_string())
-            print(f"Email sent to {recipient_email}")
-        except smtplib.SMTPAuthenticationError:
-            print("Ошибка аутентификации. Проверьте логин и пароль.")
-        except smtplib.SMTPException as e:
-            print(f"SMTP error: {e}")
-        except Exception as e:
-            print(f"Failed to send email: {e}")
\ No newline at end of file
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._server = None
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """
+    Ошибки, которые повтор не исправит: адрес отвергнут, сервер не принимает адрес не в ASCII,
+    ответ 5xx на само письмо.
+    """
+    if isinstance(error, smtplib.SMTPNotSupportedError):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(500 <= code < 600 for code, _ in error.recipients.values())
+    return isinstance(error, smtplib.SMTPResponseException) and 500 <= error.smtp_code < 600
+
+
+class EmailService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def send_email(self, recipient_email: str, subject: str, body: str, html_body: str = None) -> EmailOutbox:
+        """
+        Ставит письмо в очередь email_outbox в текущей транзакции и ничего не отправляет:
+        после commit вызывающий будит email_outbox_worker, который и доставит письмо.
+        """
+        entry = EmailOutbox(recipient=recipient_email, subject=subject, body=body, html_body=html_body)
+        self.db.add(entry)
+        logger.info(f"Email to {recipient_email} queued: {subject}")
+        return entry
@@ -4,8 +4,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from starlette import status
 
+from app.models.actual_grnti import ActualGRNTI
 from app.models.grnti import Grnti
 from app.schemas.grnti import GrntiCreate, GrntiUpdate
+from app.services import catalog_sync_service
+from app.services.table_versions import table_versions
+
+
+async def _grnti_pub_ids(db: AsyncSession, grnti_id: int) -> list:
+    # Название ГРНТИ индексируется в поиске публикаций, поэтому затронуты все связанные публикации
+    result = await db.execute(select(ActualGRNTI.pub_id).where(ActualGRNTI.grnti_id == grnti_id))
+    return result.scalars().all()
 
 async def get_all_grnti(db: AsyncSession):
     try:
@@ -29,6 +38,7 @@ async def create_grnti(db: AsyncSession, data: GrntiCreate):
         grnti = Grnti(**data.dict())
         db.add(grnti)
         await db.commit()
+        await table_versions.bump(db, "grnti")
         await db.refresh(grnti)
         return grnti
     except SQLAlchemyError as e:
@@ -41,7 +51,9 @@ async def update_grnti(db: AsyncSession, grnti_id: int, data: GrntiUpdate):
             for field, value in data.dict(exclude_unset=True).items():
                 setattr(grnti, field, value)
             await db.commit()
+            await table_versions.bump(db, "grnti")
             await db.refresh(grnti)
+            await catalog_sync_service.publications_changed(db, await _grnti_pub_ids(db, grnti_id))
         return grnti
     except SQLAlchemyError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Ошибка при обновлении записи ГРНТИ")
@@ -51,8 +63,12 @@ async def delete_grnti(db: AsyncSession, grnti_id: int):
         grnti = await get_grnti_by_id(db, grnti_id)
         if not grnti:
             return False
+        # После удаления связи с ГРНТИ уже не найти, поэтому публикации собираются заранее
+        pub_ids = await _grnti_pub_ids(db, grnti_id)
         await db.delete(grnti)
         await db.commit()
+        await table_versions.bump(db, "grnti")
+        await catalog_sync_service.publications_changed(db, pub_ids)
         return True
     except SQLAlchemyError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Ошибка при удалении записи ГРНТИ")
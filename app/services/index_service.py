@@ -6,6 +6,7 @@ from starlette import status
 
 from app.models.index import Index
 from app.schemas.index import IndexCreate, IndexUpdate
+from app.services import catalog_sync_service
 
 async def get_all_indexes(db: AsyncSession):
     try:
@@ -30,6 +31,7 @@ async def create_index(db: AsyncSession, data: IndexCreate):
         db.add(idx)
         await db.commit()
         await db.refresh(idx)
+        await catalog_sync_service.publications_changed(db, [idx.pub_id])
         return idx
     except SQLAlchemyError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Ошибка при создании индексации")
@@ -42,6 +44,7 @@ async def update_index(db: AsyncSession, pub_id: int, data: IndexUpdate):
                 setattr(idx, key, value)
             await db.commit()
             await db.refresh(idx)
+            await catalog_sync_service.publications_changed(db, [pub_id, idx.pub_id])
         return idx
     except SQLAlchemyError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Ошибка при обновлении индексации")
@@ -52,6 +55,7 @@ async def delete_index(db: AsyncSession, pub_id: int):
         if idx:
             await db.delete(idx)
             await db.commit()
+            await catalog_sync_service.publications_changed(db, [pub_id])
         else:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Индексация не найдена")
     except SQLAlchemyError as e:
@@ -0,0 +1,116 @@
+import ipaddress
+import time
+from bisect import bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.models.IPWhitelist import IPWhitelist
+
+
+class IPWhitelistMatch(NamedTuple):
+    id: int
+    ip_network: str
+    organization_name: Optional[str]
+
+
+class _IntervalTable:
+    """
+    Непересекающиеся отрезки адресов одной версии IP, отсортированные по началу.
+    CIDR-сети либо вложены, либо не пересекаются; вложенные сети разрезаются так,
+    что каждый адрес попадает в отрезок самой узкой из содержащих его сетей.
+    """
+
+    def __init__(self, networks: Iterable[Tuple[int, int, IPWhitelistMatch]]):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.matches: List[IPWhitelistMatch] = []
+        # Сначала более широкая сеть, при совпадении — более поздняя запись внутри более ранней
+        ordered = sorted(networks, key=lambda network: (network[0], -network[1], network[2].id))
+        stack: List[Tuple[int, IPWhitelistMatch]] = []
+        cursor = 0
+        for start, end, match in ordered:
+            while stack and stack[-1][0] < start:
+                cursor = self._close(stack, cursor)
+            if stack:
+                self._append(cursor, start - 1, stack[-1][1])
+            stack.append((end, match))
+            cursor = start
+        while stack:
+            cursor = self._close(stack, cursor)
+
+    def _append(self, start: int, end: int, match: IPWhitelistMatch) -> None:
+        if start <= end:
+            self.starts.append(start)
+            self.ends.append(end)
+            self.matches.append(match)
+
+    def _close(self, stack: list, cursor: int) -> int:
+        end, match = stack.pop()
+        self._append(cursor, end, match)
+        return max(cursor, end + 1)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def find(self, address: int) -> Optional[IPWhitelistMatch]:
+        position = bisect_right(self.starts, address) - 1
+        if position >= 0 and address <= self.ends[position]:
+            return self.matches[position]
+        return None
+
+
+class IPWhitelistIndex:
+    """
+    Белый список IP в памяти: по таблице отрезков на IPv4 и IPv6, поиск сети — двоичный поиск.
+    Строится одним запросом к ip_whitelist; IPWhitelistService перестраивает его после каждого изменения,
+    в других процессах он перечитывается по истечении ttl_seconds.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._tables: Dict[int, _IntervalTable] = {4: _IntervalTable([]), 6: _IntervalTable([])}
+        self._loaded_at: Optional[float] = None
+
+    def expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        rows = (await db.execute(
+            select(IPWhitelist.id, IPWhitelist.ip_network, IPWhitelist.organization_name)
+        )).all()
+        networks = {4: [], 6: []}
+        for entry_id, ip_network, organization_name in rows:
+            try:
+                # Строгий разбор, как раньше: запись с битами хоста (10.0.0.5/24) не расширяется до всей сети
+                network = ipaddress.ip_network(ip_network)
+            except ValueError:
+                logger.warning(f"Skipping invalid whitelist network {ip_network!r} (id={entry_id})")
+                continue
+            networks[network.version].append((
+                int(network.network_address),
+                int(network.broadcast_address),
+                IPWhitelistMatch(entry_id, ip_network, organization_name),
+            ))
+        self._tables = {version: _IntervalTable(items) for version, items in networks.items()}
+        self._loaded_at = time.monotonic()
+        logger.info(f"IP whitelist index rebuilt: {len(rows)} networks")
+
+    def match(self, client_ip: str) -> Optional[IPWhitelistMatch]:
+        """
+        Самая узкая сеть белого списка, в которую входит адрес, или None (в том числе для некорректного адреса).
+        """
+        try:
+            ip = ipaddress.ip_address(client_ip)
+        except ValueError:
+            return None
+        # IPv4, записанный как IPv6 (::ffff:10.0.0.1), ищется среди IPv4-сетей
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+        return self._tables[ip.version].find(int(ip))
+
+
+ip_whitelist_index = IPWhitelistIndex(settings.IP_WHITELIST_TTL_SECONDS)
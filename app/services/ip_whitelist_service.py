@@ -5,6 +5,8 @@ from app.core.security import logger
 from app.models.IPWhitelist import IPWhitelist
 import ipaddress
 
+from app.services.ip_whitelist_index import ip_whitelist_index
+
 from app.schemas.ip_whitelist import IPWhitelistUpdate
 
 
@@ -32,6 +34,7 @@ class IPWhitelistService:
         self.db.add(new_entry)
         await self.db.commit()
         await self.db.refresh(new_entry)
+        await ip_whitelist_index.rebuild(self.db)
         return new_entry
 
     async def delete_ip_whitelist(self, id: int) -> bool:
@@ -43,6 +46,7 @@ class IPWhitelistService:
 
         await self.db.delete(entry)
         await self.db.commit()
+        await ip_whitelist_index.rebuild(self.db)
         return True
 
     async def update_ip_whitelist(self, id: int, new_data: IPWhitelistUpdate) -> IPWhitelist:
@@ -67,6 +71,7 @@ class IPWhitelistService:
         # Сохранение изменений
         await self.db.commit()
         await self.db.refresh(entry)
+        await ip_whitelist_index.rebuild(self.db)
         return entry
 
 
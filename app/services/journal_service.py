@@ -7,6 +7,7 @@ from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import selectinload
 from app.models.journal import Journal
 from app.schemas.journal import JournalCreate, JournalUpdate
+from app.services import catalog_sync_service
 
 
 async def get_journal_by_id(db: AsyncSession, journal_id: int):
@@ -35,22 +36,27 @@ async def create_journal(db: AsyncSession, data: JournalCreate):
     db.add(journal)
     await db.commit()
     await db.refresh(journal)
+    await catalog_sync_service.publications_changed(db, [journal.pub_id])
     return journal
 
 async def update_journal(db: AsyncSession, journal_id: int, data: JournalUpdate):
     journal = await get_journal_by_id(db, journal_id)
     if journal:
+        old_pub_id = journal.pub_id
         for key, value in data.dict(exclude_unset=True).items():
             setattr(journal, key, value)
         await db.commit()
         await db.refresh(journal)
+        await catalog_sync_service.publications_changed(db, [old_pub_id, journal.pub_id])
     return journal
 
 async def delete_journal(db: AsyncSession, journal_id: int):
     journal = await get_journal_by_id(db, journal_id)
     if journal:
+        pub_id = journal.pub_id
         await db.delete(journal)
         await db.commit()
+        await catalog_sync_service.publications_changed(db, [pub_id])
 
 async def get_paginated_journals(
     db: AsyncSession,
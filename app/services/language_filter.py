@@ -0,0 +1,89 @@
+import re
+from enum import Enum
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import Integer, and_, false, func, or_, text, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import logger
+
+LANGUAGES_MODES = ("any", "all")
+
+_SET_VALUE_RE = re.compile(r"'((?:[^']|'')*)'")
+
+
+def _parse_set_values(column_type: str) -> list:
+    # COLUMN_TYPE вида set('русский','английский',...)
+    return [value.replace("''", "'") for value in _SET_VALUE_RE.findall(column_type)]
+
+
+def _language_value(language) -> str:
+    return language.value if isinstance(language, Enum) else str(language)
+
+
+class LanguageSetMask:
+    """
+    Фильтр по колонкам MySQL SET с языками через целочисленную битовую маску SET.
+    Порядок битов читается из information_schema (в модели SET(LanguageEnum) он не задан),
+    пока он не загружен — используется FIND_IN_SET с той же семантикой.
+    Регистрируется в catalog_sync_service: rebuild перечитывает определения колонок.
+    """
+
+    def __init__(self):
+        self.ready = False
+        # (таблица, колонка) -> {значение: бит}
+        self._bits: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        result = await db.execute(text(
+            "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND DATA_TYPE = 'set'"
+        ))
+        bits = {}
+        for table_name, column_name, column_type in result.all():
+            values = _parse_set_values(column_type)
+            bits[(table_name, column_name)] = {value: 1 << position for position, value in enumerate(values)}
+        self._bits = bits
+        self.ready = True
+        logger.info(f"Language SET masks loaded for columns: {sorted(bits)}")
+
+    async def refresh(self, db: AsyncSession, pub_ids: set) -> None:
+        # Определение SET не зависит от данных публикаций
+        return None
+
+    def _column_bits(self, column):
+        if not self.ready:
+            return None
+        expression = column.expression
+        return self._bits.get((expression.table.name, expression.name))
+
+    def condition(self, column, languages: Iterable, mode: str = "any"):
+        """
+        Условие WHERE: в SET-колонке есть хотя бы один (mode="any") или все (mode="all") из языков.
+        """
+        values = [_language_value(language) for language in languages]
+        bits = self._column_bits(column)
+        if bits is None:
+            checks = [func.find_in_set(value, column) > 0 for value in values]
+            return and_(*checks) if mode == "all" else or_(*checks)
+
+        mask = 0
+        missing = False
+        for value in values:
+            if value in bits:
+                mask |= bits[value]
+            else:
+                missing = True
+
+        # В числовом контексте MySQL отдаёт SET как битовую маску выбранных значений
+        column_mask = type_coerce(column, Integer).op("&")(mask)
+        if mode == "all":
+            if missing:
+                return false()
+            return column_mask == mask
+        if not mask:
+            return false()
+        return column_mask != 0
+
+
+language_set_mask = LanguageSetMask()
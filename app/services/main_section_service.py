@@ -7,6 +7,7 @@ from sqlalchemy.orm import joinedload
 from app.core.security import logger
 from app.models.main_section import MainSection
 from app.schemas.main_section import MainSectionCreate, MainSectionUpdate
+from app.services import catalog_sync_service
 
 async def get_all_main_sections(db: AsyncSession):
     try:
@@ -39,16 +40,19 @@ async def create_main_section(db: AsyncSession, data: MainSectionCreate):
     db.add(record)
     await db.commit()
     await db.refresh(record)
+    await catalog_sync_service.publications_changed(db, [record.pub_id])
     return record
 
 async def update_main_section(db: AsyncSession, id: int, data: MainSectionUpdate):
     record = await get_main_section_by_id(db, id)
     if not record:
         return None
+    old_pub_id = record.pub_id
     for field, value in data.dict(exclude_unset=True).items():
         setattr(record, field, value)
     await db.commit()
     await db.refresh(record)
+    await catalog_sync_service.publications_changed(db, [old_pub_id, record.pub_id])
     return record
 
 async def delete_main_section(db: AsyncSession, id: int):
@@ -57,4 +61,5 @@ async def delete_main_section(db: AsyncSession, id: int):
         return False
     await db.delete(record)
     await db.commit()
+    await catalog_sync_service.publications_changed(db, [record.pub_id])
     return True
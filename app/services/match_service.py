@@ -0,0 +1,45 @@
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.match import MatchRequest
+from app.services import publication_service
+from app.services.publication_fieldset import PublicationFieldset
+from app.services.publication_match_index import publication_match_index
+
+
+async def match_publications(db: AsyncSession, data: MatchRequest, fieldset: PublicationFieldset) -> dict:
+    """
+    Подбор журналов под статью: ограничения и ранжирование считаются в памяти,
+    из БД загружаются только публикации из выдачи.
+    """
+    found = publication_match_index.match(
+        specialty_codes=[code.strip() for code in data.specialty_codes if code.strip()],
+        grnti_codes=[code.strip() for code in data.grnti_codes if code.strip()],
+        wos_quartile=data.wos_quartile,
+        scopus_quartile=data.scopus_quartile,
+        vak_category=data.vak_category,
+        open_access=data.open_access,
+        max_price=float(data.max_price) if data.max_price is not None else None,
+        weights=data.weights.model_dump(),
+        limit=data.limit,
+    )
+    if found is None:
+        raise HTTPException(status_code=503, detail="Индекс подбора журналов ещё не построен")
+    total, ranked = found
+    if not ranked:
+        return {"items": [], "total": total}
+
+    batch = await publication_service.get_publications_batch(db, [pub_id for pub_id, _, _ in ranked], fieldset)
+    by_id = {row["id"]: row for row in batch["items"]}
+    return {
+        "items": [
+            {
+                **by_id[pub_id],
+                "score": round(score, 4),
+                "criteria": {name: round(value, 4) if value is not None else None for name, value in criteria.items()},
+            }
+            for pub_id, score, criteria in ranked
+            if pub_id in by_id
+        ],
+        "total": total,
+    }
@@ -1,7 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.models.actual_oecd import ActualOECD
 from app.models.oecd import OECD
 from app.schemas.oecd import OECDCreate, OECDUpdate
+from app.services import catalog_sync_service
+from app.services.table_versions import table_versions
+
+async def _oecd_pub_ids(db: AsyncSession, oecd_id: int) -> list:
+    # Название ОЕСД индексируется в поиске публикаций, поэтому затронуты все связанные публикации
+    result = await db.execute(select(ActualOECD.pub_id).where(ActualOECD.oecd_id == oecd_id))
+    return result.scalars().all()
 
 async def get_all_oecd(db: AsyncSession):
     result = await db.execute(select(OECD))
@@ -15,6 +23,7 @@ async def create_oecd(db: AsyncSession, data: OECDCreate):
     oecd = OECD(**data.dict())
     db.add(oecd)
     await db.commit()
+    await table_versions.bump(db, "oecd")
     await db.refresh(oecd)
     return oecd
 
@@ -25,13 +34,19 @@ async def update_oecd(db: AsyncSession, oecd_id: int, data: OECDUpdate):
     for field, value in data.dict(exclude_unset=True).items():
         setattr(oecd, field, value)
     await db.commit()
+    await table_versions.bump(db, "oecd")
     await db.refresh(oecd)
+    await catalog_sync_service.publications_changed(db, await _oecd_pub_ids(db, oecd_id))
     return oecd
 
 async def delete_oecd(db: AsyncSession, oecd_id: int):
     oecd = await get_oecd_by_id(db, oecd_id)
     if oecd is None:
         return False
+    # После удаления связи с ОЕСД уже не найти, поэтому публикации собираются заранее
+    pub_ids = await _oecd_pub_ids(db, oecd_id)
     await db.delete(oecd)
     await db.commit()
+    await table_versions.bump(db, "oecd")
+    await catalog_sync_service.publications_changed(db, pub_ids)
     return True
@@ -4,6 +4,7 @@ from fastapi import HTTPException, status
 
 from app.models.pub_information import PubInformation
 from app.schemas.pub_information import PubInformationCreate, PubInformationUpdate
+from app.services import catalog_sync_service
 
 async def get_pub_info(db: AsyncSession, pub_id: int):
     result = await db.execute(select(PubInformation).where(PubInformation.pub_id == pub_id))
@@ -17,6 +18,7 @@ async def create_pub_info(db: AsyncSession, pub_info_in: PubInformationCreate):
     db.add(pub_info)
     await db.commit()
     await db.refresh(pub_info)
+    await catalog_sync_service.publications_changed(db, [pub_info.pub_id])
     return pub_info
 
 async def update_pub_info(db: AsyncSession, pub_id: int, pub_info_in: PubInformationUpdate):
@@ -26,9 +28,11 @@ async def update_pub_info(db: AsyncSession, pub_id: int, pub_info_in: PubInforma
     db.add(pub_info)
     await db.commit()
     await db.refresh(pub_info)
+    await catalog_sync_service.publications_changed(db, [pub_id, pub_info.pub_id])
     return pub_info
 
 async def delete_pub_info(db: AsyncSession, pub_id: int):
     pub_info = await get_pub_info(db, pub_id)
     await db.delete(pub_info)
     await db.commit()
+    await catalog_sync_service.publications_changed(db, [pub_id])
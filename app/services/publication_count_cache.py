@@ -0,0 +1,52 @@
+from typing import Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.utils.ttl_cache import TTLCache, filters_fingerprint
+
+
+class PublicationCountCache:
+    """
+    Кэш общего количества публикаций по отпечатку фильтров.
+    Сбрасывается целиком при любой записи в publication и связанные таблицы.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ready = True
+        self._cache = TTLCache(ttl_seconds)
+        # Растёт при каждой инвалидации, чтобы не сохранить count, посчитанный до записи
+        self._generation = 0
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._cache.clear()
+        self.ready = True
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        self.invalidate()
+
+    async def refresh(self, db: AsyncSession, pub_ids: set) -> None:
+        self.invalidate()
+
+    async def get_or_count(
+        self, db: AsyncSession, scope: str, filters: dict, count_query, params: Optional[dict] = None
+    ) -> Tuple[int, bool]:
+        """
+        Возвращает (total, cached). При промахе выполняет count_query с bind-параметрами params и запоминает результат.
+        """
+        key = filters_fingerprint(scope, filters)
+        if self.ready:
+            hit, total = self._cache.get(key)
+            if hit:
+                logger.debug(f"Count cache hit for {scope} {filters}: {total}")
+                return total, True
+        generation = self._generation
+        total = (await db.execute(count_query, params)).scalar_one()
+        if self.ready and generation == self._generation:
+            self._cache.set(key, total)
+        return total, False
+
+
+publication_count_cache = PublicationCountCache(settings.PUBLICATION_COUNT_CACHE_TTL_SECONDS)
@@ -0,0 +1,93 @@
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.schemas.index import IndexResponse
+from app.schemas.pub_information import PubInformationResponse
+from app.schemas.publication import PublicationResponse
+
+# Поля ответов берутся из схем, чтобы порядок и состав ключей совпадали с response_model
+PUBLICATION_FIELDS = tuple(PublicationResponse.model_fields)
+# Коллекции классификаторов: связь -> поле с id классификатора в элементе
+PUBLICATION_COLLECTIONS = {
+    "actual_oecd_items": "oecd_id",
+    "actual_grnti_items": "grnti_id",
+    "main_sections": "section_id",
+}
+# Связи один-к-одному и их поля в ответе
+PUBLICATION_RELATED_FIELDS = {
+    "pub_information": tuple(PubInformationResponse.model_fields),
+    "index": tuple(IndexResponse.model_fields),
+}
+PUBLICATION_INCLUDES = tuple(PUBLICATION_COLLECTIONS) + tuple(PUBLICATION_RELATED_FIELDS)
+
+
+class PublicationFieldset(NamedTuple):
+    """
+    Какие колонки публикации выбирать и какие связи загружать.
+    related_fields — выбранные поля для связей один-к-одному из include.
+    """
+    fields: Tuple[str, ...]
+    include: Tuple[str, ...]
+    related_fields: Dict[str, Tuple[str, ...]]
+
+
+def _split(value: str) -> list:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_fieldset(
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    default_include: Iterable[str] = ()
+) -> PublicationFieldset:
+    """
+    Разбирает параметры ?fields=name,el_id,pub_information.issn_print и ?include=index,main_sections.
+    Без fields возвращаются все поля, без include — связи по умолчанию для эндпоинта.
+    Поле вида pub_information.issn_print само добавляет связь в include. id возвращается всегда.
+    """
+    include_names = list(default_include) if include is None else _split(include)
+    unknown = [name for name in include_names if name not in PUBLICATION_INCLUDES]
+
+    requested_related: Dict[str, list] = {}
+    if fields is None:
+        publication_fields = set(PUBLICATION_FIELDS)
+    else:
+        publication_fields = {"id"}
+        for name in _split(fields):
+            relation, _, related_field = name.partition(".")
+            if related_field:
+                if related_field not in PUBLICATION_RELATED_FIELDS.get(relation, ()):
+                    unknown.append(name)
+                    continue
+                requested_related.setdefault(relation, []).append(related_field)
+                if relation not in include_names:
+                    include_names.append(relation)
+            elif name in PUBLICATION_FIELDS:
+                publication_fields.add(name)
+            else:
+                unknown.append(name)
+
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Неизвестные поля или связи: {', '.join(unknown)}")
+
+    # Порядок ключей в ответе — как в схемах, независимо от порядка в запросе
+    included = tuple(name for name in PUBLICATION_INCLUDES if name in include_names)
+    related_fields = {
+        relation: tuple(
+            field for field in all_fields
+            if relation not in requested_related or field in requested_related[relation]
+        )
+        for relation, all_fields in PUBLICATION_RELATED_FIELDS.items()
+        if relation in included
+    }
+    return PublicationFieldset(
+        fields=tuple(field for field in PUBLICATION_FIELDS if field in publication_fields),
+        include=included,
+        related_fields=related_fields,
+    )
+
+
+# Полный ответ /with_index_and_information и ответ списка/карточки публикации без связей
+FULL_FIELDSET = parse_fieldset(default_include=PUBLICATION_INCLUDES)
+PLAIN_FIELDSET = parse_fieldset()
@@ -0,0 +1,112 @@
+from enum import Enum
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.logger import logger
+from app.models.publication import Publication
+
+# Поля публикации, по которым фильтрация идёт на точное совпадение значения
+ENUM_FIELDS = ("serial_type", "serial_elem", "purpose", "distribution", "access", "main_finance", "multidisc")
+# Ключи фильтров, на которые индекс может ответить без обращения к БД
+# (на фильтр по специальностям отвечает publication_specialty_index)
+SUPPORTED_FILTERS = frozenset(ENUM_FIELDS + ("languages", "languages_mode"))
+
+
+def _value_key(value) -> str:
+    return value.value if isinstance(value, Enum) else str(value)
+
+
+class PublicationFilterIndex:
+    """
+    Битовые карты id публикаций по значениям enum-полей и языкам.
+    Бит с номером N установлен, если публикация с id = N обладает значением.
+    Комбинации фильтров считаются пересечением (AND между полями) и объединением (OR внутри поля) карт.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._all = 0
+        self._values: Dict[str, Dict[str, int]] = {}
+        # Для инкрементного обновления: что именно было проиндексировано по каждой публикации
+        self._indexed: Dict[int, tuple] = {}
+
+    @staticmethod
+    def supports(filters: dict) -> bool:
+        return all(key in SUPPORTED_FILTERS for key, value in filters.items() if value)
+
+    def match(self, filters: dict, languages_mode: str = "any") -> int:
+        languages_mode = filters.get("languages_mode", languages_mode)
+        result = self._all
+        for key, value in filters.items():
+            if not value or key == "languages_mode":
+                continue
+            if key == "languages":
+                bitmaps = [self._values["language"].get(_value_key(lang), 0) for lang in value]
+                if languages_mode == "all":
+                    for bitmap in bitmaps:
+                        result &= bitmap
+                else:
+                    result &= self._union(bitmaps)
+            else:
+                result &= self._values[key].get(_value_key(value), 0)
+        return result
+
+    @staticmethod
+    def _union(bitmaps: Iterable[int]) -> int:
+        result = 0
+        for bitmap in bitmaps:
+            result |= bitmap
+        return result
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        self._all = 0
+        self._values = {field: {} for field in ENUM_FIELDS + ("language",)}
+        self._indexed = {}
+        await self._load(db, None)
+        self.ready = True
+        logger.info(f"Publication filter index rebuilt: {len(self._indexed)} publications")
+
+    async def refresh(self, db: AsyncSession, pub_ids: set) -> None:
+        if not self.ready:
+            return
+        for pub_id in pub_ids:
+            self._remove(pub_id)
+        await self._load(db, pub_ids)
+
+    async def _load(self, db: AsyncSession, pub_ids: Optional[set]) -> None:
+        columns = [Publication.id, Publication.language] + [getattr(Publication, field) for field in ENUM_FIELDS]
+        pub_query = select(*columns)
+        if pub_ids is not None:
+            pub_query = pub_query.where(Publication.id.in_(pub_ids))
+
+        for row in (await db.execute(pub_query)).all():
+            pub_id, language = row[0], row[1]
+            values = {field: _value_key(value) for field, value in zip(ENUM_FIELDS, row[2:]) if value is not None}
+            languages = {_value_key(lang) for lang in (language or ())}
+            self._add(pub_id, values, languages)
+
+    def _add(self, pub_id: int, values: dict, languages: set) -> None:
+        bit = 1 << pub_id
+        self._all |= bit
+        for field, value in values.items():
+            self._values[field][value] = self._values[field].get(value, 0) | bit
+        for lang in languages:
+            self._values["language"][lang] = self._values["language"].get(lang, 0) | bit
+        self._indexed[pub_id] = (values, languages)
+
+    def _remove(self, pub_id: int) -> None:
+        indexed = self._indexed.pop(pub_id, None)
+        if indexed is None:
+            return
+        values, languages = indexed
+        mask = ~(1 << pub_id)
+        self._all &= mask
+        for field, value in values.items():
+            self._values[field][value] &= mask
+        for lang in languages:
+            self._values["language"][lang] &= mask
+
+
+publication_filter_index = PublicationFilterIndex()
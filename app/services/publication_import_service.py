@@ -0,0 +1,322 @@
+import csv
+import json
+import time
+from enum import Enum as PyEnum
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import logger
+from app.models.actual_grnti import ActualGRNTI
+from app.models.actual_oecd import ActualOECD
+from app.models.contact import Contact
+from app.models.index import Index
+from app.models.main_section import MainSection
+from app.models.pub_information import PubInformation
+from app.models.publication import Publication
+from app.schemas.publication_import import PublicationImportError, PublicationImportResult, PublicationImportRow
+from app.services import catalog_sync_service
+
+# Сколько строк файла обрабатывается в одной транзакции
+IMPORT_BATCH_SIZE = 1000
+# Сколько ошибок по строкам попадает в отчёт (failed считает все)
+IMPORT_MAX_ERRORS = 100
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+_publication = Publication.__table__
+PUBLICATION_COLUMNS = [column.key for column in _publication.columns if column.key != "id"]
+# Связи один-к-одному: обновляются через INSERT ... ON DUPLICATE KEY UPDATE по pub_id
+RELATED_TABLES = {
+    "index": Index.__table__,
+    "pub_information": PubInformation.__table__,
+    "contact": Contact.__table__,
+}
+# Коллекции классификаторов: заменяются целиком, если список в строке отличается от текущего
+COLLECTION_TABLES = {
+    "actual_oecd_items": (ActualOECD.__table__, "oecd_id"),
+    "actual_grnti_items": (ActualGRNTI.__table__, "grnti_id"),
+    "main_sections": (MainSection.__table__, "section_id"),
+}
+
+
+def _plain(value):
+    if isinstance(value, PyEnum):
+        return value.value
+    if isinstance(value, (set, frozenset, list, tuple)):
+        # language: пустой SET хранится как NULL, иначе каждый повторный импорт считался бы изменением
+        return frozenset(_plain(item) for item in value) or None
+    return value
+
+
+def _columns(table) -> List[str]:
+    return [column.key for column in table.columns if column.key != "pub_id"]
+
+
+def _related_values(table, item) -> dict:
+    return {name: _plain(getattr(item, name, None)) for name in _columns(table)}
+
+
+def _collection_values(items, classifier_field: str) -> list:
+    return sorted((getattr(item, classifier_field), bool(item.actual)) for item in items)
+
+
+def _publication_values(row: PublicationImportRow) -> dict:
+    return {name: _plain(getattr(row, name)) for name in PUBLICATION_COLUMNS}
+
+
+def _bind_values(values: dict) -> dict:
+    # SET принимает набор строк
+    return {name: set(value) if isinstance(value, frozenset) else value for name, value in values.items()}
+
+
+# --- Разбор файла ---------------------------------------------------------
+
+def _csv_record(record: dict) -> dict:
+    """
+    Обратное преобразование колонок выгрузки CSV: index.rinc -> {"index": {"rinc": ...}},
+    списки из JSON в ячейке, пустая ячейка -> null.
+    """
+    data: Dict[str, object] = {}
+    for column, value in record.items():
+        if column is None:
+            continue
+        value = value if value != "" else None
+        relation, _, name = column.partition(".")
+        if name:
+            data.setdefault(relation, {})[name] = value
+        elif value is not None and (column == "language" or column in COLLECTION_TABLES):
+            data[column] = json.loads(value)
+        else:
+            data[column] = value
+    for relation in RELATED_TABLES:
+        related = data.get(relation)
+        if isinstance(related, dict) and all(value is None for value in related.values()):
+            data[relation] = None
+    return data
+
+
+def iter_import_records(stream: TextIO, import_format: str) -> Iterator[Tuple[int, object]]:
+    """
+    Строки файла импорта: (номер строки, dict) или (номер строки, ошибка разбора).
+    """
+    if import_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {import_format}")
+
+    if import_format == "ndjson":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as e:
+                yield line_number, e
+        return
+
+    reader = csv.DictReader(stream)
+    for record in reader:
+        try:
+            yield reader.line_num, _csv_record(record)
+        except ValueError as e:
+            yield reader.line_num, e
+
+
+# --- Загрузка пачки -------------------------------------------------------
+
+class _Chunk:
+    def __init__(self):
+        self.rows: Dict[int, Tuple[int, PublicationImportRow]] = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+
+async def _existing_publications(db: AsyncSession, el_ids: Iterable[int]) -> Dict[int, dict]:
+    result = await db.execute(select(_publication).where(_publication.c.el_id.in_(el_ids)).order_by(_publication.c.id))
+    existing = {}
+    for row in result.mappings():
+        # el_id не уникален на уровне схемы; при дублях обновляется запись с меньшим id
+        existing.setdefault(row["el_id"], dict(row))
+    return existing
+
+
+async def _existing_related(db: AsyncSession, table, pub_ids: List[int]) -> Dict[int, dict]:
+    result = await db.execute(select(table).where(table.c.pub_id.in_(pub_ids)))
+    return {row["pub_id"]: {name: _plain(row[name]) for name in _columns(table)} for row in result.mappings()}
+
+
+async def _existing_collection(db: AsyncSession, table, classifier_field: str, pub_ids: List[int]) -> Dict[int, list]:
+    result = await db.execute(
+        select(table.c.pub_id, table.c[classifier_field], table.c.actual).where(table.c.pub_id.in_(pub_ids))
+    )
+    items: Dict[int, list] = {}
+    for pub_id, classifier_id, actual in result.all():
+        items.setdefault(pub_id, []).append((classifier_id, bool(actual)))
+    return {pub_id: sorted(values) for pub_id, values in items.items()}
+
+
+async def _load_chunk(db: AsyncSession, chunk: _Chunk, result: PublicationImportResult) -> List[int]:
+    """
+    Применяет пачку строк в одной транзакции и возвращает id изменённых публикаций.
+    """
+    rows = {el_id: row for el_id, (_, row) in chunk.rows.items()}
+    existing = await _existing_publications(db, list(rows))
+    existing_ids = [pub["id"] for pub in existing.values()]
+
+    # Текущее состояние связей нужно только для тех, что переданы хотя бы в одной строке пачки
+    related_state = {
+        name: await _existing_related(db, table, existing_ids)
+        for name, table in RELATED_TABLES.items()
+        if existing_ids and any(getattr(row, name) is not None for row in rows.values())
+    }
+    collection_state = {
+        name: await _existing_collection(db, table, classifier_field, existing_ids)
+        for name, (table, classifier_field) in COLLECTION_TABLES.items()
+        if existing_ids and any(getattr(row, name) is not None for row in rows.values())
+    }
+
+    inserts, updates = [], []
+    changed_el_ids = set()
+    related_upserts: Dict[str, List[Tuple[int, dict]]] = {name: [] for name in RELATED_TABLES}
+    collection_replaces: Dict[str, List[Tuple[int, list]]] = {name: [] for name in COLLECTION_TABLES}
+
+    for el_id, row in rows.items():
+        values = _publication_values(row)
+        current = existing.get(el_id)
+        if current is None:
+            inserts.append(_bind_values(values))
+        elif any(values[name] != _plain(current[name]) for name in PUBLICATION_COLUMNS):
+            updates.append({"b_id": current["id"], **_bind_values(values)})
+            changed_el_ids.add(el_id)
+        pub_id = current["id"] if current else None
+
+        for name, table in RELATED_TABLES.items():
+            item = getattr(row, name)
+            if item is None:
+                continue
+            new_values = _related_values(table, item)
+            if pub_id is None or related_state[name].get(pub_id) != new_values:
+                related_upserts[name].append((el_id, new_values))
+                changed_el_ids.add(el_id)
+
+        for name, (table, classifier_field) in COLLECTION_TABLES.items():
+            items = getattr(row, name)
+            if items is None:
+                continue
+            new_items = _collection_values(items, classifier_field)
+            if pub_id is None or collection_state[name].get(pub_id, []) != new_items:
+                collection_replaces[name].append((el_id, new_items))
+                changed_el_ids.add(el_id)
+
+    if inserts:
+        # executemany драйвер сворачивает в многострочный INSERT
+        await db.execute(insert(_publication), inserts)
+        inserted = await _existing_publications(db, [values["el_id"] for values in inserts])
+        existing.update(inserted)
+    if updates:
+        statement = (
+            update(_publication)
+            .where(_publication.c.id == bindparam("b_id"))
+            .values({name: bindparam(name) for name in PUBLICATION_COLUMNS})
+        )
+        await db.execute(statement, updates)
+
+    for name, table in RELATED_TABLES.items():
+        if not related_upserts[name]:
+            continue
+        statement = mysql_insert(table)
+        statement = statement.on_duplicate_key_update({
+            name: statement.inserted[name] for name in _columns(table)
+        })
+        await db.execute(statement, [
+            {"pub_id": existing[el_id]["id"], **_bind_values(values)}
+            for el_id, values in related_upserts[name]
+        ])
+
+    for name, (table, classifier_field) in COLLECTION_TABLES.items():
+        if not collection_replaces[name]:
+            continue
+        pub_ids = [existing[el_id]["id"] for el_id, _ in collection_replaces[name]]
+        await db.execute(delete(table).where(table.c.pub_id.in_(pub_ids)))
+        new_rows = [
+            {"pub_id": existing[el_id]["id"], classifier_field: classifier_id, "actual": actual}
+            for el_id, items in collection_replaces[name]
+            for classifier_id, actual in items
+        ]
+        if new_rows:
+            await db.execute(insert(table), new_rows)
+
+    await db.commit()
+
+    inserted_el_ids = {values["el_id"] for values in inserts}
+    result.inserted += len(inserted_el_ids)
+    result.updated += len(changed_el_ids - inserted_el_ids)
+    result.unchanged += len(rows) - len(inserted_el_ids | changed_el_ids)
+    return [existing[el_id]["id"] for el_id in inserted_el_ids | changed_el_ids]
+
+
+def _add_error(result: PublicationImportResult, line: int, detail: str) -> None:
+    result.failed += 1
+    if len(result.errors) < IMPORT_MAX_ERRORS:
+        result.errors.append(PublicationImportError(line=line, detail=detail))
+
+
+async def _flush_chunk(db: AsyncSession, chunk: _Chunk, result: PublicationImportResult) -> None:
+    if not chunk:
+        return
+    try:
+        changed_ids = await _load_chunk(db, chunk, result)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"Publication import chunk failed: {str(e)}")
+        # Пачка откатывается целиком, поэтому ошибку получают все её строки
+        detail = str(getattr(e, "orig", None) or e)[:200]
+        for line, _ in chunk.rows.values():
+            _add_error(result, line, f"Ошибка БД при загрузке пачки: {detail}")
+        return
+    await catalog_sync_service.publications_changed(db, changed_ids)
+
+
+async def import_publications(
+    db: AsyncSession,
+    stream: TextIO,
+    import_format: str,
+    batch_size: int = IMPORT_BATCH_SIZE
+) -> PublicationImportResult:
+    """
+    Импорт публикаций с вложенными index, pub_information, contact и классификаторами
+    из NDJSON или CSV в формате /publications/export. Строки сопоставляются по el_id:
+    новые вставляются, отличающиеся обновляются, совпадающие пропускаются.
+    Каждая пачка из batch_size строк — отдельная транзакция из нескольких многострочных запросов.
+    """
+    started = time.perf_counter()
+    result = PublicationImportResult()
+    chunk = _Chunk()
+
+    for line, record in iter_import_records(stream, import_format):
+        if isinstance(record, Exception):
+            _add_error(result, line, f"Ошибка разбора строки: {str(record)}")
+            continue
+        try:
+            row = PublicationImportRow.model_validate(record)
+        except ValidationError as e:
+            _add_error(result, line, str(e))
+            continue
+
+        # Повтор el_id внутри пачки применяется следующей пачкой, чтобы сохранить порядок строк файла
+        if row.el_id in chunk.rows or len(chunk) >= batch_size:
+            await _flush_chunk(db, chunk, result)
+            chunk = _Chunk()
+        chunk.rows[row.el_id] = (line, row)
+
+    await _flush_chunk(db, chunk, result)
+
+    logger.info(
+        f"Imported publications from {import_format} in {time.perf_counter() - started:.1f}s: "
+        f"inserted={result.inserted} updated={result.updated} unchanged={result.unchanged} failed={result.failed}"
+    )
+    return result
@@ -0,0 +1,211 @@
+import asyncio
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.logger import logger
+from app.models.actual_grnti import ActualGRNTI
+from app.models.actual_specialty import ActualSpecialty
+from app.models.grnti import Grnti
+from app.models.index import Index
+from app.models.journal import Journal
+from app.models.publication import Publication, AccessEnum
+from app.models.specialty import Specialty
+from app.services.publication_specialty_index import actual_specialty_condition
+from app.services.utils.deferred_rebuild import DeferredRebuild
+
+# Доля совпадения, если у журнала нет самого кода, но есть код из той же группы (5.2.3 и 5.2.4, 06.81.12 и 06.81.23)
+GROUP_CREDIT = 0.5
+
+CRITERIA = ("specialty", "grnti", "quality", "price")
+
+
+def _level(value) -> int:
+    """
+    Квартиль WoS/Scopus или категория ВАК числом: 1 — лучший уровень, 0 — нет.
+    """
+    if value is None or value.value == "нет":
+        return 0
+    return int(value.value)
+
+
+def _group(code: str) -> str:
+    return code.rsplit(".", 1)[0]
+
+
+class _CodeColumns:
+    """
+    Для каждого кода классификатора и каждой группы кодов — массив номеров строк публикаций, где они есть.
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[int, str]], size: int):
+        codes: Dict[str, List[int]] = {}
+        groups: Dict[str, List[int]] = {}
+        for row, code in pairs:
+            codes.setdefault(code, []).append(row)
+            groups.setdefault(_group(code), []).append(row)
+        self.size = size
+        self.codes = {code: np.unique(rows) for code, rows in codes.items()}
+        self.groups = {group: np.unique(rows) for group, rows in groups.items()}
+
+    def credit(self, codes: List[str]) -> np.ndarray:
+        """
+        Средняя по запрошенным кодам доля совпадения: 1 за сам код, GROUP_CREDIT за код из той же группы.
+        """
+        total = np.zeros(self.size)
+        for code in codes:
+            hit = np.zeros(self.size)
+            hit[self.groups.get(_group(code), [])] = GROUP_CREDIT
+            hit[self.codes.get(code, [])] = 1.0
+            total += hit
+        return total / len(codes)
+
+
+class _MatchColumns:
+    def __init__(self, publications: list, prices: list, specialties: list, grnti: list):
+        rows = {pub_id: row for row, (pub_id, *_) in enumerate(publications)}
+        size = len(rows)
+        self.pub_ids = np.array([pub_id for pub_id, *_ in publications], dtype=np.int64)
+        self.open_access = np.array([access == AccessEnum.ALL_OPEN for _, access, *_ in publications], dtype=bool)
+        self.wos = np.array([_level(wos) for _, _, wos, _, _ in publications], dtype=np.int8)
+        self.scopus = np.array([_level(scopus) for _, _, _, scopus, _ in publications], dtype=np.int8)
+        self.vak = np.array([_level(vak) for *_, vak in publications], dtype=np.int8)
+        # Минимальная цена публикации среди её журналов; NaN — цена не указана
+        self.price = np.full(size, np.nan)
+        for pub_id, price in prices:
+            if pub_id in rows and price is not None:
+                self.price[rows[pub_id]] = float(price)
+        self.specialties = _CodeColumns(((rows[pub_id], code) for pub_id, code in specialties if pub_id in rows), size)
+        self.grnti = _CodeColumns(((rows[pub_id], code) for pub_id, code in grnti if pub_id in rows), size)
+
+    def __len__(self) -> int:
+        return len(self.pub_ids)
+
+    def constraints(self, wos_quartile: Optional[int], scopus_quartile: Optional[int], vak_category: Optional[int],
+                    open_access: bool, max_price: Optional[float]) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        if wos_quartile:
+            mask &= (self.wos > 0) & (self.wos <= wos_quartile)
+        if scopus_quartile:
+            mask &= (self.scopus > 0) & (self.scopus <= scopus_quartile)
+        if vak_category:
+            mask &= (self.vak > 0) & (self.vak <= vak_category)
+        if open_access:
+            mask &= self.open_access
+        if max_price is not None:
+            # Сравнение с NaN ложно: журналы без цены не проходят ограничение
+            mask &= self.price <= max_price
+        return mask
+
+    def quality(self) -> np.ndarray:
+        """
+        Лучший из показателей: Q1 WoS/Scopus и К1 ВАК дают 1, отсутствие индексации — 0.
+        """
+        wos = np.where(self.wos > 0, (5 - self.wos) / 4, 0.0)
+        scopus = np.where(self.scopus > 0, (5 - self.scopus) / 4, 0.0)
+        vak = np.where(self.vak > 0, (4 - self.vak) / 3, 0.0)
+        return np.maximum(np.maximum(wos, scopus), vak)
+
+    def cheapness(self, mask: np.ndarray, max_price: Optional[float]) -> np.ndarray:
+        """
+        1 для бесплатной публикации, 0 для самой дорогой (или max_price) и для журналов без цены.
+        """
+        reference = max_price if max_price else np.nanmax(self.price[mask], initial=0.0)
+        if not reference:
+            return np.zeros(len(self))
+        return np.nan_to_num(np.clip(1 - self.price / reference, 0.0, 1.0), nan=0.0)
+
+
+class PublicationMatchIndex:
+    """
+    Колонки для подбора журнала под статью: уровни индексации, открытый доступ, цена
+    и коды специальностей и ГРНТИ каждой публикации в массивах NumPy.
+    Жёсткие ограничения и оценка по мягким критериям считаются векторно по всем публикациям сразу.
+    После изменений колонки пересобираются в фоне и подменяются целиком.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._columns: Optional[_MatchColumns] = None
+        self._deferred = DeferredRebuild(self.rebuild, "publication match index")
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        publications = (await db.execute(
+            select(Publication.id, Publication.access, Index.wos_quart, Index.scop_quart, Index.vak_cat)
+            .outerjoin(Index, Index.pub_id == Publication.id)
+            .order_by(Publication.id)
+        )).all()
+        prices = (await db.execute(
+            select(Journal.pub_id, func.min(Journal.price)).group_by(Journal.pub_id)
+        )).all()
+        specialties = (await db.execute(
+            select(ActualSpecialty.pub_id, Specialty.code)
+            .join(Specialty, Specialty.id == ActualSpecialty.specialty_id)
+            .where(actual_specialty_condition(date.today()))
+        )).all()
+        grnti = (await db.execute(
+            select(ActualGRNTI.pub_id, Grnti.code)
+            .join(Grnti, Grnti.id == ActualGRNTI.grnti_id)
+            .where(ActualGRNTI.actual.is_(True))
+        )).all()
+        self._columns = await asyncio.to_thread(_MatchColumns, publications, prices, specialties, grnti)
+        self.ready = True
+        logger.info(f"Publication match index rebuilt: {len(self._columns)} publications")
+
+    async def refresh(self, db: AsyncSession, pub_ids: set) -> None:
+        if self.ready:
+            self._deferred.schedule()
+
+    def match(
+        self,
+        specialty_codes: List[str],
+        grnti_codes: List[str],
+        wos_quartile: Optional[int],
+        scopus_quartile: Optional[int],
+        vak_category: Optional[int],
+        open_access: bool,
+        max_price: Optional[float],
+        weights: Dict[str, float],
+        limit: int,
+    ) -> Optional[Tuple[int, List[Tuple[int, float, Dict[str, Optional[float]]]]]]:
+        """
+        (число подходящих, [(pub_id, оценка, оценки по критериям)] лучших limit) или None, если индекс не готов.
+        Оценка — взвешенное среднее критериев; тематические критерии учитываются, только если переданы коды,
+        и тогда журналы без тематических совпадений в выдачу не попадают.
+        """
+        columns = self._columns
+        if not self.ready or columns is None:
+            return None
+
+        mask = columns.constraints(wos_quartile, scopus_quartile, vak_category, open_access, max_price)
+        criteria = {"quality": columns.quality(), "price": columns.cheapness(mask, max_price)}
+        if specialty_codes:
+            criteria["specialty"] = columns.specialties.credit(specialty_codes)
+        if grnti_codes:
+            criteria["grnti"] = columns.grnti.credit(grnti_codes)
+        thematic = [criteria[name] for name in ("specialty", "grnti") if name in criteria]
+        if thematic:
+            mask &= np.logical_or.reduce([values > 0 for values in thematic])
+
+        total_weight = sum(weights[name] for name in criteria) or 1.0
+        score = sum(weights[name] * values for name, values in criteria.items()) / total_weight
+
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-score[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.lexsort((columns.pub_ids[candidates], -score[candidates]))]
+        return int(mask.sum()), [
+            (
+                int(columns.pub_ids[row]),
+                float(score[row]),
+                {name: float(criteria[name][row]) if name in criteria else None for name in CRITERIA},
+            )
+            for row in candidates
+        ]
+
+
+publication_match_index = PublicationMatchIndex()
@@ -0,0 +1,62 @@
+from typing import Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.logger import logger
+from app.models.publication import Publication
+from app.services.utils.trigram_index import TrigramIndex
+
+# Если под запрос подходит больше публикаций, список id в IN дороже, чем ILIKE по таблице
+MAX_MATCHED_IDS = 5000
+
+
+class PublicationNameIndex:
+    """
+    Триграммный индекс названий публикаций, синхронизируемый через catalog_sync_service.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._index = TrigramIndex()
+        self._names = {}
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        self._index.clear()
+        self._names = {}
+        result = await db.execute(select(Publication.id, Publication.name))
+        for pub_id, name in result.all():
+            self._add(pub_id, name)
+        self.ready = True
+        logger.info(f"Publication name index rebuilt: {len(self._index)} names")
+
+    async def refresh(self, db: AsyncSession, pub_ids: set) -> None:
+        if not self.ready:
+            return
+        for pub_id in pub_ids:
+            self._index.remove(pub_id)
+            self._names.pop(pub_id, None)
+        result = await db.execute(select(Publication.id, Publication.name).where(Publication.id.in_(pub_ids)))
+        for pub_id, name in result.all():
+            self._add(pub_id, name)
+
+    def _add(self, pub_id: int, name: Optional[str]) -> None:
+        self._index.add(pub_id, name)
+        self._names[pub_id] = name
+
+    def search(self, value: str) -> Optional[Set[int]]:
+        """
+        Id публикаций, в названии которых встречается value, или None, если индекс не поможет.
+        """
+        if not self.ready:
+            return None
+        ids = self._index.search(value)
+        if len(ids) > MAX_MATCHED_IDS:
+            return None
+        return ids
+
+    def names(self, pub_ids: Set[int]) -> list:
+        return [self._names[pub_id] for pub_id in pub_ids if self._names.get(pub_id)]
+
+
+publication_name_index = PublicationNameIndex()
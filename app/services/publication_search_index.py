@@ -0,0 +1,86 @@
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.logger import logger
+from app.models.actual_grnti import ActualGRNTI
+from app.models.actual_oecd import ActualOECD
+from app.models.grnti import Grnti
+from app.models.main_section import MainSection
+from app.models.oecd import OECD
+from app.models.publication import Publication
+from app.models.section import Section
+from app.services.utils.bm25_index import BM25Index
+
+# Вес совпадения в названии журнала относительно совпадения в направлениях и разделах
+NAME_WEIGHT = 3.0
+CLASSIFIER_WEIGHT = 1.0
+
+# Действующие связи публикации с классификаторами: (связь, классификатор, поле id классификатора)
+_CLASSIFIER_LINKS = (
+    (ActualGRNTI, Grnti, ActualGRNTI.grnti_id),
+    (ActualOECD, OECD, ActualOECD.oecd_id),
+    (MainSection, Section, MainSection.section_id),
+)
+
+
+class PublicationSearchIndex:
+    """
+    Полнотекстовый индекс BM25 по названию публикации и названиям действующих ГРНТИ, ОЕСД и разделов.
+    Перестраивается при старте, по изменённым публикациям обновляется через catalog_sync_service
+    (сервисы ГРНТИ, ОЕСД и разделов сообщают о публикациях, затронутых переименованием).
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._index = BM25Index()
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        self.ready = False
+        self._index.clear()
+        await self._load(db, None)
+        self.ready = True
+        logger.info(f"Publication search index rebuilt: {len(self._index)} publications")
+
+    async def refresh(self, db: AsyncSession, pub_ids: set) -> None:
+        if not self.ready:
+            return
+        for pub_id in pub_ids:
+            self._index.remove(pub_id)
+        await self._load(db, pub_ids)
+
+    async def _load(self, db: AsyncSession, pub_ids: Optional[set]) -> None:
+        fields: Dict[int, List[Tuple[str, float]]] = {}
+
+        name_query = select(Publication.id, Publication.name)
+        if pub_ids is not None:
+            name_query = name_query.where(Publication.id.in_(pub_ids))
+        for pub_id, name in (await db.execute(name_query)).all():
+            fields[pub_id] = [(name, NAME_WEIGHT)]
+
+        for link_model, classifier_model, classifier_id in _CLASSIFIER_LINKS:
+            query = (
+                select(link_model.pub_id, classifier_model.name)
+                .join(classifier_model, classifier_model.id == classifier_id)
+                .where(link_model.actual.is_(True))
+            )
+            if pub_ids is not None:
+                query = query.where(link_model.pub_id.in_(pub_ids))
+            for pub_id, classifier_name in (await db.execute(query)).all():
+                if pub_id in fields:
+                    fields[pub_id].append((classifier_name, CLASSIFIER_WEIGHT))
+
+        for pub_id, pub_fields in fields.items():
+            self._index.add(pub_id, pub_fields)
+
+    def search(self, query: str, offset: int, limit: int) -> Optional[Tuple[int, List[Tuple[int, float]]]]:
+        """
+        (число найденных, [(pub_id, оценка)] страницы) или None, если индекс не готов.
+        """
+        if not self.ready:
+            return None
+        return self._index.search(query, offset, limit)
+
+
+publication_search_index = PublicationSearchIndex()
@@ -1,18 +1,32 @@
+import csv
+import io
+import json
 import logging
+from datetime import date
+from enum import Enum as PyEnum
 from math import ceil
-from typing import Dict, Tuple, List
+from typing import AsyncIterator, Dict, Iterable, NamedTuple, Tuple, List, Optional
 
+import orjson
 from fastapi import HTTPException
 from pydantic import ValidationError
-from sqlalchemy import func, text, Enum, exists, or_, and_, distinct
+from sqlalchemy import func, text, Enum, exists, or_, and_, distinct, case, JSON, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import joinedload, selectinload, load_only
 
+from app.core.config import settings
+from app.core.database import db1_session
 from app.core.security import logger
-from app.models import PublicationActualSpecialty, ActualSpecialty
+from app.models import PublicationActualSpecialty, ActualSpecialty, Index
+from app.models.actual_grnti import ActualGRNTI
+from app.models.actual_oecd import ActualOECD
+from app.models.main_section import MainSection
+from app.models.index import VakCatEnum
 from app.models.publication import Publication
+from app.models.publication_actual_specialty_table import PublicationActualSpecialtyTable
 from app.models.publication_base_info import PublicationBaseInfo
+from app.models.publication_base_info_table import PublicationBaseInfoTable
 from app.schemas.actual_grnti import ActualGRNTIBase, ActualGRNTIResponse
 from app.schemas.actual_oecd import ActualOECDBase, ActualOECDResponse
 from app.schemas.index import IndexResponse
@@ -29,120 +43,84 @@ from app.models.publication import (
     AccessEnum,
     MainFinanceEnum,
     MultidiscEnum,
+    LanguageEnum,
 )
 from app.schemas.publication_base_info import VakCategoryEnum
+from app.services import catalog_sync_service
+from app.services.language_filter import language_set_mask
+from app.services.publication_count_cache import publication_count_cache
+from app.services.publication_fieldset import PublicationFieldset, FULL_FIELDSET, PLAIN_FIELDSET, \
+    PUBLICATION_COLLECTIONS, PUBLICATION_FIELDS, PUBLICATION_RELATED_FIELDS
+from app.services.publication_filter_index import publication_filter_index
+from app.services.publication_name_index import publication_name_index
+from app.services.publication_search_index import publication_search_index
+from app.services.publication_similarity_index import publication_similarity_index
+from app.services.publication_suggest_index import publication_suggest_index
+from app.services.publication_specialty_index import MAX_MATCHED_IDS as MAX_SPECIALTY_MATCHED_IDS, \
+    actual_specialty_condition, publication_specialty_index
+from app.services.publication_view_tables import publication_view_tables
+from app.services.utils.bitmap_utils import bitmap_after, bitmap_count, bitmap_ids, bitmap_from_ids
+from app.services.utils.cursor_utils import encode_cursor, decode_cursor
+from app.services.utils.like_utils import LIKE_ESCAPE, like_contains
+from app.services.utils.statement_cache import StatementCache, log_statement, page_params, paginate
 
 
 async def get_paginated_publications(
     db: AsyncSession,
     page: int,
     per_page: int,
-    filters: dict
-) -> Tuple[List[Publication], int]:
-    enum_fields = {
-        "serial_type": SerialTypeEnum11,
-        "serial_elem": SerialElemEnum,
-        "purpose": PurposeEnum,
-        "distribution": DistributionEnum,
-        "access": AccessEnum,
-        "main_finance": MainFinanceEnum,
-        "multidisc": MultidiscEnum,
-    }
-
-    query = select(Publication).options(
-        selectinload(Publication.actual_oecd_items),
-        selectinload(Publication.actual_grnti_items),
-        selectinload(Publication.main_sections)
+    filters: dict,
+    fieldset: PublicationFieldset = PLAIN_FIELDSET
+) -> dict:
+    publication_filter = _publication_filter(filters, languages_mode="all")
+
+    # По умолчанию коллекции в ответ списка (PublicationResponse) не входят и не загружаются
+    query = _statement_cache.get(
+        ("plain", _fieldset_key(fieldset), publication_filter.shape),
+        lambda: paginate(select(Publication).options(*_fieldset_options(fieldset)).where(*publication_filter.conditions())),
     )
-
-    # Initialize the count query without eager loading
-    count_query = select(func.count()).select_from(Publication)
-
-    # Фильтрация по языкам (Enum)
-    if "languages" in filters and filters["languages"]:
-        for lang in filters["languages"]:
-            query = query.where(Publication.language.like(f"%{lang.value}%"))
-            count_query = count_query.where(Publication.language.like(f"%{lang.value}%"))
-
-    # Фильтрация по остальным полям
-    for key, value in filters.items():
-        if key == "languages":
-            continue  # уже обработали выше
-        if key == "name" and value:
-            query = query.where(Publication.name.ilike(f"%{value}%"))
-            count_query = count_query.where(Publication.name.ilike(f"%{value}%"))
-        elif key == "el_updated_at_from" and value:
-            query = query.where(Publication.el_updated_at >= value)
-            count_query = count_query.where(Publication.el_updated_at >= value)
-        elif key == "el_updated_at_to" and value:
-            query = query.where(Publication.el_updated_at <= value)
-            count_query = count_query.where(Publication.el_updated_at <= value)
-        elif hasattr(Publication, key):
-            if key in enum_fields and value is not None:
-                try:
-                    enum_value = enum_fields[key](value)
-                except ValueError:
-                    continue
-                query = query.where(getattr(Publication, key) == enum_value)
-                count_query = count_query.where(getattr(Publication, key) == enum_value)
-            elif value is not None:
-                query = query.where(getattr(Publication, key) == value)
-                count_query = count_query.where(getattr(Publication, key) == value)
-
-    offset = (page - 1) * per_page
-    query = query.offset(offset).limit(per_page)
-
-    result = await db.execute(query)
+    result = await db.execute(query, {**publication_filter.params, **page_params((page - 1) * per_page, per_page)})
     publications = result.unique().scalars().all()
 
     # --- перед выполнением count ---
     logger.info(f"Count query filters: {filters}")
-    count_query = select(func.count()).select_from(count_subquery.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
-    logger.info(f"Total publications found with filters {filters}: {total}")
-
-    publications_out = []
-    for pub in publications:
-        pub_dict = {
-            **pub.__dict__,
-            "actual_oecd_items": [ActualOECDResponse.model_validate(item.__dict__) for item in pub.actual_oecd_items],
-            "actual_grnti_items": [ActualGRNTIResponse.model_validate(item.__dict__) for item in
-                                   pub.actual_grnti_items],
-            "main_sections": [MainSectionResponse.model_validate(item.__dict__) for item in pub.main_sections],
-        }
-        publications_out.append(PublicationResponse.model_validate(pub_dict))
+    total, total_cached = await publication_count_cache.get_or_count(
+        db, "publications", filters, _count_statement(publication_filter), publication_filter.params
+    )
+    logger.info(f"Total publications found with filters {filters}: {total} (cached: {total_cached})")
+
+    return {
+        "items": [_publication_plain_row(pub, fieldset) for pub in publications],
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": ceil(total / per_page),
+        "total_cached": total_cached,
+    }
 
-    return publications_out, total
 
-async def get_publication_by_id(db: AsyncSession, pub_id: int):
+async def get_publication_by_id(
+    db: AsyncSession,
+    pub_id: int,
+    fieldset: PublicationFieldset = PLAIN_FIELDSET
+) -> dict:
+    """
+    Публикация в виде готового к JSON словаря с полями PublicationResponse (или выбранными в fieldset).
+    """
     result = await db.execute(
-        select(Publication)
-        .options(
-            selectinload(Publication.actual_oecd_items),
-            selectinload(Publication.actual_grnti_items),
-            selectinload(Publication.main_sections)
-        )
-        .where(Publication.id == pub_id)
+        select(Publication).options(*_fieldset_options(fieldset)).where(Publication.id == pub_id)
     )
-    pub = result.scalar_one_or_none()
+    pub = result.unique().scalar_one_or_none()
     if not pub:
         raise HTTPException(status_code=404, detail="Публикация не найдена")
-
-    # Преобразуем в Pydantic модель
-    pub_dict = {
-        **pub.__dict__,
-        "actual_oecd_items": [ActualOECDResponse.model_validate(item.__dict__) for item in pub.actual_oecd_items],
-        "actual_grnti_items": [ActualGRNTIResponse.model_validate(item.__dict__) for item in pub.actual_grnti_items],
-        "main_sections": [MainSectionResponse.model_validate(item.__dict__) for item in pub.main_sections],
-    }
-    return PublicationOut.model_validate(pub_dict)
+    return _publication_plain_row(pub, fieldset)
 
 async def create_publication(db: AsyncSession, data: PublicationCreate):
     pub = Publication(**data.dict())
     db.add(pub)
     await db.commit()
     await db.refresh(pub)
+    await catalog_sync_service.publications_changed(db, [pub.id])
 
     # Преобразуем в Pydantic-модель
     return PublicationResponse.model_validate(pub.__dict__)
@@ -176,6 +154,7 @@ async def update_publication(db: AsyncSession, pub_id: int, data: PublicationUpd
 
     # Обновляем состояние объекта SQLAlchemy
     await db.refresh(pub)
+    await catalog_sync_service.publications_changed(db, [pub_id])
 
     # Преобразуем объект SQLAlchemy в Pydantic-модель
     try:
@@ -197,61 +176,94 @@ async def delete_publication(db: AsyncSession, pub_id: int):
         deleted_pub = PublicationResponse.model_validate(pub.__dict__)
         await db.delete(pub)
         await db.commit()
+        await catalog_sync_service.publications_changed(db, [pub_id])
         return {"detail": "Публикация удалена", "deleted_item": deleted_pub}
 
     raise HTTPException(status_code=404, detail="Публикация не найдена")
 
 
+def _view_condition(model, item: tuple):
+    """
+    Условие WHERE по VIEW (или его материализованной таблице) для одного элемента формы фильтра.
+    """
+    kind = item[0]
+    if kind == "languages":
+        _, languages, mode = item
+        return language_set_mask.condition(model.languages, languages, mode)
+    column = getattr(model, item[1])
+    if kind == "in":
+        return column.in_(bindparam(_param(item[1]), expanding=True))
+    if kind == "ilike":
+        return column.ilike(bindparam(_param(item[1])), escape=LIKE_ESCAPE)
+    return column == bindparam(_param(item[1]))
+
+
+def _view_page_statement(model, shape: tuple):
+    query = select(model).where(*[_view_condition(model, item) for item in shape])
+    if model in (PublicationBaseInfoTable, PublicationActualSpecialtyTable):
+        query = query.order_by(model.pub_id, model.id)
+    else:
+        query = query.order_by(model.pub_id)
+    return paginate(query)
+
+
+async def _view_page(db: AsyncSession, model, shape: tuple, params: dict, page: int, per_page: int):
+    query = _statement_cache.get(("view_page", model, shape), lambda: _view_page_statement(model, shape))
+    count_query = _statement_cache.get(
+        ("view_count", model, shape),
+        lambda: select(func.count()).select_from(model).where(*[_view_condition(model, item) for item in shape]),
+    )
+
+    result = await db.execute(query, {**params, **page_params((page - 1) * per_page, per_page)})
+    items = result.scalars().all()
+
+    total_result = await db.execute(count_query, params)
+    total = total_result.scalar_one()
+
+    return items, total
+
+
 async def get_paginated_publication_base_info(
     db: AsyncSession,
     page: int,
     per_page: int,
     filters: dict
 ):
-    query = select(PublicationBaseInfo)
-    count_query = select(func.count()).select_from(PublicationBaseInfo)
+    # Материализованная таблица, пока она поддерживается в актуальном состоянии, иначе исходный VIEW
+    model = PublicationBaseInfoTable if publication_view_tables.ready else PublicationBaseInfo
+    shape, params = [], {}
 
     # Фильтрация по языкам (SET)
     if "languages" in filters and filters["languages"]:
-        for lang in filters["languages"]:
-            # Используем FIND_IN_SET для работы с SET
-            query = query.where(text(f"FIND_IN_SET('{lang.value}', `Языки`)"))
-            count_query = count_query.where(text(f"FIND_IN_SET('{lang.value}', `Языки`)"))
+        shape.append(_languages_item(filters["languages"], filters.get("languages_mode", "all")))
+
+    name_pub_ids = publication_name_index.search(filters["name"]) if filters.get("name") else None
 
     # Фильтрация по остальным полям
     for key, value in filters.items():
-        if key == "languages":
+        if key in ("languages", "languages_mode"):
             continue  # уже обработали выше
 
-        if hasattr(PublicationBaseInfo, key) and value is not None:
-            column = getattr(PublicationBaseInfo, key)
-
+        if hasattr(model, key) and value is not None:
             # Специальная обработка для vak_category
             if key == "vak_category":
                 # Преобразуем значение Enum в строку
-                query = query.where(column == value.value if isinstance(value, VakCategoryEnum) else value)
-                count_query = count_query.where(column == value.value if isinstance(value, VakCategoryEnum) else value)
+                shape.append(("eq", key))
+                params[_param(key)] = value.value if isinstance(value, VakCategoryEnum) else value
+            elif key == "name" and name_pub_ids is not None:
+                # Название во VIEW совпадает с названием публикации: кандидаты берём из триграммного индекса
+                shape.append(("in", key))
+                params[_param(key)] = publication_name_index.names(name_pub_ids)
             elif isinstance(value, str):
                 # Для строковых полей используем ilike
-                query = query.where(column.ilike(f"%{value}%"))
-                count_query = count_query.where(column.ilike(f"%{value}%"))
+                shape.append(("ilike", key))
+                params[_param(key)] = like_contains(value)
             else:
                 # Для остальных (например, int) — обычное сравнение
-                query = query.where(column == value)
-                count_query = count_query.where(column == value)
+                shape.append(("eq", key))
+                params[_param(key)] = value
 
-    # Пагинация
-    offset = (page - 1) * per_page
-    query = query.offset(offset).limit(per_page)
-
-    # Выполнение запросов
-    result = await db.execute(query)
-    items = result.scalars().all()
-
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
-
-    return items, total
+    return await _view_page(db, model, tuple(shape), params, page, per_page)
 
 
 async def get_paginated_publication_actual_specialty(
@@ -260,109 +272,163 @@ async def get_paginated_publication_actual_specialty(
     per_page: int,
     filters: dict
 ):
-    query = select(PublicationActualSpecialty)
-    count_query = select(func.count()).select_from(PublicationActualSpecialty)
+    model = PublicationActualSpecialtyTable if publication_view_tables.ready else PublicationActualSpecialty
+    shape, params = [], {}
 
     for key, value in filters.items():
-        if hasattr(PublicationActualSpecialty, key) and value is not None:
-            column = getattr(PublicationActualSpecialty, key)
+        if hasattr(model, key) and value is not None:
+            column = getattr(model, key)
 
             # Специальная обработка для Enum
             if isinstance(column.type, Enum) and isinstance(value, str):
                 # Преобразуем значение Enum в строку
-                query = query.where(column == value)
-                count_query = count_query.where(column == value)
+                shape.append(("eq", key))
+                params[_param(key)] = value
             elif isinstance(value, str):
                 # Для строковых полей используем ilike
-                query = query.where(column.ilike(f"%{value}%"))
-                count_query = count_query.where(column.ilike(f"%{value}%"))
+                shape.append(("ilike", key))
+                params[_param(key)] = like_contains(value)
             else:
                 # Для остальных (например, int) — обычное сравнение
-                query = query.where(column == value)
-                count_query = count_query.where(column == value)
-
-    offset = (page - 1) * per_page
-    query = query.offset(offset).limit(per_page)
+                shape.append(("eq", key))
+                params[_param(key)] = value
 
-    result = await db.execute(query)
-    items = result.scalars().all()
-
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
-
-    return items, total
+    return await _view_page(db, model, tuple(shape), params, page, per_page)
 
 
 logger = logging.getLogger("publications")
 logger.setLevel(logging.INFO)
 
 
-
-async def get_paginated_publications_with_index_and_information(
-    db: AsyncSession,
-    page: int,
-    per_page: int,
-    filters: dict
-) -> Tuple[List[PublicationResponseWith], int]:
-    if page < 1 or per_page < 1:
-        logger.error(f"Invalid pagination parameters: page={page}, per_page={per_page}")
-        raise ValueError("Page and per_page must be positive integers")
-
-    enum_fields = {
-        "serial_type": SerialTypeEnum11,
-        "serial_elem": SerialElemEnum,
-        "purpose": PurposeEnum,
-        "distribution": DistributionEnum,
-        "access": AccessEnum,
-        "main_finance": MainFinanceEnum,
-        "multidisc": MultidiscEnum,
-    }
-
-    logger.info(f"Applying filters: {filters}")
-
-    # --- базовый запрос ---
-    base_query = select(Publication).options(
-        selectinload(Publication.actual_oecd_items),
-        selectinload(Publication.actual_grnti_items),
-        selectinload(Publication.main_sections),
-        selectinload(Publication.actual_specialties),
-        joinedload(Publication.pub_information),
-        joinedload(Publication.index),
-    ).distinct()
-
-    # --- подзапрос для count ---
-    count_subquery = select(Publication.id).distinct()
-
-    # --- применение фильтров ---
+# Запросы списков по форме фильтров; значения фильтров передаются bind-параметрами
+_statement_cache = StatementCache()
+
+
+def _param(key: str) -> str:
+    return f"filter_{key}"
+
+
+class _PublicationFilter(NamedTuple):
+    """
+    Фильтр публикаций: shape — какие условия и в каком варианте (ключ кэша запросов),
+    params — значения bind-параметров этих условий.
+    """
+    shape: tuple
+    params: dict
+
+    def conditions(self) -> list:
+        return [_filter_condition(item) for item in self.shape]
+
+    def after(self, after_id: int) -> "_PublicationFilter":
+        return _PublicationFilter(self.shape + (("after_id",),), {**self.params, _param("after_id"): after_id})
+
+
+def _ids_filter(pub_ids: Iterable[int]) -> _PublicationFilter:
+    return _PublicationFilter((("ids",),), {_param("ids"): list(pub_ids)})
+
+
+def _fieldset_key(fieldset: PublicationFieldset) -> tuple:
+    return fieldset.fields, fieldset.include, tuple(sorted(fieldset.related_fields.items()))
+
+
+def _languages_item(languages, mode) -> tuple:
+    # Маска SET считается из самих языков, поэтому они входят в форму; их комбинаций немного
+    return "languages", tuple(sorted(_json_value(language) for language in languages)), _json_value(mode)
+
+
+def _name_filter(value: str) -> Tuple[tuple, object]:
+    """
+    Поиск подстроки в названии: по триграммному индексу, если он готов, иначе ILIKE по таблице.
+    """
+    pub_ids = publication_name_index.search(value)
+    if pub_ids is None:
+        return ("name", "ilike"), like_contains(value)
+    return ("name", "ids"), list(pub_ids)
+
+
+def _specialty_filter(specialty_ids: list, actual_only: bool) -> Tuple[tuple, dict]:
+    """
+    Фильтр по специальностям: готовый список id из обратного индекса вместо коррелированного EXISTS
+    по actual_specialty. actual_only — только связи, действующие на сегодня.
+    """
+    pub_ids = publication_specialty_index.pub_ids(specialty_ids, actual_only)
+    if pub_ids is not None and len(pub_ids) <= MAX_SPECIALTY_MATCHED_IDS:
+        return ("speciality_id", "ids"), {_param("speciality_id"): pub_ids}
+    params = {_param("speciality_id"): specialty_ids}
+    if actual_only:
+        params[_param("speciality_on")] = date.today()
+    return ("speciality_id", "exists", actual_only), params
+
+
+def _filter_condition(item: tuple):
+    """
+    Условие WHERE для одного элемента формы фильтра публикаций.
+    """
+    kind = item[0]
+    if kind == "languages":
+        _, languages, mode = item
+        return language_set_mask.condition(Publication.language, languages, mode)
+    if kind == "name":
+        if item[1] == "ilike":
+            return Publication.name.ilike(bindparam(_param("name")), escape=LIKE_ESCAPE)
+        return Publication.id.in_(bindparam(_param("name"), expanding=True))
+    if kind == "speciality_id":
+        if item[1] == "ids":
+            return Publication.id.in_(bindparam(_param("speciality_id"), expanding=True))
+        link_condition = ActualSpecialty.specialty_id.in_(bindparam(_param("speciality_id"), expanding=True))
+        if item[2]:
+            link_condition = and_(link_condition, actual_specialty_condition(bindparam(_param("speciality_on"))))
+        return Publication.actual_specialties.any(link_condition)
+    if kind == "ids":
+        return Publication.id.in_(bindparam(_param("ids"), expanding=True))
+    if kind == "after_id":
+        return Publication.id > bindparam(_param("after_id"))
+    if kind == "el_updated_at_from":
+        return Publication.el_updated_at >= bindparam(_param(kind))
+    if kind == "el_updated_at_to":
+        return Publication.el_updated_at <= bindparam(_param(kind))
+    return getattr(Publication, item[1]) == bindparam(_param(item[1]))
+
+
+ENUM_FILTER_FIELDS = {
+    "serial_type": SerialTypeEnum11,
+    "serial_elem": SerialElemEnum,
+    "purpose": PurposeEnum,
+    "distribution": DistributionEnum,
+    "access": AccessEnum,
+    "main_finance": MainFinanceEnum,
+    "multidisc": MultidiscEnum,
+}
+
+
+def _publication_filter(filters: dict, languages_mode: str = "any") -> _PublicationFilter:
+    """
+    Форма и параметры фильтра списка публикаций. languages_mode — режим по умолчанию, если в фильтрах его нет.
+    """
+    shape = []
+    params = {}
     for key, value in filters.items():
-        if not value:
-            logger.debug(f"Skipping empty filter: {key}")
+        if not value or key in ("languages_mode", "speciality_actual_only"):
+            logger.debug(f"Skipping filter: {key}")
             continue
 
         logger.debug(f"Applying filter: {key} = {value}")
 
         if key == "languages":
-            lang_conditions = [Publication.language.like(f"%{lang.value}%") for lang in value]
-            base_query = base_query.where(or_(*lang_conditions))
-            count_subquery = count_subquery.where(or_(*lang_conditions))
+            shape.append(_languages_item(value, filters.get("languages_mode") or languages_mode))
 
         elif key == "name":
-            base_query = base_query.where(Publication.name.ilike(f"%{value}%"))
-            count_subquery = count_subquery.where(Publication.name.ilike(f"%{value}%"))
+            item, params[_param("name")] = _name_filter(value)
+            shape.append(item)
 
-        elif key == "el_updated_at_from":
-            base_query = base_query.where(Publication.el_updated_at >= value)
-            count_subquery = count_subquery.where(Publication.el_updated_at >= value)
+        elif key in ("el_updated_at_from", "el_updated_at_to"):
+            shape.append((key,))
+            params[_param(key)] = value
 
-        elif key == "el_updated_at_to":
-            base_query = base_query.where(Publication.el_updated_at <= value)
-            count_subquery = count_subquery.where(Publication.el_updated_at <= value)
-
-        elif key in enum_fields:
+        elif key in ENUM_FILTER_FIELDS:
             try:
-                enum_value = enum_fields[key](value)
-                base_query = base_query.where(getattr(Publication, key) == enum_value)
-                count_subquery = count_subquery.where(getattr(Publication, key) == enum_value)
+                params[_param(key)] = ENUM_FILTER_FIELDS[key](value)
+                shape.append(("eq", key))
             except ValueError:
                 logger.warning(f"Invalid enum value for {key}: {value}")
                 continue
@@ -374,69 +440,547 @@ async def get_paginated_publications_with_index_and_information(
             if not isinstance(value, list):
                 logger.warning(f"Invalid value for speciality_id filter: {value}")
                 continue
-            base_query = base_query.where(
-                Publication.actual_specialties.any(
-                    ActualSpecialty.specialty_id.in_(value)
-                )
-            )
-            count_subquery = count_subquery.where(
-                Publication.actual_specialties.any(
-                    ActualSpecialty.specialty_id.in_(value)
-                )
-            )
+            item, item_params = _specialty_filter(value, bool(filters.get("speciality_actual_only")))
+            shape.append(item)
+            params.update(item_params)
 
         elif hasattr(Publication, key):
-            base_query = base_query.where(getattr(Publication, key) == value)
-            count_subquery = count_subquery.where(getattr(Publication, key) == value)
+            shape.append(("eq", key))
+            params[_param(key)] = value
         else:
             logger.warning(f"Unknown filter key: {key}")
+    return _PublicationFilter(tuple(shape), params)
 
-    # --- выполнение count через подзапрос ---
-    count_query = select(func.count()).select_from(count_subquery.subquery())
-    logger.info(f"Count query SQL: {str(count_query.compile(compile_kwargs={'literal_binds': True}))}")
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
-    logger.info(f"Total publications found with filters {filters}: {total}")
 
-    # --- пагинация ---
-    offset = (page - 1) * per_page
-    base_query = base_query.offset(offset).limit(per_page)
-    logger.info(f"Base query SQL (paginated): {str(base_query.compile(compile_kwargs={'literal_binds': True}))}")
+def _count_statement(publication_filter: _PublicationFilter):
+    return _statement_cache.get(
+        ("count", publication_filter.shape),
+        lambda: select(func.count()).select_from(Publication).where(*publication_filter.conditions()),
+    )
+
+
+def _filter_index_page(filters: dict, page: int, per_page: int, after_id: Optional[int]):
+    """
+    Отвечает на запрос страницы по битовым картам, если все фильтры поддерживаются индексом
+    (название ищется по триграммному индексу, специальности — по обратному индексу, и пересекаются с картами).
+    Возвращает (total, id страницы + одна следующая запись) или None.
+    """
+    index_filters = {
+        key: value for key, value in filters.items()
+        if key not in ("name", "speciality_id", "speciality_actual_only")
+    }
+    if not publication_filter_index.ready or not publication_filter_index.supports(index_filters):
+        return None
+    name_ids = None
+    if filters.get("name"):
+        name_ids = publication_name_index.search(filters["name"])
+        if name_ids is None:
+            return None
+    specialty_ids = None
+    if filters.get("speciality_id"):
+        specialty_ids = publication_specialty_index.pub_ids(
+            filters["speciality_id"], bool(filters.get("speciality_actual_only"))
+        )
+        if specialty_ids is None:
+            return None
+    bitmap = publication_filter_index.match(index_filters)
+    if name_ids is not None:
+        bitmap &= bitmap_from_ids(name_ids)
+    if specialty_ids is not None:
+        bitmap &= bitmap_from_ids(specialty_ids)
+    if after_id is not None:
+        page_ids = bitmap_ids(bitmap_after(bitmap, after_id), limit=per_page + 1)
+    else:
+        page_ids = bitmap_ids(bitmap, skip=(page - 1) * per_page, limit=per_page + 1)
+    return bitmap_count(bitmap), page_ids
+
+
+def _json_value(value):
+    return value.value if isinstance(value, PyEnum) else value
+
+
+def _item_value(item, name: str):
+    return item[name] if isinstance(item, dict) else getattr(item, name)
+
+
+def publication_row(pub: Publication, fields: tuple = PUBLICATION_FIELDS) -> dict:
+    """
+    Поля PublicationResponse прямо из ORM-объекта, без Pydantic-валидации.
+    Значения enum заменены на строки, дата остаётся date (её кодирует orjson).
+    """
+    row = {field: _json_value(getattr(pub, field)) for field in fields}
+    if row.get("language") is not None:
+        row["language"] = [_json_value(language) for language in row["language"]]
+    return row
+
+
+def _related_row(obj, fields: tuple) -> Optional[dict]:
+    if obj is None:
+        return None
+    return {field: _json_value(getattr(obj, field)) for field in fields}
+
+
+def _classifier_rows(items, classifier_field: str) -> list:
+    # actual приходит из JSON_ARRAYAGG числом 0/1, приводим к bool, как в схеме
+    return [
+        {
+            "pub_id": _item_value(item, "pub_id"),
+            classifier_field: _item_value(item, classifier_field),
+            "actual": bool(_item_value(item, "actual")),
+            "id": _item_value(item, "id"),
+        }
+        for item in _sorted_by_id(items)
+    ]
+
+
+def _included_rows(pub: Publication, fieldset: PublicationFieldset, collections: Optional[dict] = None) -> dict:
+    """
+    Связи из fieldset.include. Коллекции берутся из collections (JSON из БД), если он передан, иначе из ORM-объекта.
+    """
+    row = {}
+    for name in fieldset.include:
+        if name in PUBLICATION_COLLECTIONS:
+            items = collections[name] if collections is not None else getattr(pub, name)
+            row[name] = _classifier_rows(items, PUBLICATION_COLLECTIONS[name])
+        else:
+            row[name] = _related_row(getattr(pub, name), fieldset.related_fields[name])
+    return row
+
+
+def _publication_plain_row(pub: Publication, fieldset: PublicationFieldset) -> dict:
+    # Форма списка и карточки: language может быть null, связи только из include
+    row = publication_row(pub, fieldset.fields)
+    row.update(_included_rows(pub, fieldset))
+    return row
+
+
+def publication_with_row(
+    pub: Publication,
+    fieldset: PublicationFieldset = FULL_FIELDSET,
+    collections: Optional[dict] = None
+) -> dict:
+    """
+    Элемент PublicationResponseWith в виде словаря; дочерние элементы (ORM-объекты или словари) упорядочены по id.
+    """
+    row = publication_row(pub, fieldset.fields)
+    if "language" in row:
+        row["language"] = row["language"] or []
+    row.update(_included_rows(pub, fieldset, collections))
+    return row
 
-    # --- выполнение основного запроса ---
-    result = await db.execute(base_query)
-    publications = result.unique().scalars().all()
 
-    publications_out = []
-    for pub in publications:
-        pub_information = PubInformationResponse.model_validate(pub.pub_information, from_attributes=True) if pub.pub_information else None
-        index = IndexResponse.model_validate(pub.index, from_attributes=True) if pub.index else None
-
-        publications_out.append(
-            PublicationResponseWith(
-                id=pub.id,
-                el_id=pub.el_id,
-                vak_id=pub.vak_id,
-                name=pub.name,
-                serial_type=pub.serial_type,
-                serial_elem=pub.serial_elem,
-                purpose=pub.purpose,
-                distribution=pub.distribution,
-                access=pub.access,
-                main_finance=pub.main_finance,
-                multidisc=pub.multidisc,
-                language=list(pub.language) if pub.language else [],
-                el_updated_at=pub.el_updated_at,
-                actual_oecd_items=[ActualOECDResponse.model_validate(item, from_attributes=True) for item in pub.actual_oecd_items],
-                actual_grnti_items=[ActualGRNTIResponse.model_validate(item, from_attributes=True) for item in pub.actual_grnti_items],
-                main_sections=[MainSectionResponse.model_validate(item, from_attributes=True) for item in pub.main_sections],
-                pub_information=pub_information,
-                index=index
-            )
+def _sorted_by_id(items) -> list:
+    if not items:
+        return []
+    return sorted(items, key=lambda item: _item_value(item, "id"))
+
+
+def _page_query(query, conditions: list, with_offset: bool, with_limit: bool):
+    return paginate(query.where(*conditions).order_by(Publication.id), with_offset, with_limit)
+
+
+def _related_loader(name: str, fieldset: PublicationFieldset):
+    relationship = getattr(Publication, name)
+    model = relationship.property.mapper.class_
+    return joinedload(relationship).load_only(*[getattr(model, field) for field in fieldset.related_fields[name]])
+
+
+def _fieldset_options(fieldset: PublicationFieldset, collections_loaded: bool = True) -> list:
+    """
+    Опции загрузки: только выбранные колонки публикации (остальные, в том числе Text, отложены)
+    и только запрошенные связи.
+    """
+    options = [load_only(*[getattr(Publication, field) for field in fieldset.fields])]
+    for name in fieldset.include:
+        if name in PUBLICATION_RELATED_FIELDS:
+            options.append(_related_loader(name, fieldset))
+        elif collections_loaded:
+            options.append(selectinload(getattr(Publication, name)))
+    return options
+
+
+async def load_publication_page_selectin(
+    db: AsyncSession,
+    publication_filter: _PublicationFilter,
+    offset: Optional[int] = None,
+    limit: Optional[int] = None,
+    fieldset: PublicationFieldset = FULL_FIELDSET
+) -> List[dict]:
+    """
+    Прежняя стратегия: основной запрос с joinedload и по отдельному запросу на каждую коллекцию.
+    """
+    query = _statement_cache.get(
+        ("selectin", _fieldset_key(fieldset), publication_filter.shape, offset is not None, limit is not None),
+        lambda: _page_query(
+            select(Publication).options(*_fieldset_options(fieldset)),
+            publication_filter.conditions(), offset is not None, limit is not None,
+        ),
+    )
+    result = await db.execute(query, {**publication_filter.params, **page_params(offset, limit)})
+    return [publication_with_row(pub, fieldset) for pub in result.unique().scalars().all()]
+
+
+def _json_children(name: str):
+    """
+    Коррелированный подзапрос: все элементы коллекции name текущей публикации одним JSON-массивом
+    (NULL, если элементов нет).
+    """
+    model = getattr(Publication, name).property.mapper.class_
+    pairs = []
+    for key in ("id", "pub_id", PUBLICATION_COLLECTIONS[name], "actual"):
+        pairs.extend((key, getattr(model, key)))
+    return (
+        select(func.json_arrayagg(func.json_object(*pairs), type_=JSON))
+        .where(model.pub_id == Publication.id)
+        .correlate(Publication)
+        .scalar_subquery()
+    )
+
+
+def _collection_names(fieldset: PublicationFieldset) -> list:
+    return [name for name in fieldset.include if name in PUBLICATION_COLLECTIONS]
+
+
+def _publication_page_select(fieldset: PublicationFieldset = FULL_FIELDSET):
+    return select(
+        Publication,
+        *[_json_children(name) for name in _collection_names(fieldset)],
+    ).options(*_fieldset_options(fieldset, collections_loaded=False))
+
+
+def _publication_json_rows(rows, fieldset: PublicationFieldset) -> List[dict]:
+    names = _collection_names(fieldset)
+    return [publication_with_row(pub, fieldset, dict(zip(names, collections))) for pub, *collections in rows]
+
+
+async def load_publication_page_json(
+    db: AsyncSession,
+    publication_filter: _PublicationFilter,
+    offset: Optional[int] = None,
+    limit: Optional[int] = None,
+    fieldset: PublicationFieldset = FULL_FIELDSET
+) -> List[dict]:
+    """
+    Вся страница одним запросом: pub_information и index через JOIN,
+    коллекции — через JSON_ARRAYAGG в коррелированных подзапросах.
+    """
+    query = _statement_cache.get(
+        ("json", _fieldset_key(fieldset), publication_filter.shape, offset is not None, limit is not None),
+        lambda: _page_query(
+            _publication_page_select(fieldset), publication_filter.conditions(), offset is not None, limit is not None,
+        ),
+    )
+    result = await db.execute(query, {**publication_filter.params, **page_params(offset, limit)})
+    return _publication_json_rows(result.all(), fieldset)
+
+
+PUBLICATION_PAGE_LOADERS = {
+    "json": load_publication_page_json,
+    "selectin": load_publication_page_selectin,
+}
+
+
+def _publication_page_loader():
+    return PUBLICATION_PAGE_LOADERS.get(settings.PUBLICATION_PAGE_LOADER, load_publication_page_json)
+
+
+# Ограничение на размер одного пакетного запроса публикаций
+PUBLICATION_BATCH_MAX_IDS = 200
+
+
+async def get_publications_batch(
+    db: AsyncSession,
+    ids: List[int],
+    fieldset: PublicationFieldset = FULL_FIELDSET
+) -> dict:
+    """
+    Публикации с index, pub_information и классификаторами по списку id за один запрос.
+    Порядок элементов совпадает с порядком id в запросе (повторы отбрасываются), ненайденные id — в missing.
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    if not unique_ids:
+        raise HTTPException(status_code=400, detail="Не переданы id публикаций")
+    if len(unique_ids) > PUBLICATION_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Можно запросить не больше {PUBLICATION_BATCH_MAX_IDS} публикаций за раз"
         )
 
+    rows = await _publication_page_loader()(db, _ids_filter(unique_ids), fieldset=fieldset)
+    by_id = {row["id"]: row for row in rows}
+    return {
+        "items": [by_id[pub_id] for pub_id in unique_ids if pub_id in by_id],
+        "missing": [pub_id for pub_id in unique_ids if pub_id not in by_id],
+    }
+
+
+async def search_publications(
+    db: AsyncSession,
+    query: str,
+    page: int,
+    per_page: int,
+    fieldset: PublicationFieldset = PLAIN_FIELDSET
+) -> dict:
+    """
+    Поиск по названию, ГРНТИ, ОЕСД и разделам с ранжированием BM25.
+    Страница выбирается в индексе, из БД загружаются только её публикации.
+    """
+    found = publication_search_index.search(query, (page - 1) * per_page, per_page)
+    if found is None:
+        raise HTTPException(status_code=503, detail="Поисковый индекс ещё не построен")
+    total, ranked = found
+
+    rows = await _publication_page_loader()(db, _ids_filter(pub_id for pub_id, _ in ranked), fieldset=fieldset)
+    by_id = {row["id"]: row for row in rows}
+    items = [
+        {**by_id[pub_id], "score": round(score, 4)}
+        for pub_id, score in ranked
+        if pub_id in by_id
+    ]
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": ceil(total / per_page),
+    }
+
+
+async def get_similar_publications(
+    db: AsyncSession,
+    pub_id: int,
+    limit: int,
+    fieldset: PublicationFieldset = PLAIN_FIELDSET
+) -> dict:
+    """
+    Журналы, ближайшие к pub_id по действующим ОЕСД, ГРНТИ, специальностям и разделам (косинусная мера).
+    Соседи берутся из матрицы в памяти, из БД загружаются только они.
+    """
+    if not publication_similarity_index.ready:
+        raise HTTPException(status_code=503, detail="Индекс похожих публикаций ещё не построен")
+    similar = publication_similarity_index.similar(pub_id, limit)
+    if similar is None:
+        # В матрице только публикации с классификаторами
+        if await db.scalar(select(Publication.id).where(Publication.id == pub_id)) is None:
+            raise HTTPException(status_code=404, detail="Публикация не найдена")
+        return {"items": []}
+
+    rows = await _publication_page_loader()(db, _ids_filter(similar_id for similar_id, _ in similar), fieldset=fieldset)
+    by_id = {row["id"]: row for row in rows}
+    return {
+        "items": [
+            {**by_id[similar_id], "score": round(score, 4)}
+            for similar_id, score in similar
+            if similar_id in by_id
+        ]
+    }
+
+
+def suggest_publications(query: str, limit: int) -> dict:
+    """
+    Подсказки для строки поиска: журналы по началу названия или слова в нём и по ISSN, специальности по коду.
+    БД не используется.
+    """
+    items = publication_suggest_index.suggest(query, limit)
+    if items is None:
+        raise HTTPException(status_code=503, detail="Индекс подсказок ещё не построен")
+    return {"items": items}
+
+
+async def get_paginated_publications_with_index_and_information(
+    db: AsyncSession,
+    page: int,
+    per_page: int,
+    filters: dict,
+    cursor: Optional[str] = None,
+    fieldset: PublicationFieldset = FULL_FIELDSET
+) -> dict:
+    if page < 1 or per_page < 1:
+        logger.error(f"Invalid pagination parameters: page={page}, per_page={per_page}")
+        raise ValueError("Page and per_page must be positive integers")
+
+    after_id = None
+    if cursor is not None:
+        after_id = decode_cursor(cursor)
+        if after_id is None:
+            raise HTTPException(status_code=400, detail="Некорректный курсор")
+
+    logger.info(f"Applying filters: {filters}")
+
+    index_page = _filter_index_page(filters, page, per_page, after_id)
+    if index_page is not None:
+        # --- только фильтры по enum, языкам и специальностям: страница из битовых карт ---
+        total, page_ids = index_page
+        total_cached = False
+        publication_filter = _ids_filter(page_ids)
+        offset, limit = None, None
+        logger.info(f"Total publications found in filter index with filters {filters}: {total}")
+    else:
+        publication_filter = _publication_filter(filters)
+
+        # --- выполнение count ---
+        count_query = _count_statement(publication_filter)
+        log_statement(logger, "Count query SQL", count_query, publication_filter.params)
+        total, total_cached = await publication_count_cache.get_or_count(
+            db, "publications_with_index", filters, count_query, publication_filter.params
+        )
+        logger.info(f"Total publications found with filters {filters}: {total} (cached: {total_cached})")
+
+        # --- пагинация ---
+        # Берём на одну запись больше, чтобы понять, есть ли следующая страница.
+        limit = per_page + 1
+        if after_id is not None:
+            publication_filter = publication_filter.after(after_id)
+            offset = None
+        else:
+            offset = (page - 1) * per_page
+
+    # --- выполнение основного запроса ---
+    publications_out = await _publication_page_loader()(db, publication_filter, offset, limit, fieldset)
+
+    next_cursor = None
+    if len(publications_out) > per_page:
+        publications_out = publications_out[:per_page]
+        next_cursor = encode_cursor(publications_out[-1]["id"])
+
     logger.info(
         f"Returning {len(publications_out)} publications (page {page}/{ceil(total / per_page)}) "
         f"out of total {total} matching filters: {filters}"
     )
-    return publications_out, total
+    return {
+        "items": publications_out,
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": ceil(total / per_page),
+        "total_cached": total_cached,
+        "next_cursor": next_cursor,
+    }
+
+
+# Сколько строк забирать с серверного курсора за раз при выгрузке
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+def _export_csv_columns(fieldset: PublicationFieldset) -> list:
+    # Вложенные объекты раскладываются в колонки с префиксом, списки пишутся в ячейку как JSON
+    return (
+        list(fieldset.fields)
+        + _collection_names(fieldset)
+        + [
+            f"{relation}.{name}"
+            for relation, names in fieldset.related_fields.items()
+            for name in names
+        ]
+    )
+
+
+def _export_csv_row(item: dict, columns: list) -> list:
+    row = []
+    for column in columns:
+        if "." in column:
+            parent, name = column.split(".", 1)
+            value = (item.get(parent) or {}).get(name)
+        else:
+            value = item.get(column)
+        if isinstance(value, (list, dict)):
+            value = json.dumps(value, ensure_ascii=False)
+        row.append("" if value is None else value)
+    return row
+
+
+async def stream_publications_export(
+    filters: dict,
+    export_format: str,
+    fieldset: PublicationFieldset = FULL_FIELDSET
+) -> AsyncIterator[bytes]:
+    """
+    Выгружает все подходящие под фильтры публикации в NDJSON или CSV.
+    Строки читаются с серверного курсора пачками по EXPORT_BATCH_SIZE, поэтому память не растёт с размером каталога.
+    Сессия открывается внутри генератора: зависимость get_db1_session закрывается до начала отдачи тела ответа.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    publication_filter = _publication_filter(filters)
+    query = _statement_cache.get(
+        ("export", _fieldset_key(fieldset), publication_filter.shape),
+        lambda: _page_query(
+            _publication_page_select(fieldset), publication_filter.conditions(), False, False
+        ).execution_options(yield_per=EXPORT_BATCH_SIZE),
+    )
+
+    exported = 0
+    if export_format == "csv":
+        columns = _export_csv_columns(fieldset)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue().encode("utf-8")
+
+    async with db1_session() as session:
+        result = await session.stream(query, publication_filter.params)
+        async for rows in result.partitions():
+            items = _publication_json_rows(rows, fieldset)
+            # ORM-объекты пачки больше не нужны, не держим их в identity map
+            session.expunge_all()
+            exported += len(items)
+
+            if export_format == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(_export_csv_row(item, columns) for item in items)
+                yield buffer.getvalue().encode("utf-8")
+            else:
+                yield b"".join(orjson.dumps(item) + b"\n" for item in items)
+
+    logger.info(f"Exported {exported} publications as {export_format} with filters: {filters}")
+
+
+def _facet_columns() -> list:
+    """
+    (поле, значение, условие) для каждого значения каждого фасета.
+    """
+    facet_columns = [
+        (field, member.value, getattr(Publication, field) == member)
+        for field, enum_class in ENUM_FILTER_FIELDS.items()
+        for member in enum_class
+    ]
+    facet_columns += [
+        ("language", lang.value, func.find_in_set(lang.value, Publication.language) > 0)
+        for lang in LanguageEnum
+    ]
+    facet_columns += [("vak_cat", cat.value, Index.vak_cat == cat) for cat in VakCatEnum]
+    return facet_columns
+
+
+FACET_COLUMNS = _facet_columns()
+
+
+def _facets_statement(publication_filter: _PublicationFilter):
+    return (
+        select(
+            func.count(),
+            *[func.sum(case((condition, 1), else_=0)) for _, _, condition in FACET_COLUMNS]
+        )
+        .select_from(Publication)
+        .outerjoin(Index, Index.pub_id == Publication.id)
+        .where(*publication_filter.conditions())
+    )
+
+
+async def get_publication_facets(db: AsyncSession, filters: dict) -> dict:
+    """
+    Считает количество публикаций для каждого значения каждого фасета среди публикаций,
+    подходящих под фильтры. Все счётчики собираются одним запросом за один проход.
+    """
+    publication_filter = _publication_filter(filters)
+    query = _statement_cache.get(("facets", publication_filter.shape), lambda: _facets_statement(publication_filter))
+    row = (await db.execute(query, publication_filter.params)).one()
+
+    facets = {}
+    for (field, value, _), count in zip(FACET_COLUMNS, row[1:]):
+        facets.setdefault(field, {})[value] = int(count or 0)
+    logger.info(f"Facets calculated for filters {filters}: total {row[0]}")
+    return {"total": row[0], "facets": facets}
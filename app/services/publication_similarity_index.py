@@ -0,0 +1,113 @@
+import asyncio
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix, diags
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.logger import logger
+from app.models.actual_grnti import ActualGRNTI
+from app.models.actual_oecd import ActualOECD
+from app.models.actual_specialty import ActualSpecialty
+from app.models.main_section import MainSection
+from app.services.publication_specialty_index import actual_specialty_condition
+from app.services.utils.deferred_rebuild import DeferredRebuild
+
+# Признаки публикации: (вид, поле id классификатора, связь)
+_MEMBERSHIPS = (
+    ("oecd", ActualOECD.oecd_id, ActualOECD),
+    ("grnti", ActualGRNTI.grnti_id, ActualGRNTI),
+    ("specialty", ActualSpecialty.specialty_id, ActualSpecialty),
+    ("section", MainSection.section_id, MainSection),
+)
+
+
+async def _load_memberships(db: AsyncSession) -> List[Tuple[int, tuple]]:
+    memberships = []
+    for kind, classifier_id, link_model in _MEMBERSHIPS:
+        query = select(link_model.pub_id, classifier_id).where(link_model.actual.is_(True))
+        if link_model is ActualSpecialty:
+            query = query.where(actual_specialty_condition(date.today()))
+        memberships.extend((pub_id, (kind, item_id)) for pub_id, item_id in (await db.execute(query)).all())
+    return memberships
+
+
+class _SimilarityMatrix:
+    """
+    Строки — публикации, столбцы — классификаторы; строки нормированы по L2,
+    поэтому произведение двух строк равно косинусу между публикациями.
+    """
+
+    def __init__(self, memberships: Iterable[Tuple[int, tuple]]):
+        rows: Dict[int, int] = {}
+        columns: Dict[tuple, int] = {}
+        row_indices = []
+        column_indices = []
+        for pub_id, feature in set(memberships):
+            row_indices.append(rows.setdefault(pub_id, len(rows)))
+            column_indices.append(columns.setdefault(feature, len(columns)))
+        matrix = csr_matrix(
+            (np.ones(len(row_indices)), (row_indices, column_indices)),
+            shape=(len(rows), len(columns)),
+        )
+        norms = np.sqrt(np.asarray(matrix.sum(axis=1)).ravel())
+        self.matrix = csr_matrix(diags(1.0 / norms) @ matrix)
+        # Транспонированная матрица в CSR: для строки запроса читаются только столбцы её классификаторов
+        self.transposed = self.matrix.T.tocsr()
+        self.rows = rows
+        self.pub_ids = np.fromiter(rows, dtype=np.int64, count=len(rows))
+
+    def similar(self, pub_id: int, limit: int) -> Optional[List[Tuple[int, float]]]:
+        row = self.rows.get(pub_id)
+        if row is None:
+            return None
+        scores = self.matrix[row] @ self.transposed
+        mask = scores.indices != row
+        indices = scores.indices[mask]
+        data = scores.data[mask]
+        if len(data) > limit:
+            top = np.argpartition(-data, limit - 1)[:limit]
+            indices, data = indices[top], data[top]
+        pub_ids = self.pub_ids[indices]
+        order = np.lexsort((pub_ids, -data))
+        return [(int(pub_ids[i]), float(data[i])) for i in order]
+
+
+class PublicationSimilarityIndex:
+    """
+    Похожие журналы: косинусная близость разреженных векторов действующих ОЕСД, ГРНТИ,
+    специальностей и основных разделов. Изменения из catalog_sync_service запускают фоновую
+    перестройку матрицы; запросы до её окончания обслуживает прежняя матрица, новая подменяет
+    её одним присваиванием.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._matrix: Optional[_SimilarityMatrix] = None
+        self._deferred = DeferredRebuild(self.rebuild, "publication similarity index")
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        memberships = await _load_memberships(db)
+        self._matrix = await asyncio.to_thread(_SimilarityMatrix, memberships)
+        self.ready = True
+        logger.info(f"Publication similarity index rebuilt: {len(self._matrix.rows)} publications")
+
+    async def refresh(self, db: AsyncSession, pub_ids: set) -> None:
+        # Точечная правка CSR не дешевле пересборки, поэтому матрица собирается заново в фоне
+        if self.ready:
+            self._deferred.schedule()
+
+    def similar(self, pub_id: int, limit: int) -> Optional[List[Tuple[int, float]]]:
+        """
+        [(pub_id, косинус)] по убыванию близости без самой публикации,
+        None, если у публикации нет действующих классификаторов или индекс не готов.
+        """
+        matrix = self._matrix
+        if not self.ready or matrix is None:
+            return None
+        return matrix.similar(pub_id, limit)
+
+
+publication_similarity_index = PublicationSimilarityIndex()
@@ -0,0 +1,111 @@
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.logger import logger
+from app.models.actual_specialty import ActualSpecialty
+
+# Если под фильтр подходит больше публикаций, список id в IN дороже, чем EXISTS по actual_specialty
+MAX_MATCHED_IDS = 5000
+
+# (actual, start_date, end_date) одной записи actual_specialty
+_Link = Tuple[bool, Optional[date], Optional[date]]
+
+
+def _is_actual(link: _Link, on: date) -> bool:
+    actual, start_date, end_date = link
+    return actual and (start_date is None or start_date <= on) and (end_date is None or end_date >= on)
+
+
+def actual_specialty_condition(on: date):
+    """
+    Условие SQL для записи actual_specialty, действующей на дату on.
+    """
+    return and_(
+        ActualSpecialty.actual.is_(True),
+        or_(ActualSpecialty.start_date.is_(None), ActualSpecialty.start_date <= on),
+        or_(ActualSpecialty.end_date.is_(None), ActualSpecialty.end_date >= on),
+    )
+
+
+class PublicationSpecialtyIndex:
+    """
+    Обратный индекс specialty_id -> отсортированные id публикаций из actual_specialty.
+    Хранит флаг actual и сроки действия каждой связи, поэтому отвечает и на «все связи»,
+    и на «действующие на сегодня». Синхронизируется через catalog_sync_service:
+    CRUD actual-specialties вызывает publications_changed.
+    """
+
+    def __init__(self):
+        self.ready = False
+        # specialty_id -> pub_id -> связи (у публикации может быть несколько записей, например elib и ВАК)
+        self._links: Dict[int, Dict[int, List[_Link]]] = {}
+        # pub_id -> specialty_id, для инкрементного удаления
+        self._indexed: Dict[int, Set[int]] = {}
+        # (specialty_id, actual_only, дата) -> отсортированные id; сбрасывается при любом изменении и смене дня
+        self._cache: Dict[tuple, List[int]] = {}
+        self._cache_day: Optional[date] = None
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        self._links = {}
+        self._indexed = {}
+        self._cache = {}
+        await self._load(db, None)
+        self.ready = True
+        logger.info(f"Publication specialty index rebuilt: {len(self._links)} specialties")
+
+    async def refresh(self, db: AsyncSession, pub_ids: set) -> None:
+        if not self.ready:
+            return
+        for pub_id in pub_ids:
+            for specialty_id in self._indexed.pop(pub_id, ()):
+                self._links[specialty_id].pop(pub_id, None)
+        await self._load(db, pub_ids)
+        self._cache = {}
+
+    async def _load(self, db: AsyncSession, pub_ids: Optional[set]) -> None:
+        query = select(
+            ActualSpecialty.specialty_id, ActualSpecialty.pub_id,
+            ActualSpecialty.actual, ActualSpecialty.start_date, ActualSpecialty.end_date,
+        )
+        if pub_ids is not None:
+            query = query.where(ActualSpecialty.pub_id.in_(pub_ids))
+        for specialty_id, pub_id, actual, start_date, end_date in (await db.execute(query)).all():
+            self._links.setdefault(specialty_id, {}).setdefault(pub_id, []).append((bool(actual), start_date, end_date))
+            self._indexed.setdefault(pub_id, set()).add(specialty_id)
+
+    def _specialty_ids(self, specialty_id: int, actual_only: bool, on: date) -> List[int]:
+        key = (specialty_id, actual_only, on if actual_only else None)
+        ids = self._cache.get(key)
+        if ids is None:
+            links = self._links.get(specialty_id, {})
+            ids = sorted(
+                pub_id for pub_id, pub_links in links.items()
+                if not actual_only or any(_is_actual(link, on) for link in pub_links)
+            )
+            self._cache[key] = ids
+        return ids
+
+    def pub_ids(self, specialty_ids: Iterable[int], actual_only: bool = False, on: Optional[date] = None) -> Optional[List[int]]:
+        """
+        Отсортированные id публикаций хотя бы с одной из специальностей
+        (actual_only — только по связям, действующим на дату on, по умолчанию сегодня).
+        None, если индекс не готов.
+        """
+        if not self.ready:
+            return None
+        today = date.today()
+        if self._cache_day != today:
+            self._cache = {}
+            self._cache_day = today
+        on = on or today
+        lists = [self._specialty_ids(specialty_id, actual_only, on) for specialty_id in set(specialty_ids)]
+        if len(lists) == 1:
+            return lists[0]
+        return sorted(set().union(*lists))
+
+
+publication_specialty_index = PublicationSpecialtyIndex()
@@ -0,0 +1,102 @@
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.logger import logger
+from app.models.pub_information import PubInformation
+from app.models.publication import Publication
+from app.models.specialty import Specialty
+from app.services.utils.prefix_index import PrefixIndex
+
+# Ранги ключей: начало названия, ISSN и код специальности важнее совпадения с началом слова внутри названия
+RANK_START = 0
+RANK_WORD = 1
+
+PUBLICATION = "publication"
+SPECIALTY = "specialty"
+
+
+def _issn_keys(issn: Optional[str]) -> List[Tuple[str, int]]:
+    if not issn:
+        return []
+    # ISSN ищется и с дефисом, и без него
+    return [(issn, RANK_START), (issn.replace("-", ""), RANK_START)]
+
+
+def _publication_keys(name: Optional[str], issn_print: Optional[str], issn_elect: Optional[str]) -> List[Tuple[str, int]]:
+    keys = []
+    if name:
+        words = name.split()
+        keys.append((name, RANK_START))
+        keys.extend((" ".join(words[position:]), RANK_WORD) for position in range(1, len(words)))
+    return keys + _issn_keys(issn_print) + _issn_keys(issn_elect)
+
+
+class PublicationSuggestIndex:
+    """
+    Автодополнение по префиксу: названия журналов (с начала и с любого слова), ISSN print/electronic
+    и коды специальностей. Запрос обслуживается из памяти двоичным поиском по отсортированному массиву.
+    Публикации обновляются через catalog_sync_service, специальности — вызовом refresh_specialties
+    из specialty_service.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._index = PrefixIndex()
+        self._labels: Dict[tuple, str] = {}
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        self.ready = False
+        items = []
+        labels = {}
+        result = await db.execute(
+            select(Publication.id, Publication.name, PubInformation.issn_print, PubInformation.issn_elect)
+            .outerjoin(PubInformation, PubInformation.pub_id == Publication.id)
+        )
+        for pub_id, name, issn_print, issn_elect in result.all():
+            items.append(((PUBLICATION, pub_id), _publication_keys(name, issn_print, issn_elect)))
+            labels[(PUBLICATION, pub_id)] = name
+        for specialty_id, code, name in (await db.execute(select(Specialty.id, Specialty.code, Specialty.name))).all():
+            items.append(((SPECIALTY, specialty_id), [(code, RANK_START)]))
+            labels[(SPECIALTY, specialty_id)] = f"{code} {name}"
+        self._index.load(items)
+        self._labels = labels
+        self.ready = True
+        logger.info(f"Publication suggest index rebuilt: {len(self._index)} items")
+
+    async def refresh(self, db: AsyncSession, pub_ids: set) -> None:
+        if not self.ready:
+            return
+        for pub_id in pub_ids:
+            self._index.remove((PUBLICATION, pub_id))
+            self._labels.pop((PUBLICATION, pub_id), None)
+        result = await db.execute(
+            select(Publication.id, Publication.name, PubInformation.issn_print, PubInformation.issn_elect)
+            .outerjoin(PubInformation, PubInformation.pub_id == Publication.id)
+            .where(Publication.id.in_(pub_ids))
+        )
+        for pub_id, name, issn_print, issn_elect in result.all():
+            self._index.add((PUBLICATION, pub_id), _publication_keys(name, issn_print, issn_elect))
+            self._labels[(PUBLICATION, pub_id)] = name
+
+    async def refresh_specialties(self, db: AsyncSession) -> None:
+        if not self.ready:
+            return
+        for item in [item for item in self._labels if item[0] == SPECIALTY]:
+            self._index.remove(item)
+            del self._labels[item]
+        for specialty_id, code, name in (await db.execute(select(Specialty.id, Specialty.code, Specialty.name))).all():
+            self._index.add((SPECIALTY, specialty_id), [(code, RANK_START)])
+            self._labels[(SPECIALTY, specialty_id)] = f"{code} {name}"
+
+    def suggest(self, query: str, limit: int) -> Optional[List[dict]]:
+        if not self.ready:
+            return None
+        return [
+            {"type": kind, "id": item_id, "label": self._labels[(kind, item_id)]}
+            for kind, item_id in self._index.search(query, limit)
+        ]
+
+
+publication_suggest_index = PublicationSuggestIndex()
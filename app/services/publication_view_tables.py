@@ -0,0 +1,72 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import logger
+from app.models.publication_actual_specialty import PublicationActualSpecialty
+from app.models.publication_actual_specialty_table import PublicationActualSpecialtyTable
+from app.models.publication_base_info import PublicationBaseInfo
+from app.models.publication_base_info_table import PublicationBaseInfoTable
+
+# VIEW -> таблица, в которую она материализуется
+VIEW_TABLES = (
+    (PublicationBaseInfo, PublicationBaseInfoTable),
+    (PublicationActualSpecialty, PublicationActualSpecialtyTable),
+)
+
+
+def _copy_statement(view_model, table_model, pub_ids: Optional[Iterable[int]] = None):
+    """
+    INSERT ... SELECT строк VIEW в таблицу как есть, по одной строке таблицы на строку VIEW.
+    Для обновления отбор по pub_id: условие на столбец группировки MySQL передаёт внутрь VIEW.
+    """
+    keys = view_model.__mapper__.column_attrs.keys()
+    query = select(*[getattr(view_model, key) for key in keys])
+    if pub_ids is not None:
+        query = query.where(view_model.pub_id.in_(pub_ids))
+    return insert(table_model).from_select([table_model.__table__.c[key] for key in keys], query)
+
+
+class PublicationViewTables:
+    """
+    Поддерживает таблицы publication_base_info_mat и publication_actual_specialty_mat
+    в актуальном состоянии: полная перестройка при старте и по команде
+    `python -m app.cli rebuild-view-tables`, построчное обновление через catalog_sync_service.
+    Пока ready = False, сервисы читают исходные VIEW.
+    """
+
+    def __init__(self):
+        self.ready = False
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        self.ready = False
+        try:
+            for view_model, table_model in VIEW_TABLES:
+                await db.execute(delete(table_model))
+                copied = (await db.execute(_copy_statement(view_model, table_model))).rowcount
+                # Таблица должна совпадать с VIEW построчно; иначе сервисы продолжают читать VIEW
+                expected = (await db.execute(select(func.count()).select_from(view_model))).scalar_one()
+                if copied != expected:
+                    raise RuntimeError(
+                        f"{table_model.__tablename__}: copied {copied} rows, view has {expected}"
+                    )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        self.ready = True
+        logger.info("Publication view tables rebuilt")
+
+    async def refresh(self, db: AsyncSession, pub_ids: set) -> None:
+        try:
+            for view_model, table_model in VIEW_TABLES:
+                await db.execute(delete(table_model).where(table_model.pub_id.in_(pub_ids)))
+                await db.execute(_copy_statement(view_model, table_model, pub_ids))
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+publication_view_tables = PublicationViewTables()
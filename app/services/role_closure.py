@@ -0,0 +1,51 @@
+import time
+from typing import Dict, FrozenSet, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.models.role import Role
+
+
+class RoleClosure:
+    """
+    Транзитивное замыкание иерархии ролей: role_id -> имена самой роли и всех её предков.
+    Проверка «есть ли у роли права role_name» — одно обращение к множеству, без обхода ORM-связей.
+    Строится одним запросом к roles; RoleService перестраивает его после каждого изменения,
+    в других процессах оно перечитывается по истечении ttl_seconds.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._names: Dict[int, FrozenSet[str]] = {}
+        self._loaded_at: Optional[float] = None
+
+    def expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        rows = (await db.execute(select(Role.id, Role.name, Role.parent_id))).all()
+        roles = {role_id: (name, parent_id) for role_id, name, parent_id in rows}
+        names = {}
+        for role_id in roles:
+            chain = []
+            current = role_id
+            # len(roles) ограничивает обход, если в данных оказался цикл
+            while current in roles and len(chain) < len(roles):
+                name, current = roles[current]
+                chain.append(name)
+            names[role_id] = frozenset(chain)
+        self._names = names
+        self._loaded_at = time.monotonic()
+        logger.info(f"Role closure rebuilt: {len(names)} roles")
+
+    def names(self, role_id: Optional[int]) -> FrozenSet[str]:
+        return self._names.get(role_id, frozenset())
+
+    def has_role(self, role_id: Optional[int], role_name: str) -> bool:
+        return role_name in self.names(role_id)
+
+
+role_closure = RoleClosure(settings.ROLE_CLOSURE_TTL_SECONDS)
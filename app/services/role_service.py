@@ -4,6 +4,7 @@ from sqlalchemy.future import select
 from app.models.role import Role
 from app.models.user import User
 from app.schemas.role import RoleRequest
+from app.services.role_closure import role_closure
 
 
 class RoleService:
@@ -25,6 +26,7 @@ class RoleService:
         # Добавляем роль в базу данных
         self.db.add(role)
         await self.db.commit()
+        await role_closure.rebuild(self.db)
 
         return {"message": "Роль успешно создана"}
 
@@ -43,6 +45,8 @@ class RoleService:
             role.parent_id = data.parent_id
 
         await self.db.commit()
+        # Имя или родитель роли меняют права всех её потомков
+        await role_closure.rebuild(self.db)
         return {"message": "Роль обновлена успешно"}
 
     async def delete_role(self, role_id: int) -> dict:
@@ -52,14 +56,11 @@ class RoleService:
             raise HTTPException(status_code=404, detail="Роль не найдена")
         await self.db.delete(role)
         await self.db.commit()
+        await role_closure.rebuild(self.db)
         return {"message": "Роль удалена успешно"}
 
 
+    @staticmethod
     async def has_role(user_role: Role, required_role_name: str) -> bool:
-        # Проверяем текущую роль и всех родителей
-        current = user_role
-        while current:
-            if current.name == required_role_name:
-                return True
-            current = current.parent
-        return False
\ No newline at end of file
+        # Текущая роль и все родители — из замыкания иерархии
+        return role_closure.has_role(user_role.id, required_role_name)
\ No newline at end of file
@@ -1,7 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from app.models.main_section import MainSection
 from app.models.section import Section
 from app.schemas.section import SectionCreate, SectionUpdate
+from app.services import catalog_sync_service
+from app.services.table_versions import table_versions
+
+async def _section_pub_ids(db: AsyncSession, section_id: int) -> list:
+    # Название раздела индексируется в поиске публикаций, поэтому затронуты все связанные публикации
+    result = await db.execute(select(MainSection.pub_id).where(MainSection.section_id == section_id))
+    return result.scalars().all()
 
 async def get_all_sections(db: AsyncSession):
     result = await db.execute(select(Section))
@@ -15,6 +23,7 @@ async def create_section(db: AsyncSession, data: SectionCreate):
     new_section = Section(**data.dict())
     db.add(new_section)
     await db.commit()
+    await table_versions.bump(db, "section")
     await db.refresh(new_section)
     return new_section
 
@@ -24,11 +33,17 @@ async def update_section(db: AsyncSession, section_id: int, data: SectionUpdate)
         for field, value in data.dict(exclude_unset=True).items():
             setattr(section, field, value)
         await db.commit()
+        await table_versions.bump(db, "section")
         await db.refresh(section)
+        await catalog_sync_service.publications_changed(db, await _section_pub_ids(db, section_id))
     return section
 
 async def delete_section(db: AsyncSession, section_id: int):
     section = await get_section_by_id(db, section_id)
     if section:
+        # После удаления связи с разделом уже не найти, поэтому публикации собираются заранее
+        pub_ids = await _section_pub_ids(db, section_id)
         await db.delete(section)
-        await db.commit()
\ No newline at end of file
+        await db.commit()
+        await table_versions.bump(db, "section")
+        await catalog_sync_service.publications_changed(db, pub_ids)
\ No newline at end of file
@@ -6,10 +6,20 @@ from fastapi import HTTPException
 from sqlalchemy.orm import selectinload
 
 from app.core.logger import logger
+from app.models.actual_specialty import ActualSpecialty
 from app.models.specialty import Specialty
 from app.schemas.edu_level import EduLevelBase, EduLevelOut
 from app.schemas.specialty import SpecialtyCreate, SpecialtyUpdate, SpecialtyOut, SpecialtyResponse
 from app.schemas.ugsn import UGSNBase, UGSNOut
+from app.services import catalog_sync_service
+from app.services.publication_suggest_index import publication_suggest_index
+from app.services.table_versions import table_versions
+
+
+async def _specialty_pub_ids(db: AsyncSession, specialty_id: int) -> list:
+    # Название специальности входит в publication_actual_specialty, поэтому затронуты все её публикации
+    result = await db.execute(select(ActualSpecialty.pub_id).where(ActualSpecialty.specialty_id == specialty_id))
+    return result.scalars().all()
 
 
 async def get_all_specialties(db: AsyncSession):
@@ -74,6 +84,8 @@ async def create_specialty(db: AsyncSession, data: SpecialtyCreate):
         new_specialty = Specialty(**data.dict())
         db.add(new_specialty)
         await db.commit()
+        await table_versions.bump(db, "specialty")
+        await publication_suggest_index.refresh_specialties(db)
 
         # Загружаем связанные объекты (например, 'level') с помощью refresh
         await db.refresh(new_specialty, attribute_names=["level", "ugsn_rel"])
@@ -111,9 +123,12 @@ async def update_specialty(db: AsyncSession, specialty_id: int, data: SpecialtyU
 
         # Сохраняем изменения
         await db.commit()
+        await table_versions.bump(db, "specialty")
+        await publication_suggest_index.refresh_specialties(db)
 
         # Обновляем состояние объекта
         await db.refresh(specialty)
+        await catalog_sync_service.publications_changed(db, await _specialty_pub_ids(db, specialty_id))
 
         # Преобразуем в Pydantic-модель
         return SpecialtyResponse.model_validate({
@@ -130,7 +145,11 @@ async def update_specialty(db: AsyncSession, specialty_id: int, data: SpecialtyU
 async def delete_specialty(db: AsyncSession, specialty_id: int):
     try:
         specialty = await get_specialty_by_id_raw(db, specialty_id)
+        pub_ids = await _specialty_pub_ids(db, specialty_id)
         await db.delete(specialty)
         await db.commit()
+        await table_versions.bump(db, "specialty")
+        await publication_suggest_index.refresh_specialties(db)
+        await catalog_sync_service.publications_changed(db, pub_ids)
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=f"Datab ase error: {str(e)}")
\ No newline at end of file
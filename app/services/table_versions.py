@@ -0,0 +1,63 @@
+import hashlib
+from typing import Dict, Hashable
+
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.table_version import TableVersion
+
+
+def publication_key(pub_id: int) -> str:
+    return f"publication:{pub_id}"
+
+
+class TableVersions:
+    """
+    Версии таблиц для ETag, общие для всех процессов: счётчики хранятся в table_version.
+    Справочные сервисы вызывают bump(db, <таблица>) после commit, версии отдельных публикаций
+    обновляются через catalog_sync_service, а CLI после импорта и перестройки таблиц VIEW
+    поднимает версию "publication" целиком. Проверка ETag — один запрос по первичному ключу.
+    """
+
+    def __init__(self):
+        self.ready = True
+
+    async def bump(self, db: AsyncSession, *tables: str) -> None:
+        if not tables:
+            return
+        statement = mysql_insert(TableVersion).values([{"name": table, "version": 1} for table in tables])
+        await db.execute(statement.on_duplicate_key_update(version=TableVersion.version + 1))
+        await db.commit()
+
+    async def _versions(self, db: AsyncSession, names: tuple) -> Dict[str, int]:
+        result = await db.execute(select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(names)))
+        return dict(result.all())
+
+    async def version(self, db: AsyncSession, name: str) -> int:
+        return (await self._versions(db, (name,))).get(name, 0)
+
+    async def _etag(self, db: AsyncSession, names: tuple, key: Hashable) -> str:
+        versions = await self._versions(db, names)
+        payload = repr(tuple((name, versions.get(name, 0)) for name in names) + (key,))
+        return '"' + hashlib.sha1(payload.encode("utf-8")).hexdigest() + '"'
+
+    async def etag(self, db: AsyncSession, *tables: str, key: Hashable = None) -> str:
+        """
+        Сильный ETag ответа, собранного из указанных таблиц.
+        key различает представления: id записи, набор полей и т.п.
+        """
+        return await self._etag(db, tables, key)
+
+    async def publication_etag(self, db: AsyncSession, pub_id: int, key: Hashable = None) -> str:
+        return await self._etag(db, ("publication", publication_key(pub_id)), (pub_id, key))
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        # Перестройка индексов при запуске данные не меняет, и сохранённые версии остаются верными
+        pass
+
+    async def refresh(self, db: AsyncSession, pub_ids: set) -> None:
+        await self.bump(db, *(publication_key(pub_id) for pub_id in sorted(pub_ids)))
+
+
+table_versions = TableVersions()
@@ -3,6 +3,7 @@ from sqlalchemy.future import select
 from fastapi import HTTPException
 from app.models.ugsn import UGSN
 from app.schemas.ugsn import UGSNCreate, UGSNUpdate
+from app.services.table_versions import table_versions
 
 async def get_all_ugsn(db: AsyncSession):
     result = await db.execute(select(UGSN))
@@ -19,6 +20,7 @@ async def create_ugsn(db: AsyncSession, data: UGSNCreate):
     item = UGSN(**data.dict())
     db.add(item)
     await db.commit()
+    await table_versions.bump(db, "ugsn")
     await db.refresh(item)
     return item
 
@@ -27,10 +29,12 @@ async def update_ugsn(db: AsyncSession, id: int, data: UGSNUpdate):
     for field, value in data.dict(exclude_unset=True).items():
         setattr(item, field, value)
     await db.commit()
+    await table_versions.bump(db, "ugsn")
     await db.refresh(item)
     return item
 
 async def delete_ugsn(db: AsyncSession, id: int):
     item = await get_ugsn_by_id(db, id)
     await db.delete(item)
-    await db.commit()
\ No newline at end of file
+    await db.commit()
+    await table_versions.bump(db, "ugsn")
\ No newline at end of file
@@ -6,7 +6,7 @@ from sqlalchemy.future import select
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, generate_confirmation_token
+from app.core.security import password_hasher, generate_confirmation_token, principal_cache
 
 
 class UserService:
@@ -58,7 +58,7 @@ class UserService:
         return users, total_users
 
     async def create_user(self, user_data: UserCreate) -> User:
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
         new_user = User(
             username=user_data.username,
             password=hashed_password,
@@ -78,7 +78,7 @@ class UserService:
         if user_data.username:
             user.username = user_data.username
         if user_data.password:
-            user.password = get_password_hash(user_data.password)
+            user.password = await password_hasher.hash(user_data.password)
         if user_data.ip is not None:
             user.ip = user_data.ip
         if user_data.role_id is not None:
@@ -86,6 +86,7 @@ class UserService:
         if user_data.is_active is not None:
             user.is_active = user_data.is_active  # Обновление статуса активации
         await self.db.commit()
+        principal_cache.invalidate_user(user_id)
         await self.db.refresh(user)
         return user
 
@@ -93,6 +94,7 @@ class UserService:
         user = await self.get_user(user_id)
         await self.db.delete(user)
         await self.db.commit()
+        principal_cache.invalidate_user(user_id)
         return {"message": "Пользователь удален успешно"}
 
     async def count_users(self) -> int:
@@ -118,4 +120,5 @@ class UserService:
         user.is_active = True
         user.confirmation_token = None  # Очищаем токен после использования
         await self.db.commit()
+        principal_cache.invalidate_user(user.id)
         return {"message": "Аккаунт подтвержден успешно"}
\ No newline at end of file
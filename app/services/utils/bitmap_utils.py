@@ -0,0 +1,52 @@
+from typing import Iterable, List, Optional
+
+# Позиции установленных битов для каждого возможного байта
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def bitmap_from_ids(ids: Iterable[int]) -> int:
+    ids = list(ids)
+    if not ids:
+        return 0
+    # Собираем в bytearray: OR больших int по одному биту квадратичен по размеру карты
+    buffer = bytearray(max(ids) // 8 + 1)
+    for item_id in ids:
+        buffer[item_id >> 3] |= 1 << (item_id & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def bitmap_count(bitmap: int) -> int:
+    return bitmap.bit_count()
+
+
+def bitmap_after(bitmap: int, last_id: int) -> int:
+    """
+    Оставляет в битовой карте только id строго больше last_id.
+    """
+    if last_id < 0:
+        return bitmap
+    return bitmap >> (last_id + 1) << (last_id + 1)
+
+
+def bitmap_ids(bitmap: int, skip: int = 0, limit: Optional[int] = None) -> List[int]:
+    """
+    Возвращает отсортированные id из битовой карты, пропуская первые skip и не больше limit.
+    """
+    ids = []
+    if bitmap <= 0 or limit == 0:
+        return ids
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for byte_index, byte in enumerate(data):
+        if not byte:
+            continue
+        bits = _BYTE_BITS[byte]
+        if skip >= len(bits):
+            skip -= len(bits)
+            continue
+        base = byte_index * 8
+        for bit in bits[skip:]:
+            ids.append(base + bit)
+            if limit is not None and len(ids) >= limit:
+                return ids
+        skip = 0
+    return ids
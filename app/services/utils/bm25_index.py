@@ -0,0 +1,108 @@
+import heapq
+import math
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Окончания русских слов, отрезаемые при индексации: «экономика» и «экономики» дают одну основу.
+# Самые длинные проверяются первыми, основа не короче MIN_STEM_LENGTH символов.
+_ENDINGS = sorted((
+    "ами", "ями", "ого", "его", "ому", "ему", "ыми", "ими", "ых", "их", "ой", "ей", "ий", "ый", "ая", "яя",
+    "ое", "ее", "ые", "ие", "ов", "ев", "ах", "ях", "ам", "ям", "ом", "ем", "ую", "юю",
+    "а", "я", "о", "е", "ы", "и", "у", "ю", "ь",
+), key=len, reverse=True)
+MIN_STEM_LENGTH = 4
+
+
+@lru_cache(maxsize=65536)
+def _stem(token: str) -> str:
+    for ending in _ENDINGS:
+        if token.endswith(ending) and len(token) - len(ending) >= MIN_STEM_LENGTH:
+            return token[:-len(ending)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(token) for token in _TOKEN_RE.findall(text.lower().replace("ё", "е")) if len(token) > 1]
+
+
+class BM25Index:
+    """
+    Инвертированный индекс с ранжированием Okapi BM25.
+    Документ состоит из полей с весами: частота термина в поле умножается на вес поля.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._documents: Dict[int, Dict[str, float]] = {}
+        self._lengths: Dict[int, float] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def clear(self) -> None:
+        self._postings = {}
+        self._documents = {}
+        self._lengths = {}
+        self._total_length = 0.0
+
+    def add(self, doc_id: int, fields: Iterable[Tuple[str, float]]) -> None:
+        """
+        fields — пары (текст, вес поля).
+        """
+        self.remove(doc_id)
+        frequencies: Dict[str, float] = {}
+        for text, weight in fields:
+            for token in tokenize(text or ""):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+        if not frequencies:
+            return
+        self._documents[doc_id] = frequencies
+        length = sum(frequencies.values())
+        self._lengths[doc_id] = length
+        self._total_length += length
+        for token, frequency in frequencies.items():
+            self._postings.setdefault(token, {})[doc_id] = frequency
+
+    def remove(self, doc_id: int) -> None:
+        frequencies = self._documents.pop(doc_id, None)
+        if frequencies is None:
+            return
+        self._total_length -= self._lengths.pop(doc_id)
+        for token in frequencies:
+            postings = self._postings[token]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[token]
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """
+        Оценки BM25 всех документов, где встречается хотя бы один термин запроса.
+        """
+        if not self._documents:
+            return {}
+        count = len(self._documents)
+        average_length = self._total_length / count
+        scores: Dict[int, float] = {}
+        for token in set(tokenize(query)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
+
+    def search(self, query: str, offset: int = 0, limit: int = 10) -> Tuple[int, List[Tuple[int, float]]]:
+        """
+        (число найденных, [(doc_id, оценка)] для страницы) по убыванию оценки, при равенстве — по doc_id.
+        """
+        scores = self.scores(query)
+        top = heapq.nsmallest(offset + limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return len(scores), top[offset:]
@@ -0,0 +1,26 @@
+import base64
+import json
+from typing import Optional
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Кодирует позицию keyset-пагинации в непрозрачную строку для клиента.
+    """
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[int]:
+    """
+    Декодирует курсор, выданный encode_cursor. Возвращает None, если курсор повреждён.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_id = payload["id"]
+    except (ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        return None
+    return last_id
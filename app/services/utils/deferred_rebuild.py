@@ -0,0 +1,40 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import db1_session
+from app.core.logger import logger
+
+# Пауза перед фоновой перестройкой: серия изменений (импорт, правка связей) даёт одну перестройку
+DEFAULT_DELAY_SECONDS = 5.0
+
+
+class DeferredRebuild:
+    """
+    Фоновая перестройка индекса после изменений. Пока она идёт, индекс отвечает по прежним данным;
+    rebuild должен подменять данные одним присваиванием в конце.
+    """
+
+    def __init__(self, rebuild: Callable[[AsyncSession], Awaitable[None]], name: str, delay: float = DEFAULT_DELAY_SECONDS):
+        self._rebuild = rebuild
+        self._name = name
+        self.delay = delay
+        self._task: Optional[asyncio.Task] = None
+        self._dirty = False
+
+    def schedule(self) -> None:
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.delay)
+            self._dirty = False
+            try:
+                # Сессия запроса, вызвавшего перестройку, к этому моменту уже закрыта
+                async with db1_session() as session:
+                    await self._rebuild(session)
+            except Exception as e:
+                logger.error(f"Failed to rebuild {self._name} in background: {str(e)}")
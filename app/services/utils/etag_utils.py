@@ -0,0 +1,37 @@
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Клиент обязан перепроверять ответ при каждом запросе; данные доступны только после авторизации
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+def etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+
+
+def etag_matches(request: Request, etag: str, exists: bool = False) -> bool:
+    """
+    Проверка If-None-Match. Для GET сравнение слабое (RFC 9110), поэтому префикс W/ отбрасывается.
+    «*» совпадает с любой версией, но только существующего ресурса: он учитывается при exists=True,
+    иначе обработчик сначала проверит, есть ли ресурс, и при необходимости ответит 404.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return exists
+    candidates = [value.strip() for value in header.split(",")]
+    return etag in [value[2:] if value.startswith("W/") else value for value in candidates]
+
+
+def conditional_response(request: Request, response: Response, etag: str, exists: bool = False) -> Optional[Response]:
+    """
+    Возвращает готовый 304, если у клиента актуальная версия, иначе проставляет ETag
+    в ответ эндпоинта и возвращает None. exists=True — ресурс заведомо есть (списки).
+    """
+    headers = etag_headers(etag)
+    if etag_matches(request, etag, exists):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
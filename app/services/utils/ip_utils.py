@@ -1,24 +1,16 @@
-import ipaddress
+from typing import Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from app.models.IPWhitelist import IPWhitelist
 
+from app.services.ip_whitelist_index import IPWhitelistMatch, ip_whitelist_index
 
-async def is_ip_whitelisted(db: AsyncSession, client_ip: str) -> bool:
-    try:
-        ip = ipaddress.ip_address(client_ip)
-    except ValueError:
-        return False  # IP-адрес некорректен
 
-    result = await db.execute(select(IPWhitelist))
-    entries = result.scalars().all()
+async def match_ip_whitelist(db: AsyncSession, client_ip: str) -> Optional[IPWhitelistMatch]:
+    # Индекс перечитывается из БД, только если устарел
+    if ip_whitelist_index.expired():
+        await ip_whitelist_index.rebuild(db)
+    return ip_whitelist_index.match(client_ip)
 
-    for entry in entries:
-        try:
-            network = ipaddress.ip_network(entry.ip_network)
-            if ip in network:
-                return True
-        except ValueError:
-            continue  # Игнорируем некорректные записи
 
-    return False
+async def is_ip_whitelisted(db: AsyncSession, client_ip: str) -> bool:
+    return await match_ip_whitelist(db, client_ip) is not None
@@ -0,0 +1,10 @@
+# Экранирующий символ LIKE; не обратная косая черта, которую MySQL обрабатывает ещё и в строковых литералах
+LIKE_ESCAPE = "!"
+
+
+def like_contains(value: str) -> str:
+    """
+    Шаблон «содержит value» для LIKE ... ESCAPE LIKE_ESCAPE: % и _ из value ищутся как обычные символы.
+    """
+    escaped = value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace("%", LIKE_ESCAPE + "%").replace("_", LIKE_ESCAPE + "_")
+    return f"%{escaped}%"
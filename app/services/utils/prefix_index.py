@@ -0,0 +1,96 @@
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+_SPACES_RE = re.compile(r"\s+")
+
+
+def normalize_prefix(text: str) -> str:
+    return _SPACES_RE.sub(" ", text.lower().replace("ё", "е")).strip()
+
+
+class PrefixIndex:
+    """
+    Ключи разложены по корзинам (ранг, длина ключа), внутри корзины — отсортированный массив:
+    все ключи корзины с префиксом лежат подряд и находятся двоичным поиском.
+    Меньший ранг — лучшее совпадение, при равном ранге лучше более короткий ключ.
+    Корзины обходятся в этом порядке, поэтому поиск останавливается, набрав limit элементов,
+    и при этом видит лучшие совпадения по всему диапазону префикса, а не по его началу.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, int], List[Tuple[str, Hashable]]] = {}
+        # Ключи корзин по возрастанию (ранг, длина)
+        self._bucket_order: List[Tuple[int, int]] = []
+        self._item_entries: Dict[Hashable, List[Tuple[str, int, Hashable]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._item_entries)
+
+    def clear(self) -> None:
+        self._buckets = {}
+        self._bucket_order = []
+        self._item_entries = {}
+
+    def load(self, items: Iterable[Tuple[Hashable, Iterable[Tuple[str, int]]]]) -> None:
+        """
+        Массовая загрузка: одна сортировка каждой корзины вместо вставки по одному ключу.
+        """
+        self.clear()
+        for item, keys in items:
+            entries = self._make_entries(item, keys)
+            self._item_entries[item] = entries
+            for key, rank, _ in entries:
+                self._buckets.setdefault((rank, len(key)), []).append((key, item))
+        for bucket in self._buckets.values():
+            bucket.sort()
+        self._bucket_order = sorted(self._buckets)
+
+    def add(self, item: Hashable, keys: Iterable[Tuple[str, int]]) -> None:
+        self.remove(item)
+        entries = self._make_entries(item, keys)
+        self._item_entries[item] = entries
+        for key, rank, _ in entries:
+            bucket_key = (rank, len(key))
+            if bucket_key not in self._buckets:
+                self._buckets[bucket_key] = []
+                insort(self._bucket_order, bucket_key)
+            insort(self._buckets[bucket_key], (key, item))
+
+    def remove(self, item: Hashable) -> None:
+        for key, rank, _ in self._item_entries.pop(item, ()):
+            bucket_key = (rank, len(key))
+            bucket = self._buckets[bucket_key]
+            position = bisect_left(bucket, (key, item))
+            if position < len(bucket) and bucket[position] == (key, item):
+                del bucket[position]
+            if not bucket:
+                del self._buckets[bucket_key]
+                self._bucket_order.remove(bucket_key)
+
+    @staticmethod
+    def _make_entries(item: Hashable, keys: Iterable[Tuple[str, int]]) -> List[Tuple[str, int, Hashable]]:
+        entries = {(normalize_prefix(key), rank, item) for key, rank in keys if key}
+        return [entry for entry in entries if entry[0]]
+
+    def search(self, prefix: str, limit: int) -> List[Hashable]:
+        """
+        Элементы, у которых есть ключ с префиксом prefix: сначала лучший ранг, затем более короткий ключ,
+        затем ключ по алфавиту. Просматривается не больше limit ключей сверх повторов одного элемента
+        и по одному двоичному поиску на корзину.
+        """
+        prefix = normalize_prefix(prefix)
+        if not prefix or limit <= 0:
+            return []
+        found: Dict[Hashable, None] = {}
+        for rank, length in self._bucket_order:
+            if length < len(prefix):
+                continue
+            bucket = self._buckets[(rank, length)]
+            position = bisect_left(bucket, (prefix,))
+            while position < len(bucket) and bucket[position][0].startswith(prefix):
+                found.setdefault(bucket[position][1])
+                if len(found) == limit:
+                    return list(found)
+                position += 1
+        return list(found)
@@ -0,0 +1,69 @@
+import logging
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from sqlalchemy import bindparam
+
+# Параметры пагинации в кэшированных запросах
+PAGE_OFFSET_PARAM = "page_offset"
+PAGE_LIMIT_PARAM = "page_limit"
+
+
+class StatementCache:
+    """
+    Готовые запросы по «форме» фильтров: какие фильтры заданы и в каком варианте, но не их значения.
+    Значения передаются bind-параметрами при выполнении, поэтому один объект select переиспользуется
+    между запросами: Python не собирает его заново, а его ключ в compiled cache SQLAlchemy уже посчитан.
+    Вытесняется давно не использованная форма.
+    """
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._items: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable, build: Callable[[], object]):
+        statement = self._items.get(key)
+        if statement is not None:
+            self._items.move_to_end(key)
+            return statement
+        statement = build()
+        self._items[key] = statement
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+        return statement
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+def paginate(query, with_offset: bool = True, with_limit: bool = True):
+    """
+    OFFSET и LIMIT bind-параметрами, чтобы запрос не зависел от номера и размера страницы.
+    """
+    if with_offset:
+        query = query.offset(bindparam(PAGE_OFFSET_PARAM))
+    if with_limit:
+        query = query.limit(bindparam(PAGE_LIMIT_PARAM))
+    return query
+
+
+def page_params(offset=None, limit=None) -> dict:
+    params = {}
+    if offset is not None:
+        params[PAGE_OFFSET_PARAM] = offset
+    if limit is not None:
+        params[PAGE_LIMIT_PARAM] = limit
+    return params
+
+
+def log_statement(logger: logging.Logger, message: str, statement, params: dict) -> None:
+    """
+    SQL с подставленными значениями — только при включённом DEBUG: рендер literal_binds дорогой
+    и не использует compiled cache.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        sql = statement.params(params).compile(compile_kwargs={"literal_binds": True})
+        logger.debug(f"{message}: {sql}")
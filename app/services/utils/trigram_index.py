@@ -0,0 +1,84 @@
+import unicodedata
+from typing import Dict, Iterable, Optional, Set
+
+# Буквы, которые сопоставление различает, хотя NFKD раскладывает их на основу и диакритический знак
+_DISTINCT_LETTERS = {"й": "\ue000", "ў": "\ue001"}
+
+
+def normalize_text(text: str) -> str:
+    """
+    Приводит текст к виду, в котором его сравнивает ILIKE под сопоставлением таблицы
+    (utf8mb4_0900_ai_ci): без учёта регистра и диакритики, ё = е, ß = ss, лигатуры раскрыты.
+    """
+    text = text.casefold()
+    for letter, placeholder in _DISTINCT_LETTERS.items():
+        text = text.replace(letter, placeholder)
+    text = "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+    for letter, placeholder in _DISTINCT_LETTERS.items():
+        text = text.replace(placeholder, letter)
+    return text
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Инвертированный индекс триграмм для поиска подстроки без ведущего wildcard-скана.
+    Кандидаты находятся пересечением списков триграмм запроса и затем проверяются точным вхождением.
+    """
+
+    def __init__(self):
+        self._texts: Dict[int, str] = {}
+        self._postings: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def clear(self) -> None:
+        self._texts = {}
+        self._postings = {}
+
+    def add(self, item_id: int, text: Optional[str]) -> None:
+        self.remove(item_id)
+        if not text:
+            return
+        normalized = normalize_text(text)
+        self._texts[item_id] = normalized
+        for trigram in _trigrams(normalized):
+            self._postings.setdefault(trigram, set()).add(item_id)
+
+    def remove(self, item_id: int) -> None:
+        normalized = self._texts.pop(item_id, None)
+        if normalized is None:
+            return
+        for trigram in _trigrams(normalized):
+            postings = self._postings.get(trigram)
+            if postings is not None:
+                postings.discard(item_id)
+                if not postings:
+                    del self._postings[trigram]
+
+    def search(self, query: str) -> Set[int]:
+        """
+        Возвращает id всех записей, текст которых содержит query (сравнение как в normalize_text;
+        % и _ — обычные символы, как в экранированном шаблоне like_contains).
+        """
+        needle = normalize_text(query)
+        if len(needle) < 3:
+            # Для коротких запросов триграмм нет, проверяем все тексты в памяти
+            return {item_id for item_id, text in self._texts.items() if needle in text}
+
+        posting_lists = []
+        for trigram in _trigrams(needle):
+            postings = self._postings.get(trigram)
+            if not postings:
+                return set()
+            posting_lists.append(postings)
+        posting_lists.sort(key=len)
+
+        candidates: Iterable[int] = posting_lists[0]
+        for postings in posting_lists[1:]:
+            candidates = [item_id for item_id in candidates if item_id in postings]
+        return {item_id for item_id in candidates if needle in self._texts[item_id]}
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import time
+from datetime import date
+from enum import Enum
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Простой кэш в памяти процесса со временем жизни записей и ограничением размера.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._items: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        item = self._items.get(key)
+        if item is None:
+            return False, None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            self._items.pop(key, None)
+            return False, None
+        return True, value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if len(self._items) >= self.max_size and key not in self._items:
+            # Выбрасываем самую старую запись (dict сохраняет порядок вставки)
+            self._items.pop(next(iter(self._items)))
+        self._items[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def pop(self, key: Hashable) -> None:
+        self._items.pop(key, None)
+
+    def clear(self) -> None:
+        self._items = {}
+
+
+def _normalize_filter_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sorted(_normalize_filter_value(item) for item in value)
+    return value
+
+
+def filters_fingerprint(scope: str, filters: dict, extra: Optional[dict] = None) -> str:
+    """
+    Стабильный отпечаток набора фильтров: пустые значения отброшены, списки отсортированы.
+    """
+    normalized = {
+        key: _normalize_filter_value(value)
+        for key, value in {**filters, **(extra or {})}.items()
+        if value not in (None, "", [], ())
+    }
+    payload = json.dumps([scope, normalized], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
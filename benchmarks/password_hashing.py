@@ -0,0 +1,93 @@
+"""
+Задержка лёгкого читающего запроса во время волны входов: прежняя проверка пароля bcrypt
+прямо в цикле событий против password_hasher (пул потоков с ограничением очереди).
+
+Каждый «вход» — verify_password с настоящим хешем 12 раундов, «чтение» — короткая корутина,
+которая запускается каждые --interval мс; её задержка меряется от момента, когда она должна
+была начаться. База не нужна. Запуск из корня проекта:
+    python -m benchmarks.password_hashing --logins 64 --seconds 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import orjson
+from fastapi import HTTPException
+
+from app.core.security import PasswordHasher, get_password_hash, verify_password
+
+PASSWORD = "correct horse battery staple"
+
+
+async def read_endpoint() -> bytes:
+    await asyncio.sleep(0)
+    return orjson.dumps({"items": [{"id": item_id, "name": f"Журнал {item_id}"} for item_id in range(20)]})
+
+
+async def login_storm(verify, logins: int, deadline: float, hashed: str) -> dict:
+    counters = {"ok": 0, "rejected": 0}
+
+    async def client() -> None:
+        while time.perf_counter() < deadline:
+            try:
+                await verify(PASSWORD, hashed)
+                counters["ok"] += 1
+            except HTTPException:
+                counters["rejected"] += 1
+                # Клиент повторяет попытку после Retry-After
+                await asyncio.sleep(0.05)
+
+    await asyncio.gather(*(client() for _ in range(logins)))
+    return counters
+
+
+async def reader(interval: float, deadline: float) -> list:
+    latencies = []
+    scheduled = time.perf_counter()
+    while scheduled < deadline:
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        await read_endpoint()
+        latencies.append((time.perf_counter() - scheduled) * 1000)
+        scheduled += interval
+    return latencies
+
+
+async def run(label: str, verify, logins: int, seconds: float, interval: float, hashed: str) -> None:
+    deadline = time.perf_counter() + seconds
+    latencies, counters = await asyncio.gather(
+        reader(interval, deadline),
+        login_storm(verify, logins, deadline, hashed),
+    )
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{label:>8}: read median {statistics.median(latencies):.1f} ms, p99 {p99:.1f} ms, "
+        f"max {latencies[-1]:.1f} ms; logins {counters['ok']}, rejected {counters['rejected']}"
+    )
+
+
+async def inline_verify(plain_password: str, hashed_password: str) -> bool:
+    return verify_password(plain_password, hashed_password)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64, help="одновременных клиентов, которые входят в цикле")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--interval", type=float, default=10.0, help="период читающих запросов, мс")
+    parser.add_argument("--workers", type=int, default=0, help="потоков bcrypt, 0 — по числу ядер")
+    parser.add_argument("--max-pending", type=int, default=32)
+    args = parser.parse_args()
+
+    hashed = get_password_hash(PASSWORD)
+    hasher = PasswordHasher(args.workers, args.max_pending)
+    print(f"bcrypt workers: {hasher.workers}, max pending: {hasher.max_pending}")
+    interval = args.interval / 1000
+    asyncio.run(run("inline", inline_verify, args.logins, args.seconds, interval, hashed))
+    asyncio.run(run("pool", hasher.verify, args.logins, args.seconds, interval, hashed))
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Сравнение стратегий загрузки страницы /publications/with_index_and_information:
+selectin (отдельный запрос на каждую коллекцию) и json (один запрос с JSON_ARRAYAGG).
+
+Запуск из корня проекта (нужны те же переменные окружения, что и для приложения):
+    python -m benchmarks.publication_page_loading --per-page 20 --pages 10 --repeat 5
+"""
+import argparse
+import asyncio
+import time
+from statistics import median
+
+from sqlalchemy import event
+
+from app.core.database import db1_engine, db1_session
+from app.services.publication_service import PUBLICATION_PAGE_LOADERS
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+async def run(per_page: int, pages: int, repeat: int) -> None:
+    db1_engine.echo = False
+    counter = StatementCounter()
+    event.listen(db1_engine.sync_engine, "before_cursor_execute", counter)
+
+    pages_by_loader = {}
+    for name, loader in PUBLICATION_PAGE_LOADERS.items():
+        timings = []
+        statements = 0
+        pages_by_loader[name] = []
+        async with db1_session() as session:
+            # Прогрев пула соединений и кэша компиляции
+            await loader(session, [], 0, per_page)
+            for _ in range(repeat):
+                for page in range(pages):
+                    counter.count = 0
+                    started = time.perf_counter()
+                    items = await loader(session, [], page * per_page, per_page)
+                    timings.append(time.perf_counter() - started)
+                    statements += counter.count
+                    pages_by_loader[name].append(items)
+                    session.expunge_all()
+        total_pages = repeat * pages
+        print(
+            f"{name:>9}: {statements / total_pages:.1f} statements/page, "
+            f"median {median(timings) * 1000:.2f} ms, max {max(timings) * 1000:.2f} ms"
+        )
+
+    results = list(pages_by_loader.values())
+    identical = all(result == results[0] for result in results[1:])
+    print(f"results identical: {identical}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.per_page, args.pages, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
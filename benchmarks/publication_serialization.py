@@ -0,0 +1,138 @@
+"""
+Стоимость сериализации одной публикации: прежний путь (model_validate на каждый объект,
+обёртка в Paginated*-модель и повторная проверка response_model в FastAPI, json.dumps)
+против прямой сборки словарей из ORM-объектов и orjson.
+
+База не нужна, объекты создаются в памяти. Запуск из корня проекта:
+    python -m benchmarks.publication_serialization --rows 100 --repeat 200
+"""
+import argparse
+import json
+import time
+from datetime import date
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.models.actual_grnti import ActualGRNTI
+from app.models.actual_oecd import ActualOECD
+from app.models.index import Index
+from app.models.main_section import MainSection
+from app.models.pub_information import PubInformation
+from app.models.publication import Publication
+from app.schemas.actual_grnti import ActualGRNTIResponse
+from app.schemas.actual_oecd import ActualOECDResponse
+from app.schemas.index import IndexResponse
+from app.schemas.main_section import MainSectionResponse
+from app.schemas.pub_information import PubInformationResponse
+from app.schemas.publication import PaginatedResponse, PaginatedResponseWith, PublicationResponse, \
+    PublicationResponseWith
+from app.services.publication_service import publication_row, publication_with_row
+
+
+def make_publications(rows: int) -> list:
+    publications = []
+    for pub_id in range(1, rows + 1):
+        pub = Publication(
+            id=pub_id, el_id=pub_id * 10, vak_id=pub_id, name=f"Вестник науки {pub_id}",
+            serial_type="периодическое издание", serial_elem="выпуск журнала", purpose="научное",
+            distribution="в печатном и электронном виде", access="все выпуски в открытом доступе",
+            main_finance="учредитель", multidisc="не является мультидисциплинарным",
+            language={"русский", "английский"}, el_updated_at=date(2024, 1, 1),
+        )
+        pub.actual_oecd_items = [ActualOECD(id=pub_id * 3 + i, pub_id=pub_id, oecd_id=i, actual=True) for i in range(3)]
+        pub.actual_grnti_items = [ActualGRNTI(id=pub_id * 3 + i, pub_id=pub_id, grnti_id=i, actual=i % 2 == 0) for i in range(3)]
+        pub.main_sections = [MainSection(id=pub_id * 2 + i, pub_id=pub_id, section_id=i, actual=True) for i in range(2)]
+        pub.pub_information = PubInformation(pub_id=pub_id, issn_print="1234-5678", issues_year=12, pages_issue=100)
+        pub.index = Index(
+            pub_id=pub_id, rinc="да", rinc_core="нет", rsci="нет", doaj="да", wos="нет", wos_quart="нет",
+            scop="нет", scop_quart="нет", white="да", wite_level="2", vak="да", vak_cat="1", crossref="да",
+        )
+        publications.append(pub)
+    return publications
+
+
+def page(items: list, **extra) -> dict:
+    return {"items": items, "total": len(items), "page": 1, "per_page": len(items), "total_pages": 1,
+            "total_cached": False, **extra}
+
+
+def fastapi_render(adapter: TypeAdapter, response) -> bytes:
+    # То же, что делают serialize_response и JSONResponse.render для response_model
+    content = adapter.dump_python(adapter.validate_python(response, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def legacy_list(publications: list, adapter: TypeAdapter) -> bytes:
+    items = []
+    for pub in publications:
+        pub_dict = {
+            **pub.__dict__,
+            "actual_oecd_items": [ActualOECDResponse.model_validate(item.__dict__) for item in pub.actual_oecd_items],
+            "actual_grnti_items": [ActualGRNTIResponse.model_validate(item.__dict__) for item in pub.actual_grnti_items],
+            "main_sections": [MainSectionResponse.model_validate(item.__dict__) for item in pub.main_sections],
+        }
+        items.append(PublicationResponse.model_validate(pub_dict))
+    return fastapi_render(adapter, PaginatedResponse(**page(items)))
+
+
+def legacy_with_index(publications: list, adapter: TypeAdapter) -> bytes:
+    items = []
+    for pub in publications:
+        items.append(PublicationResponseWith(
+            id=pub.id, el_id=pub.el_id, vak_id=pub.vak_id, name=pub.name, serial_type=pub.serial_type,
+            serial_elem=pub.serial_elem, purpose=pub.purpose, distribution=pub.distribution, access=pub.access,
+            main_finance=pub.main_finance, multidisc=pub.multidisc,
+            language=list(pub.language) if pub.language else [], el_updated_at=pub.el_updated_at,
+            actual_oecd_items=[ActualOECDResponse.model_validate(item, from_attributes=True) for item in pub.actual_oecd_items],
+            actual_grnti_items=[ActualGRNTIResponse.model_validate(item, from_attributes=True) for item in pub.actual_grnti_items],
+            main_sections=[MainSectionResponse.model_validate(item, from_attributes=True) for item in pub.main_sections],
+            pub_information=PubInformationResponse.model_validate(pub.pub_information, from_attributes=True),
+            index=IndexResponse.model_validate(pub.index, from_attributes=True),
+        ))
+    return fastapi_render(adapter, PaginatedResponseWith(**page(items, next_cursor=None)))
+
+
+def raw_list(publications: list) -> bytes:
+    return orjson.dumps(page([publication_row(pub) for pub in publications]))
+
+
+def raw_with_index(publications: list) -> bytes:
+    return orjson.dumps(page([
+        publication_with_row(pub)
+        for pub in publications
+    ], next_cursor=None))
+
+
+def measure(label: str, func, rows: int, repeat: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    per_row = (time.perf_counter() - started) / (repeat * rows) * 1_000_000
+    print(f"{label:>28}: {per_row:.1f} us/row")
+    return per_row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    publications = make_publications(args.rows)
+    list_adapter = TypeAdapter(PaginatedResponse)
+    with_adapter = TypeAdapter(PaginatedResponseWith)
+
+    for name, legacy, raw in (
+        ("list", lambda: legacy_list(publications, list_adapter), lambda: raw_list(publications)),
+        ("with_index", lambda: legacy_with_index(publications, with_adapter), lambda: raw_with_index(publications)),
+    ):
+        identical = json.loads(legacy()) == json.loads(raw())
+        before = measure(f"{name} model_validate", legacy, args.rows, args.repeat)
+        after = measure(f"{name} orjson", raw, args.rows, args.repeat)
+        print(f"{name:>28}: x{before / after:.1f}, identical output: {identical}")
+
+
+if __name__ == "__main__":
+    main()